@@ -0,0 +1,11 @@
+from .generator import ContactGenerator, generate_records, build_store
+from .results import BenchmarkResult, measure, save_results, load_results, compare_results, exceeded_budgets
+from .counting import CountingStorage
+from .storage_bench import run_storage_benchmarks
+
+__all__ = [
+    'ContactGenerator', 'generate_records', 'build_store',
+    'BenchmarkResult', 'measure', 'save_results', 'load_results', 'compare_results', 'exceeded_budgets',
+    'CountingStorage',
+    'run_storage_benchmarks',
+]
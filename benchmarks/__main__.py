@@ -0,0 +1,99 @@
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from .results import save_results, load_results, compare_results, exceeded_budgets
+from .storage_bench import run_storage_benchmarks
+
+def print_results(results) -> None:
+    for result in results:
+        per = " per op" if result.ops > 1 else ""
+        line = f"{result.backend:7} {result.size:>7} {result.name:24} {result.seconds * 1000:10.3f} ms{per}"
+        if result.storage_calls is not None:
+            line += f"  {result.storage_calls:8.2f} calls  {result.peak_bytes / 1024:10.1f} KiB peak"
+        print(line)
+
+def run_storage(args) -> int:
+    work_dir = Path(tempfile.mkdtemp(prefix='lkit-bench-'))
+    try:
+        results = []
+        for backend in args.backend:
+            for size in args.sizes:
+                results += run_storage_benchmarks(work_dir, size, backend, args.seed, args.samples, args.repeat)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    print_results(results)
+    if args.output:
+        save_results(args.output, results)
+    return 0
+
+def run_gui(args) -> int:
+    # Imported here so the storage benchmarks run without Qt
+    from .gui_bench import run_gui_benchmarks, DEFAULT_GUI_BUDGETS
+    
+    budgets = dict(DEFAULT_GUI_BUDGETS)
+    if args.budgets:
+        with open(args.budgets, 'r', encoding='utf-8') as f:
+            budgets.update(json.load(f))
+    
+    work_dir = Path(tempfile.mkdtemp(prefix='lkit-bench-'))
+    try:
+        results = []
+        for backend in args.backend:
+            for size in args.sizes:
+                results += run_gui_benchmarks(work_dir, size, backend, args.seed, args.frames, args.repeat)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    print_results(results)
+    if args.output:
+        save_results(args.output, results)
+    
+    failures = exceeded_budgets(results, budgets)
+    for failure in failures:
+        print(f"Over budget: {failure}")
+    return 1 if failures else 0
+
+def compare(args) -> int:
+    regressions = compare_results(load_results(args.baseline), load_results(args.current), args.tolerance)
+    for old, new, ratio in regressions:
+        print(f"{new.backend:7} {new.size:>7} {new.name:24} {old.seconds * 1000:.3f} -> {new.seconds * 1000:.3f} ms ({ratio:.2f}x)")
+    if not regressions:
+        print("No regressions")
+    return 1 if regressions else 0
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="LKIT performance benchmarks")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    storage = commands.add_parser('storage', help="time storage operations on generated stores")
+    storage.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    storage.add_argument('--backend', nargs='+', default=['json'])
+    storage.add_argument('--seed', type=int, default=0)
+    storage.add_argument('--samples', type=int, default=200, help="persons loaded and saved per run")
+    storage.add_argument('--repeat', type=int, default=3)
+    storage.add_argument('--output', '-o', type=Path, help="write results as JSON")
+    storage.set_defaults(handler=run_storage)
+    
+    gui = commands.add_parser('gui', help="time MainWindow and PersonView offscreen and check budgets")
+    gui.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    gui.add_argument('--backend', nargs='+', default=['json'])
+    gui.add_argument('--seed', type=int, default=0)
+    gui.add_argument('--frames', type=int, default=100, help="scroll frames per run")
+    gui.add_argument('--repeat', type=int, default=3)
+    gui.add_argument('--budgets', type=Path, help="JSON budgets by benchmark name, overriding the defaults")
+    gui.add_argument('--output', '-o', type=Path, help="write results as JSON")
+    gui.set_defaults(handler=run_gui)
+    
+    comparison = commands.add_parser('compare', help="list regressions between two result files")
+    comparison.add_argument('baseline', type=Path)
+    comparison.add_argument('current', type=Path)
+    comparison.add_argument('--tolerance', type=float, default=0.2, help="allowed slowdown ratio above 1")
+    comparison.set_defaults(handler=compare)
+    
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
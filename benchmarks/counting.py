@@ -0,0 +1,31 @@
+import threading
+from collections import Counter
+
+class CountingStorage:
+    """Wraps a storage backend and counts calls to its public methods, from any thread"""
+    
+    def __init__(self, storage):
+        self._storage = storage
+        self._lock = threading.Lock()
+        self.calls = Counter()
+    
+    def __getattr__(self, name):
+        attribute = getattr(self._storage, name)
+        if name.startswith('_') or not callable(attribute):
+            return attribute
+        
+        def counted(*args, **kwargs):
+            with self._lock:
+                self.calls[name] += 1
+            return attribute(*args, **kwargs)
+        return counted
+    
+    @property
+    def call_count(self) -> int:
+        """Total calls since the last reset"""
+        with self._lock:
+            return sum(self.calls.values())
+    
+    def reset_counts(self) -> None:
+        with self._lock:
+            self.calls.clear()
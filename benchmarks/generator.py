@@ -0,0 +1,81 @@
+import random
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterator, List
+from models import Person, Conversation
+from storage import open_storage
+from storage.importer import import_records
+from storage.records import Record
+
+FIRST_NAMES = [
+    "Alice", "Bruno", "Chloe", "David", "Emma", "Felix", "Giulia", "Hugo", "Ines", "Jonas",
+    "Karin", "Louis", "Marta", "Nadia", "Oscar", "Paula", "Quentin", "Rosa", "Samir", "Tanja",
+    "Ugo", "Vera", "Walter", "Xenia", "Yann", "Zoe", "Amelie", "Bastien", "Clara", "Dmitri",
+]
+LAST_NAMES = [
+    "Martin", "Bernard", "Dubois", "Schmidt", "Rossi", "Garcia", "Novak", "Jensen", "Kowalski", "Silva",
+    "Muller", "Leroy", "Fischer", "Moreau", "Weber", "Costa", "Laurent", "Becker", "Ferrari", "Lambert",
+]
+WORDS = (
+    "project lunch call coffee meeting follow up contract budget trip family conference "
+    "introduced idea feedback deadline offer review launch partner team hiring design "
+    "weekend birthday book recommended article plan quarter roadmap sailing running garden"
+).split()
+
+# Reference day for generated dates, so a seed always produces the same store
+REFERENCE_DATE = date(2024, 6, 30)
+
+class ContactGenerator:
+    """Seeded generator of realistic contact books
+    
+    Conversation counts follow a Pareto distribution (most contacts have a
+    handful, a few have hundreds) and note lengths a log-normal one.
+    """
+    
+    def __init__(self, seed: int = 0, max_conversations: int = 500, max_note_words: int = 2000):
+        self.rng = random.Random(seed)
+        self.max_conversations = max_conversations
+        self.max_note_words = max_note_words
+    
+    def _notes(self, mean_words: float) -> str:
+        count = min(self.max_note_words, int(self.rng.lognormvariate(mean_words, 1.0)))
+        return " ".join(self.rng.choices(WORDS, k=count))
+    
+    def _date(self, days_back: int) -> date:
+        return REFERENCE_DATE - timedelta(days=self.rng.randrange(days_back))
+    
+    def person(self) -> Person:
+        """A person without ID, with optional fields filled in at realistic rates"""
+        rng = self.rng
+        first_name = rng.choice(FIRST_NAMES)
+        last_name = rng.choice(LAST_NAMES)
+        return Person(
+            first_name=first_name,
+            last_name=last_name,
+            email=f"{first_name}.{last_name}@example.com".lower() if rng.random() < 0.7 else None,
+            phone=f"+33 6 {rng.randrange(10**8):08d}" if rng.random() < 0.5 else None,
+            birth_date=self._date(365 * 60) - timedelta(days=365 * 18) if rng.random() < 0.6 else None,
+            notes=self._notes(2.5) if rng.random() < 0.3 else None
+        )
+    
+    def conversations(self) -> List[Conversation]:
+        """A skewed number of conversations, oldest first"""
+        count = min(self.max_conversations, int(self.rng.paretovariate(1.2)) - 1)
+        dates = sorted(self._date(365 * 5) for _ in range(count))
+        return [Conversation(date=conv_date, notes=self._notes(3.0)) for conv_date in dates]
+    
+    def records(self, count: int) -> Iterator[Record]:
+        """Yield count generated persons with their conversations"""
+        for _ in range(count):
+            yield self.person(), self.conversations()
+
+def generate_records(count: int, seed: int = 0) -> Iterator[Record]:
+    """Yield count generated persons with their conversations"""
+    return ContactGenerator(seed).records(count)
+
+def build_store(base_dir: Path, count: int, seed: int = 0, backend: str = None, batch_size: int = 500):
+    """Create a store holding count generated persons, returning it open"""
+    storage = open_storage(base_dir, backend)
+    import_records(storage, generate_records(count, seed), batch_size)
+    storage.flush()
+    return storage
@@ -0,0 +1,105 @@
+import os
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+# Must be set before the QApplication is created
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtWidgets import QApplication
+from storage import open_storage
+from views.main_window import MainWindow
+from .counting import CountingStorage
+from .generator import build_store
+from .results import BenchmarkResult, measure
+from .startup import run_startup_benchmarks
+
+# Per-operation limits; a scroll frame must stay within two 60 Hz frames and read at most the
+# summaries of the rows it brings into view (about a screenful), and a start with a cached list
+# must paint within a second whatever the store size
+DEFAULT_GUI_BUDGETS: Dict[str, Dict[str, float]] = {
+    'startup_snapshot': {'seconds': 1.0},
+    'load_persons': {'seconds': 5.0},
+    'sort_toggle': {'seconds': 0.5},
+    'scroll_frame': {'seconds': 1 / 30, 'storage_calls': 50},
+    'display_heavy_person': {'seconds': 0.2},
+}
+
+def _wait_until(app: QApplication, condition, timeout: float = 120.0) -> None:
+    """Process events until condition() holds"""
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("GUI benchmark step did not finish")
+        app.processEvents()
+        time.sleep(0.001)
+
+def run_gui_benchmarks(work_dir: Path, size: int, backend: str = 'json', seed: int = 0,
+                       frames: int = 100, repeat: int = 3) -> List[BenchmarkResult]:
+    """Drive MainWindow and PersonView offscreen against a generated store of size persons"""
+    app = QApplication.instance() or QApplication([])
+    store_dir = work_dir / f'gui-{backend}-{size}'
+    build_store(store_dir, size, seed, backend).close()
+    
+    storage = CountingStorage(open_storage(store_dir, backend, write_delay=MainWindow.SAVE_DELAY))
+    window = MainWindow(storage)
+    window.resize(1024, 768)
+    window.show()
+    _wait_until(app, lambda: not window._loading)
+    results = []
+    
+    def record(name: str, func, ops: int = 1) -> None:
+        storage.reset_counts()
+        seconds = measure(func, repeat, ops)
+        calls = storage.call_count / (repeat * ops)
+        
+        # Memory is traced in a separate run, since tracing slows every allocation down
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results.append(BenchmarkResult(name, backend, size, seconds, ops, calls, peak))
+    
+    def settle():
+        _wait_until(app, lambda: not window._loading)
+        window.person_list.viewport().repaint()
+    
+    def reload():
+        window.load_persons()
+        settle()
+    record('load_persons', reload)
+    
+    def toggle_sorts():
+        window.change_sort_type('name')
+        settle()
+        window.toggle_sort_order()
+        settle()
+        window.change_sort_type('date')
+        settle()
+        window.toggle_sort_order()
+        settle()
+    record('sort_toggle', toggle_sorts, 4)
+    
+    scrollbar = window.person_list.verticalScrollBar()
+    
+    def scroll():
+        scrollbar.setValue(0)
+        app.processEvents()
+        for _ in range(frames):
+            scrollbar.setValue(scrollbar.value() + scrollbar.pageStep())
+            app.processEvents()
+            window.person_list.viewport().repaint()
+    record('scroll_frame', scroll, frames)
+    
+    heaviest = max(storage.get_person_summaries(), key=lambda summary: summary.conversation_count)
+    person, conversations = storage.load_person(heaviest.id)
+    
+    def display():
+        window.get_person_view().display_person(person, conversations)
+        window.get_person_view().repaint()
+        app.processEvents()
+    record('display_heavy_person', display)
+    
+    window.close()
+    return results + run_startup_benchmarks(work_dir, size, backend, seed, repeat)
@@ -0,0 +1,85 @@
+import json
+import platform
+import subprocess
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    backend: str
+    size: int          # Persons in the store
+    seconds: float     # Best wall time of one run (per operation when ops > 1)
+    ops: int = 1       # Operations timed per run
+    storage_calls: Optional[float] = None  # Storage calls per operation (per frame for GUI scenarios)
+    peak_bytes: Optional[int] = None       # Peak Python memory allocated during one run
+    
+    @property
+    def key(self) -> tuple[str, str, int]:
+        """Identity of a measurement when comparing revisions"""
+        return self.name, self.backend, self.size
+
+def measure(func: Callable[[], None], repeat: int = 3, ops: int = 1) -> float:
+    """Best wall time over repeat runs of func, divided by the operations each run performs"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best / ops
+
+def git_revision() -> Optional[str]:
+    """Short hash of the checked out revision, if this is a git checkout"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def save_results(path: Path, results: List[BenchmarkResult]) -> None:
+    """Write results with the revision and machine they were measured on"""
+    data = {
+        "revision": git_revision(),
+        "created": datetime.now().isoformat(timespec='seconds'),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [asdict(result) for result in results],
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+def load_results(path: Path) -> List[BenchmarkResult]:
+    """Read results written by save_results"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [BenchmarkResult(**result) for result in data['results']]
+
+def compare_results(baseline: List[BenchmarkResult], current: List[BenchmarkResult],
+                    tolerance: float = 0.2) -> List[tuple[BenchmarkResult, BenchmarkResult, float]]:
+    """Pair up measurements of both runs, returning (baseline, current, ratio) for those slower by more than tolerance"""
+    previous: Dict[tuple, BenchmarkResult] = {result.key: result for result in baseline}
+    regressions = []
+    for result in current:
+        old = previous.get(result.key)
+        if old is None or old.seconds <= 0:
+            continue
+        ratio = result.seconds / old.seconds
+        if ratio > 1 + tolerance:
+            regressions.append((old, result, ratio))
+    return regressions
+
+def exceeded_budgets(results: List[BenchmarkResult], budgets: Dict[str, Dict[str, float]]) -> List[str]:
+    """Describe every measurement above its budget, keyed by benchmark name then field ('seconds', ...)"""
+    failures = []
+    for result in results:
+        for field, limit in budgets.get(result.name, {}).items():
+            value = getattr(result, field)
+            if value is not None and value > limit:
+                failures.append(f"{result.name} ({result.backend}, {result.size}): {field} {value:g} > {limit:g}")
+    return failures
@@ -0,0 +1,65 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+from .generator import build_store
+from .results import BenchmarkResult
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def _probe() -> None:
+    """Start the application like main.py and report the wall-clock time contacts are first painted"""
+    sys.path.insert(0, str(ROOT))
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication(sys.argv)
+    from views.main_window import MainWindow
+    window = MainWindow()
+    window.show()
+    app.processEvents()
+    while window.person_model.rowCount() == 0 and window._loading:
+        app.processEvents()
+        time.sleep(0.001)
+    window.person_list.viewport().repaint()
+    print(json.dumps({"painted": time.time(), "rows": window.person_model.rowCount()}), flush=True)
+    # Skip teardown so the probe neither waits for the background load nor rewrites the snapshot
+    os._exit(0)
+
+def time_startup(home: Path, backend: str) -> tuple[float, int]:
+    """Seconds from launching a fresh interpreter until contacts are painted, and how many rows were shown"""
+    env = dict(os.environ, HOME=str(home), LKIT_STORAGE=backend, QT_QPA_PLATFORM='offscreen')
+    started = time.time()
+    output = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.startup'],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    data = json.loads(output.strip().splitlines()[-1])
+    return data['painted'] - started, data['rows']
+
+def run_startup_benchmarks(work_dir: Path, size: int, backend: str = 'json', seed: int = 0,
+                           repeat: int = 3) -> List[BenchmarkResult]:
+    """Time cold starts against a generated store, without and then with a cached list snapshot"""
+    from views.list_snapshot import save_list_snapshot
+    
+    home = work_dir / f'startup-{backend}-{size}'
+    storage = build_store(home / '.lkit', size, seed, backend)
+    person_ids = storage.get_sorted_person_ids('date', reverse=True)[:200]
+    first_page = [storage.get_person_summary(person_id) for person_id in person_ids]
+    storage.close()
+    snapshot_file = home / '.lkit' / 'list_snapshot.json'
+    
+    results = []
+    for name in ('startup_cold', 'startup_snapshot'):
+        if name == 'startup_snapshot':
+            save_list_snapshot(snapshot_file, 'date', True, first_page)
+        else:
+            snapshot_file.unlink(missing_ok=True)
+        best = min(time_startup(home, backend)[0] for _ in range(repeat))
+        results.append(BenchmarkResult(name, backend, size, best))
+    return results
+
+if __name__ == '__main__':
+    _probe()
@@ -0,0 +1,64 @@
+import random
+from datetime import date
+from pathlib import Path
+from typing import List
+from models import Conversation
+from storage import open_storage
+from .generator import build_store
+from .results import BenchmarkResult, measure
+
+# Summaries the GUI fetches for its first page (StoreLoader.BATCH_SIZE), kept here to stay Qt-free
+FIRST_PAGE = 500
+
+def run_storage_benchmarks(work_dir: Path, size: int, backend: str = 'json', seed: int = 0,
+                           samples: int = 200, repeat: int = 3) -> List[BenchmarkResult]:
+    """Time the storage operations the views rely on against a generated store of size persons"""
+    store_dir = work_dir / f'{backend}-{size}'
+    build_store(store_dir, size, seed, backend).close()
+    results = []
+    
+    def record(name: str, func, ops: int = 1, runs: int = repeat) -> None:
+        results.append(BenchmarkResult(name, backend, size, measure(func, runs, ops), ops))
+    
+    def open_and_close():
+        open_storage(store_dir, backend).close()
+    record('open', open_and_close)
+    
+    storage = open_storage(store_dir, backend)
+    try:
+        if hasattr(storage, '_get_next_id'):
+            record('get_next_id', storage._get_next_id)
+        record('get_all_persons', storage.get_all_persons)
+        if hasattr(storage, 'READ_WORKERS'):
+            record('get_all_persons_sequential', lambda: storage.get_all_persons(workers=1))
+        
+        def load_persons_date_sort():
+            person_ids = storage.get_sorted_person_ids('date', reverse=True)
+            for person_id in person_ids[:FIRST_PAGE]:
+                storage.get_person_summary(person_id)
+        record('load_persons_date_sort', load_persons_date_sort)
+        
+        sample_ids = random.Random(seed).sample(range(1, size + 1), min(samples, size))
+        
+        def load_sample():
+            for person_id in sample_ids:
+                storage.load_person(person_id)
+        record('load_person', load_sample, len(sample_ids))
+        
+        records = [storage.load_person(person_id) for person_id in sample_ids]
+        
+        def save_sample():
+            for person, conversations in records:
+                storage.save_person(person, conversations)
+            storage.flush()
+        record('save_person', save_sample, len(records))
+        
+        def add_to_sample():
+            for person_id in sample_ids:
+                storage.add_conversation(person_id, Conversation(date=date(2024, 7, 1), notes="benchmark follow up"))
+            storage.flush()
+        # Each run grows the store, so it is timed once
+        record('add_conversation', add_to_sample, len(sample_ids), runs=1)
+    finally:
+        storage.close()
+    return results
@@ -0,0 +1,3 @@
+from .cli import main, build_parser
+
+__all__ = ['main', 'build_parser']
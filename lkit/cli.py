@@ -0,0 +1,173 @@
+import argparse
+import json
+import os
+import sys
+from datetime import date
+from pathlib import Path
+from models import Conversation
+from storage import STATS, open_storage, BACKENDS, StorageManager
+from storage.settings import COMPRESSIONS
+from storage.archive import is_archive, export_archive, restore_archive
+from storage.importer import import_file
+from storage.records import record_to_dict
+
+def _date_text(value) -> str:
+    return value.isoformat() if value else ""
+
+def list_persons(storage, args) -> int:
+    printed = 0
+    for person_id in storage.get_sorted_person_ids(args.sort, args.reverse):
+        if args.limit is not None and printed >= args.limit:
+            break
+        summary = storage.get_person_summary(person_id)
+        if summary is None:
+            continue
+        print(f"{summary.id}\t{summary.full_name}\t{_date_text(summary.last_contact)}\t{summary.conversation_count}")
+        printed += 1
+    return 0
+
+def show_person(storage, args) -> int:
+    result = storage.load_person(args.id)
+    if result is None:
+        print(f"No person with ID {args.id}", file=sys.stderr)
+        return 1
+    
+    person, conversations = result
+    if args.json:
+        print(json.dumps(record_to_dict(person, conversations), ensure_ascii=False, indent=2))
+        return 0
+    
+    print(f"{person.full_name} (#{person.id})")
+    for label, value in [("Email", person.email), ("Phone", person.phone),
+                         ("Birthday", _date_text(person.birth_date)), ("Notes", person.notes)]:
+        if value:
+            print(f"{label}: {value}")
+    for conversation in sorted(conversations, key=lambda c: (c.date, c.id), reverse=True):
+        print(f"{conversation.date.isoformat()}\t{conversation.notes}")
+    return 0
+
+def add_conversation(storage, args) -> int:
+    notes = sys.stdin.read() if args.notes == '-' else args.notes
+    conversation = Conversation(date=args.date or date.today(), notes=notes.strip())
+    if not storage.add_conversation(args.id, conversation):
+        print(f"Could not add a conversation to person {args.id}", file=sys.stderr)
+        return 1
+    print(conversation.id)
+    return 0
+
+def search(storage, args) -> int:
+    names = {}
+    for hit in storage.search(" ".join(args.query)):
+        if hit.person_id not in names:
+            summary = storage.get_person_summary(hit.person_id)
+            names[hit.person_id] = summary.full_name if summary else ""
+        conversation_id = hit.conversation_id if hit.conversation_id is not None else ""
+        print(f"{hit.person_id}\t{conversation_id}\t{names[hit.person_id]}")
+    return 0
+
+def show_stats(storage, args) -> int:
+    print(f"persons\t{len(storage.get_sorted_person_ids())}")
+    print(f"conversations\t{storage.count_timeline()}")
+    first = storage.get_timeline(limit=1)
+    last = storage.get_timeline(limit=1, reverse=True)
+    if first:
+        print(f"first conversation\t{first[0].date.isoformat()}")
+        print(f"last conversation\t{last[0].date.isoformat()}")
+    return 0
+
+def import_persons(storage, args) -> int:
+    if is_archive(args.path):
+        stats = restore_archive(storage, args.path, args.batch_size)
+    else:
+        stats = import_file(storage, args.path, args.batch_size)
+    print(f"Imported {stats.persons} persons and {stats.conversations} conversations "
+          f"in {stats.seconds:.2f}s ({stats.persons_per_second:.0f} persons/s)")
+    for line_number, error in sorted(stats.skipped.items()):
+        print(f"Skipped line {line_number}: {error}", file=sys.stderr)
+    return 0
+
+def export_persons(storage, args) -> int:
+    count = export_archive(storage, args.path)
+    print(f"Exported {count} persons to {args.path}")
+    return 0
+
+def reindex(storage, args) -> int:
+    count = storage.reindex()
+    print(f"Reindexed {count} persons")
+    return 0
+
+def set_compression(storage, args) -> int:
+    if not isinstance(storage, StorageManager):
+        print("Compression applies to the json backend only", file=sys.stderr)
+        return 1
+    count = storage.migrate_compression(args.format)
+    print(f"Rewrote {count} person files as {args.format}")
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m lkit', description="Work with the LKIT contact store without the GUI")
+    parser.add_argument('--store', type=Path, help="store directory (default ~/.lkit)")
+    parser.add_argument('--backend', choices=sorted(BACKENDS), help="storage backend (default $LKIT_STORAGE or json)")
+    parser.add_argument('--io-stats', action='store_true', help="print storage I/O statistics to stderr at the end")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    listing = commands.add_parser('list', help="print ID, name, last contact and conversation count per person")
+    listing.add_argument('--sort', choices=['name', 'date'], default='name')
+    listing.add_argument('--reverse', action='store_true')
+    listing.add_argument('--limit', type=int)
+    listing.set_defaults(handler=list_persons)
+    
+    show = commands.add_parser('show', help="print a person and their conversations")
+    show.add_argument('id', type=int)
+    show.add_argument('--json', action='store_true', help="print the record as JSON")
+    show.set_defaults(handler=show_person)
+    
+    add = commands.add_parser('add-conversation', help="log a conversation with a person and print its ID")
+    add.add_argument('id', type=int)
+    add.add_argument('notes', help="conversation notes, or - to read them from stdin")
+    add.add_argument('--date', type=date.fromisoformat, help="YYYY-MM-DD (default today)")
+    add.set_defaults(handler=add_conversation)
+    
+    finder = commands.add_parser('search', help="print person ID, conversation ID and name for each match")
+    finder.add_argument('query', nargs='+')
+    finder.set_defaults(handler=search)
+    
+    stats = commands.add_parser('stats', help="print store totals")
+    stats.set_defaults(handler=show_stats)
+    
+    importer = commands.add_parser('import', help="import a CSV, vCard or JSON Lines file, or restore an archive")
+    importer.add_argument('path', type=Path)
+    importer.add_argument('--batch-size', type=int, default=500)
+    importer.set_defaults(handler=import_persons)
+    
+    exporter = commands.add_parser('export', help="write the whole store to an archive (.gz for compressed)")
+    exporter.add_argument('path', type=Path)
+    exporter.set_defaults(handler=export_persons)
+    
+    indexer = commands.add_parser('reindex', help="rebuild the derived indexes from the stored records")
+    indexer.set_defaults(handler=reindex)
+    
+    compressor = commands.add_parser('compress', help="rewrite the person files of a json store compressed (gzip) or plain (none)")
+    compressor.add_argument('format', choices=COMPRESSIONS)
+    compressor.set_defaults(handler=set_compression)
+    return parser
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.io_stats:
+        STATS.enable()
+    
+    storage = open_storage(args.store, args.backend)
+    try:
+        return args.handler(storage, args)
+    except BrokenPipeError:
+        # The reader (e.g. head) went away; drop the rest of the output quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        storage.close()
+        if args.io_stats:
+            print(STATS.report(), file=sys.stderr)
@@ -1,4 +1,5 @@
 from .person import Person
 from .conversation import Conversation
+from .summary import PersonSummary
 
-__all__ = ['Person', 'Conversation']
+__all__ = ['Person', 'Conversation', 'PersonSummary']
@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+@dataclass
+class PersonSummary:
+    id: int
+    first_name: str = ""
+    last_name: str = ""
+    last_contact: Optional[date] = None
+    conversation_count: int = 0
+    
+    @property
+    def full_name(self) -> str:
+        """Returns the full name of the person."""
+        return " ".join(filter(None, [self.first_name, self.last_name]))
@@ -1,3 +1,34 @@
+import os
+from pathlib import Path
+from .backend import StorageBackend, copy_store
 from .manager import StorageManager
+from .search import SearchHit
+from .timeline import TimelineEntry
+from .batch import BatchStats
+from .instrumentation import STATS, StorageStats
+from .sqlite_backend import SQLiteStorage
+from .packed_backend import PackedStorage
 
-__all__ = ['StorageManager'] 
\ No newline at end of file
+BACKENDS = {
+    'json': StorageManager,
+    'sqlite': SQLiteStorage,
+    'packed': PackedStorage,
+}
+
+def open_storage(base_dir: Path = None, backend: str = None, write_delay: float = None) -> StorageBackend:
+    """Open the configured storage backend ('json' unless LKIT_STORAGE says otherwise)
+    
+    write_delay enables the JSON store's write-behind queue; the other
+    backends write each operation directly and ignore it.
+    """
+    backend = backend or os.environ.get('LKIT_STORAGE', 'json')
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown storage backend: {backend}")
+    if backend == 'json':
+        return StorageManager(base_dir, write_delay=write_delay)
+    return BACKENDS[backend](base_dir)
+
+__all__ = [
+    'StorageBackend', 'StorageManager', 'SQLiteStorage', 'PackedStorage', 'SearchHit',
+    'TimelineEntry', 'BatchStats', 'open_storage', 'copy_store', 'STATS', 'StorageStats',
+]
@@ -0,0 +1,59 @@
+import gzip
+import io
+import json
+from pathlib import Path
+from typing import Iterator
+from .importer import ImportStats, import_records
+from .records import Record, record_from_dict, record_to_dict
+
+ARCHIVE_FORMAT = "lkit-archive"
+ARCHIVE_VERSION = 1
+BUFFER_SIZE = 1 << 20  # Archives are written and read in 1 MiB chunks
+
+def _is_compressed(path: Path) -> bool:
+    return Path(path).suffix.lower() == '.gz'
+
+def export_archive(storage, path: Path) -> int:
+    """Stream every person into a JSON Lines archive (gzip-compressed for .gz paths)
+    
+    Records are read one at a time from storage.iter_records(), so memory
+    use does not grow with the store. Returns the number of persons written.
+    """
+    count = 0
+    with open(path, 'wb', buffering=BUFFER_SIZE) as raw:
+        stream = gzip.GzipFile(fileobj=raw, mode='wb') if _is_compressed(path) else raw
+        with io.TextIOWrapper(stream, encoding='utf-8') as out:
+            out.write(json.dumps({"format": ARCHIVE_FORMAT, "version": ARCHIVE_VERSION}) + '\n')
+            for person, conversations in storage.iter_records():
+                out.write(json.dumps(record_to_dict(person, conversations), ensure_ascii=False) + '\n')
+                count += 1
+            out.flush()
+            if stream is not raw:
+                stream.close()
+    return count
+
+def is_archive(path: Path) -> bool:
+    """Whether a file starts with the header export_archive writes"""
+    try:
+        with open(path, 'rb') as raw:
+            stream = gzip.GzipFile(fileobj=raw, mode='rb') if _is_compressed(path) else raw
+            header = json.loads(stream.readline() or b'{}')
+    except (OSError, ValueError):
+        return False
+    return isinstance(header, dict) and header.get('format') == ARCHIVE_FORMAT
+
+def iter_archive(path: Path) -> Iterator[Record]:
+    """Yield the records of an archive, keeping their IDs"""
+    with open(path, 'rb', buffering=BUFFER_SIZE) as raw:
+        stream = gzip.GzipFile(fileobj=raw, mode='rb') if _is_compressed(path) else raw
+        with io.TextIOWrapper(stream, encoding='utf-8') as lines:
+            header = json.loads(next(lines, '{}'))
+            if header.get('format') != ARCHIVE_FORMAT:
+                raise ValueError(f"{path} is not an LKIT archive")
+            for line in lines:
+                if line.strip():
+                    yield record_from_dict(json.loads(line), keep_ids=True)
+
+def restore_archive(storage, path: Path, batch_size: int = 500) -> ImportStats:
+    """Load an archive back into storage in batches, overwriting persons with the same IDs"""
+    return import_records(storage, iter_archive(path), batch_size)
@@ -0,0 +1,116 @@
+import functools
+from datetime import date
+from typing import Iterable, Iterator, List, Optional, Protocol, runtime_checkable
+from models import Person, Conversation, PersonSummary
+from .search import SearchHit
+from .timeline import TimelineEntry
+from .importer import batched
+from .instrumentation import STATS
+
+def synchronized(method):
+    """Run a backend method while holding the instance's re-entrant lock
+    
+    Stores are shared between the GUI thread and background loaders, so
+    every public operation is serialized on self._lock. It is also the
+    operation storage I/O is charged to when instrumentation is enabled.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            if not STATS.enabled:
+                return method(self, *args, **kwargs)
+            with STATS.operation(method.__name__):
+                return method(self, *args, **kwargs)
+    return wrapper
+
+@runtime_checkable
+class StorageBackend(Protocol):
+    """Operations the views rely on, implemented by every storage backend"""
+    
+    def save_person(self, person: Person, conversations: List[Conversation]) -> None:
+        """Save person and their conversations, assigning IDs where missing"""
+        ...
+    
+    def save_persons(self, records: Iterable[tuple[Person, List[Conversation]]]) -> int:
+        """Save a batch of persons together, returning how many were saved"""
+        ...
+    
+    def load_person(self, person_id: int) -> Optional[tuple[Person, List[Conversation]]]:
+        """Load person and their conversations, or None if the person does not exist"""
+        ...
+    
+    def get_all_persons(self) -> List[Person]:
+        """Load all persons (without conversations) for listing"""
+        ...
+    
+    def iter_records(self) -> Iterator[tuple[Person, List[Conversation]]]:
+        """Yield every person with their conversations, one at a time"""
+        ...
+    
+    def add_conversation(self, person_id: int, conversation: Conversation) -> bool:
+        """Add a new conversation to an existing person"""
+        ...
+    
+    def update_conversation(self, person_id: int, conversation: Conversation) -> bool:
+        """Store an edit to an existing conversation"""
+        ...
+    
+    def delete_conversation(self, person_id: int, conversation_id: int) -> bool:
+        """Remove a conversation"""
+        ...
+    
+    def get_person_summaries(self) -> List[PersonSummary]:
+        """Return summary rows for all persons"""
+        ...
+    
+    def get_person_summary(self, person_id: int) -> Optional[PersonSummary]:
+        """Return the summary for a single person"""
+        ...
+    
+    def get_sorted_person_ids(self, sort_by: str = 'name', reverse: bool = False) -> List[int]:
+        """Return person IDs ordered by last contact date ('date') or first name ('name')"""
+        ...
+    
+    def upcoming_birthdays(self, days: int = 14, today: date = None) -> List[int]:
+        """IDs of persons whose birthday falls within the next days days (today included), soonest first"""
+        ...
+    
+    def stale_contacts(self, since: date, include_never: bool = True) -> List[int]:
+        """IDs of persons last contacted before since, longest ago first; never contacted ones lead"""
+        ...
+    
+    def get_timeline(self, start: date = None, end: date = None, offset: int = 0,
+                     limit: Optional[int] = None, reverse: bool = False) -> List[TimelineEntry]:
+        """A page of the conversations of all persons dated within start..end, oldest first or newest first with reverse"""
+        ...
+    
+    def count_timeline(self, start: date = None, end: date = None) -> int:
+        """Number of conversations of all persons dated within start..end"""
+        ...
+    
+    def search(self, query: str) -> List[SearchHit]:
+        """Find persons and conversations whose text contains every word of the query"""
+        ...
+    
+    def reindex(self) -> int:
+        """Rebuild every derived index from the stored records, returning the number of persons"""
+        ...
+    
+    def batch(self):
+        """Context manager grouping saves and conversation changes into one write when it ends, rolled back if it raises"""
+        ...
+    
+    def flush(self) -> int:
+        """Write any buffered changes, returning how many records were written"""
+        ...
+    
+    def close(self) -> None:
+        """Flush buffered changes and release resources"""
+        ...
+
+def copy_store(source: StorageBackend, target: StorageBackend, batch_size: int = 500) -> int:
+    """Copy every person and their conversations from one backend to another"""
+    copied = 0
+    for batch in batched(source.iter_records(), batch_size):
+        copied += target.save_persons(batch)
+    return copied
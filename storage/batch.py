@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+
+@dataclass
+class BatchStats:
+    """What a storage batch buffered and how many writes applying it took"""
+    changes: int = 0  # Person saves and conversation changes made inside the batch
+    writes: int = 0  # Writes made when the batch was applied
+    rolled_back: bool = False
+    
+    @property
+    def coalesced(self) -> int:
+        """Changes that did not need a write of their own"""
+        return max(0, self.changes - self.writes)
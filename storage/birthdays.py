@@ -0,0 +1,21 @@
+from datetime import date, timedelta
+from typing import List, Optional
+
+def birthday_key(birth_date: Optional[date]) -> str:
+    """Day-of-year key ('MM-DD') a birthday is indexed under; '' when unknown"""
+    return birth_date.strftime('%m-%d') if birth_date else ''
+
+def birthday_ranges(today: date, days: int) -> List[tuple[str, str]]:
+    """Inclusive key ranges of the birthdays falling on today and the following days - 1 days, in date order
+    
+    A window crossing the new year is split in two; a 29 February birthday
+    falls inside any window spanning the end of February.
+    """
+    if days <= 0:
+        return []
+    if days >= 365:
+        return [(birthday_key(today), '12-31'), ('01-01', birthday_key(today - timedelta(days=1)))]
+    end = today + timedelta(days=days - 1)
+    if end.year == today.year:
+        return [(birthday_key(today), birthday_key(end))]
+    return [(birthday_key(today), '12-31'), ('01-01', birthday_key(end))]
@@ -0,0 +1,52 @@
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Any
+from .instrumentation import STATS
+
+GZIP_MAGIC = b'\x1f\x8b'
+COMPRESS_LEVEL = 6
+
+def is_compressed(path: Path) -> bool:
+    """Check whether a file is gzip-compressed"""
+    with open(path, 'rb') as f:
+        return f.read(2) == GZIP_MAGIC
+
+def read_text(path: Path) -> str:
+    """Read a whole text file, decompressing it if it is gzip-compressed"""
+    with STATS.timed('read_seconds'):
+        with open(path, 'rb') as f:
+            raw = f.read()
+    STATS.add('files_opened')
+    STATS.add('bytes_read', len(raw))
+    if raw[:2] == GZIP_MAGIC:
+        with STATS.timed('parse_seconds'):
+            raw = gzip.decompress(raw)
+    return raw.decode('utf-8')
+
+def read_json(path: Path) -> Any:
+    """Read and parse a JSON file"""
+    text = read_text(path)
+    with STATS.timed('parse_seconds'):
+        return json.loads(text)
+
+def write_json_atomic(path: Path, data: Any, compress: bool = False, **dump_options) -> None:
+    """Write JSON through a temporary file and os.replace, so readers never see a partial file
+    
+    With compress the file is gzip-compressed; read_text detects that itself.
+    """
+    with STATS.timed('serialize_seconds'):
+        raw = json.dumps(data, ensure_ascii=False, **dump_options).encode('utf-8')
+        if compress:
+            # mtime=0 keeps the output identical for identical data
+            raw = gzip.compress(raw, COMPRESS_LEVEL, mtime=0)
+    temp_path = path.with_name(path.name + '.tmp')
+    with STATS.timed('write_seconds'):
+        with open(temp_path, 'wb') as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    STATS.add('files_opened')
+    STATS.add('bytes_written', len(raw))
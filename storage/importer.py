@@ -0,0 +1,184 @@
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from models import Person, Conversation
+from .records import Record, parse_date, record_from_dict
+
+@dataclass
+class ImportStats:
+    persons: int = 0
+    conversations: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    skipped: Dict[int, str] = field(default_factory=dict)  # Line number of each unreadable row and why
+    
+    @property
+    def persons_per_second(self) -> float:
+        """Import throughput"""
+        return self.persons / self.seconds if self.seconds else 0.0
+
+def _csv_row_to_record(row: Dict[str, str]) -> Record:
+    """Map a CSV row onto a person and their optional conversation"""
+    person = Person(
+        first_name=(row.get('first_name') or "").strip(),
+        last_name=(row.get('last_name') or "").strip(),
+        email=(row.get('email') or "").strip() or None,
+        phone=(row.get('phone') or "").strip() or None,
+        birth_date=parse_date(row.get('birth_date')),
+        notes=(row.get('notes') or "").strip()
+    )
+    conversations = []
+    if (row.get('conversation_notes') or "").strip():
+        conversations.append(Conversation(
+            date=parse_date(row.get('conversation_date')) or date.today(),
+            notes=row['conversation_notes'].strip()
+        ))
+    return person, conversations
+
+def csv_records(path: Path, skipped: Optional[Dict[int, str]] = None) -> Iterator[Record]:
+    """Read persons from a CSV file with a header row
+    
+    Recognized columns are first_name, last_name, email, phone, birth_date
+    and notes. A row may also carry one conversation in conversation_date
+    and conversation_notes. Rows with an invalid date are left out and
+    recorded in skipped by line number.
+    """
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            try:
+                record = _csv_row_to_record(row)
+            except ValueError as e:
+                if skipped is not None:
+                    skipped[reader.line_num] = str(e)
+                continue
+            yield record
+
+def _unfold_lines(f) -> Iterator[str]:
+    """Join vCard continuation lines (starting with a space or tab) onto the previous line"""
+    current = None
+    for line in f:
+        line = line.rstrip('\r\n')
+        if line[:1] in (' ', '\t') and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+def _unescape(value: str) -> str:
+    """Undo vCard text escaping"""
+    return value.replace('\\n', '\n').replace('\\N', '\n').replace('\\,', ',').replace('\\;', ';').replace('\\\\', '\\')
+
+def vcard_records(path: Path, skipped: Optional[Dict[int, str]] = None) -> Iterator[Record]:
+    """Read persons from a vCard (.vcf) file, one card at a time"""
+    with open(path, 'r', encoding='utf-8') as f:
+        fields: Optional[Dict[str, str]] = None
+        for line in _unfold_lines(f):
+            name, _, value = line.partition(':')
+            # Drop parameters such as TEL;TYPE=cell and group prefixes such as item1.EMAIL
+            name = name.split(';')[0].split('.')[-1].upper()
+            if name == 'BEGIN' and value.upper() == 'VCARD':
+                fields = {}
+            elif name == 'END' and value.upper() == 'VCARD' and fields is not None:
+                yield _vcard_to_record(fields), []
+                fields = None
+            elif fields is not None and name not in fields:
+                fields[name] = value
+
+def _vcard_to_record(fields: Dict[str, str]) -> Person:
+    """Map the first value of each vCard property onto a Person"""
+    last_name, first_name = "", ""
+    if 'N' in fields:
+        parts = fields['N'].split(';')
+        last_name = _unescape(parts[0]).strip()
+        first_name = _unescape(parts[1]).strip() if len(parts) > 1 else ""
+    if not first_name and not last_name and 'FN' in fields:
+        first_name, _, last_name = _unescape(fields['FN']).strip().partition(' ')
+    
+    birth_date = None
+    try:
+        birth_date = parse_date(fields.get('BDAY'))
+    except ValueError:
+        pass  # Partial dates such as --0415 have no year
+    
+    return Person(
+        first_name=first_name,
+        last_name=last_name,
+        email=_unescape(fields['EMAIL']).strip() if 'EMAIL' in fields else None,
+        phone=_unescape(fields['TEL']).strip() if 'TEL' in fields else None,
+        birth_date=birth_date,
+        notes=_unescape(fields.get('NOTE', "")).strip()
+    )
+
+def jsonl_records(path: Path, skipped: Optional[Dict[int, str]] = None) -> Iterator[Record]:
+    """Read persons from a JSON Lines file holding one person record per line
+    
+    Lines that are not valid JSON or hold an invalid date are left out and
+    recorded in skipped by line number.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = record_from_dict(json.loads(line))
+            except (ValueError, TypeError, AttributeError) as e:
+                if skipped is not None:
+                    skipped[line_number] = str(e)
+                continue
+            yield record
+
+READERS = {
+    '.csv': csv_records,
+    '.vcf': vcard_records,
+    '.jsonl': jsonl_records,
+}
+
+def read_records(path: Path, skipped: Optional[Dict[int, str]] = None) -> Iterator[Record]:
+    """Pick a reader from the file extension; unreadable rows are recorded in skipped"""
+    reader = READERS.get(Path(path).suffix.lower())
+    if reader is None:
+        raise ValueError(f"Unsupported import format: {Path(path).suffix}")
+    return reader(path, skipped)
+
+def batched(records: Iterable[Record], size: int) -> Iterator[List[Record]]:
+    """Group records into lists of at most size items"""
+    iterator = iter(records)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+def import_records(storage, records: Iterable[Record], batch_size: int = 500,
+                   progress: Callable[[ImportStats], None] = None, stats: ImportStats = None) -> ImportStats:
+    """Stream records into storage in batches, returning counts and throughput"""
+    stats = stats or ImportStats()
+    started = time.perf_counter()
+    for batch in batched(records, batch_size):
+        storage.save_persons(batch)
+        stats.persons += len(batch)
+        stats.conversations += sum(len(conversations) for _, conversations in batch)
+        stats.batches += 1
+        stats.seconds = time.perf_counter() - started
+        if progress:
+            progress(stats)
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+def import_file(storage, path: Path, batch_size: int = 500,
+                progress: Callable[[ImportStats], None] = None) -> ImportStats:
+    """Import a CSV, vCard or JSON Lines file into storage, skipping rows that cannot be read
+    
+    Skipped rows are listed in the returned stats' skipped, by line number.
+    """
+    stats = ImportStats()
+    return import_records(storage, read_records(path, stats.skipped), batch_size, progress, stats)
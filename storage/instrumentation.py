@@ -0,0 +1,136 @@
+import atexit
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from typing import Dict, Optional
+
+# Reported metrics, in report column order
+METRICS = [
+    'calls', 'seconds', 'dir_scans', 'scan_seconds', 'files_opened', 'bytes_read', 'bytes_written',
+    'read_seconds', 'write_seconds', 'parse_seconds', 'serialize_seconds',
+]
+# Operation charged for I/O that happens outside any public storage method
+OTHER = '(other)'
+
+_DISABLED = nullcontext()
+
+class _Timer:
+    """Adds the elapsed time of a with-block to a metric"""
+    __slots__ = ('stats', 'metric', 'started')
+    
+    def __init__(self, stats: 'StorageStats', metric: str):
+        self.stats = stats
+        self.metric = metric
+    
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.stats.add(self.metric, time.perf_counter() - self.started)
+        return False
+
+class _Operation:
+    """Charges I/O inside a with-block to a public storage method; nested methods count toward the outermost"""
+    __slots__ = ('stats', 'name', 'counted', 'outermost', 'started')
+    
+    def __init__(self, stats: 'StorageStats', name: str, counted: bool = True):
+        self.stats = stats
+        self.name = name
+        self.counted = counted
+    
+    def __enter__(self):
+        local = self.stats._local
+        self.outermost = getattr(local, 'operation', None) is None
+        if self.outermost:
+            local.operation = self.name
+            self.started = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        if self.outermost:
+            if self.counted:
+                self.stats.add('calls', 1)
+                self.stats.add('seconds', time.perf_counter() - self.started)
+            self.stats._local.operation = None
+        return False
+
+class StorageStats:
+    """Process-wide counters and cumulative timings of storage I/O, per public storage method
+    
+    Disabled by default: every hook then returns after checking one flag.
+    Setting LKIT_STORAGE_STATS enables it at startup and dumps a report at
+    exit, to stderr for '1' or else to the file it names.
+    """
+    
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._totals: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    
+    def enable(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+    
+    def reset(self) -> None:
+        """Drop everything counted so far"""
+        with self._lock:
+            self._totals.clear()
+    
+    def add(self, metric: str, value: float = 1) -> None:
+        """Add to a metric of the operation running on this thread"""
+        if not self.enabled:
+            return
+        operation = getattr(self._local, 'operation', None) or OTHER
+        with self._lock:
+            self._totals[operation][metric] += value
+    
+    def timed(self, metric: str):
+        """Context manager adding its elapsed time to a metric"""
+        return _Timer(self, metric) if self.enabled else _DISABLED
+    
+    def operation(self, name: str, counted: bool = True):
+        """Context manager charging the I/O inside it to the named operation
+        
+        Worker threads pass counted=False to charge their I/O to the
+        operation that started them without counting another call.
+        """
+        return _Operation(self, name, counted) if self.enabled else _DISABLED
+    
+    def current_operation(self) -> Optional[str]:
+        """Operation running on this thread, if any"""
+        return getattr(self._local, 'operation', None)
+    
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Copy of the totals by operation, then metric"""
+        with self._lock:
+            return {operation: dict(metrics) for operation, metrics in self._totals.items()}
+    
+    def report(self) -> str:
+        """Totals as a text table, slowest operation first"""
+        snapshot = self.snapshot()
+        lines = ["operation".ljust(24) + "".join(metric.rjust(18) for metric in METRICS)]
+        for operation, metrics in sorted(snapshot.items(), key=lambda item: -item[1].get('seconds', 0)):
+            cells = []
+            for metric in METRICS:
+                value = metrics.get(metric, 0)
+                cells.append((f"{value:.4f}" if metric.endswith('seconds') else f"{int(value)}").rjust(18))
+            lines.append(operation.ljust(24) + "".join(cells))
+        return "\n".join(lines)
+
+STATS = StorageStats()
+
+def _dump_report(target: str) -> None:
+    if target == '1':
+        print(STATS.report(), file=sys.stderr)
+        return
+    with open(target, 'w', encoding='utf-8') as f:
+        f.write(STATS.report() + "\n")
+
+_report_target: Optional[str] = os.environ.get('LKIT_STORAGE_STATS')
+if _report_target:
+    STATS.enable()
+    atexit.register(_dump_report, _report_target)
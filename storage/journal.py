@@ -0,0 +1,107 @@
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+from .instrumentation import STATS
+
+def append_entry(path: Path, entry: Dict) -> None:
+    """Append one JSON entry as a single line to a journal file"""
+    append_entries(path, [entry])
+
+def append_entries(path: Path, entries: List[Dict]) -> None:
+    """Append several JSON entries to a journal file with a single write"""
+    if not entries:
+        return
+    with STATS.timed('serialize_seconds'):
+        lines = ''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries)
+    with STATS.timed('write_seconds'):
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+    STATS.add('files_opened')
+    STATS.add('bytes_written', len(lines))
+
+def read_entries(path: Path) -> Iterator[Dict]:
+    """Yield the entries of a journal file, skipping a line torn by an interrupted append"""
+    try:
+        f = open(path, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        return
+    STATS.add('files_opened')
+    with f:
+        for line in f:
+            STATS.add('bytes_read', len(line))
+            try:
+                with STATS.timed('parse_seconds'):
+                    entry = json.loads(line)
+            except ValueError:
+                continue
+            yield entry
+
+def apply_conversation_entries(conversations: List[Dict], entries: Iterator[Dict]) -> List[Dict]:
+    """Fold logged conversation adds, updates and deletes into stored conversation data"""
+    by_id = {conv['id']: conv for conv in conversations}
+    for entry in entries:
+        op = entry.get('op')
+        conv = {key: value for key, value in entry.items() if key != 'op'}
+        if op in ('add', 'update'):
+            by_id[conv['id']] = conv
+        elif op == 'delete':
+            by_id.pop(conv['id'], None)
+    return list(by_id.values())
+
+class JournaledIndex(ABC):
+    """Base for in-memory indexes persisted as a snapshot plus a journal of changes
+    
+    Subclasses apply journal entries in _apply and write their snapshot in
+    save(). Every change is appended to the journal, so updates cost one
+    small write; the snapshot is rewritten once the journal has grown past
+    JOURNAL_LIMIT entries. Between hold() and release() the journal writes
+    are collected and made with a single append.
+    """
+    JOURNAL_LIMIT = 5000
+    
+    def __init__(self, index_file: Optional[Path], journal_file: Optional[Path]):
+        self.index_file = index_file
+        self.journal_file = journal_file
+        self._journal_entries = 0
+        self._held: Optional[List[Dict]] = None
+    
+    @abstractmethod
+    def save(self) -> None:
+        """Write a snapshot of the index and discard the journal"""
+    
+    @abstractmethod
+    def _apply(self, entry: Dict) -> None:
+        """Apply one journal entry to the in-memory index"""
+    
+    def _record(self, entry: Dict) -> None:
+        """Apply a change and journal it"""
+        self._record_all([entry])
+    
+    def _record_all(self, entries: List[Dict]) -> None:
+        """Apply several changes and journal them with one write"""
+        for entry in entries:
+            self._apply(entry)
+        if self._held is not None:
+            self._held += entries
+        else:
+            self._append(entries)
+    
+    def _append(self, entries: List[Dict]) -> None:
+        if self.journal_file is None or not entries:
+            return
+        append_entries(self.journal_file, entries)
+        self._journal_entries += len(entries)
+        if self._journal_entries >= self.JOURNAL_LIMIT:
+            self.save()
+    
+    def hold(self) -> None:
+        """Collect journal writes in memory until release()"""
+        if self._held is None:
+            self._held = []
+    
+    def release(self, write: bool = True) -> None:
+        """Stop holding journal writes, appending the collected ones unless write is False"""
+        held, self._held = self._held or [], None
+        if write:
+            self._append(held)
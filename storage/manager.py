@@ -1,20 +1,108 @@
 import os
 import json
+import atexit
+import threading
+import multiprocessing
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, List
-from datetime import date
-from models import Person, Conversation
+from typing import Optional, Dict, Iterable, Iterator, List
+from datetime import date, timedelta
+from models import Person, Conversation, PersonSummary
+from .journal import append_entry, append_entries, read_entries, apply_conversation_entries
+from .search import SearchIndex, SearchHit
+from .backend import synchronized
+from .fileio import read_json, read_text, write_json_atomic, is_compressed
+from .instrumentation import STATS, StorageStats
+from .write_queue import WriteBehindQueue
+from .archive import export_archive, restore_archive
+from .importer import ImportStats
+from .records import record_from_dict, record_to_dict
+from .settings import StoreSettings, LAYOUTS, COMPRESSIONS
+from .sorted_index import SortedIndex
+from .birthdays import birthday_key, birthday_ranges
+from .timeline import ConversationTimeline, TimelineEntry
+from .batch import BatchStats
+
+def _decode_person_fields(text: str) -> Dict:
+    """Parse a person file, dropping the conversations; runs in worker processes"""
+    data = json.loads(text)
+    data.pop('conversations', None)
+    return data
 
 class StorageManager:
-    def __init__(self, base_dir: Path = None):
+    # Fold a person's conversation log back into their file once it grows past this size
+    LOG_COMPACT_BYTES = 256 * 1024
+    # Rewrite the catalog once this many row updates have been journaled
+    CATALOG_LOG_LIMIT = 1000
+    # Threads reading person files in get_all_persons, and the most files each reads per task
+    READ_WORKERS = 8
+    READ_CHUNK = 256
+    # Person files at least this large are parsed in worker processes when get_all_persons uses them
+    DECODE_PROCESS_BYTES = 1024 * 1024
+    
+    def __init__(self, base_dir: Path = None, write_delay: Optional[float] = None):
+        """Open the store; with write_delay set, person files are written behind after that many seconds"""
         self.base_dir = base_dir or Path.home() / '.lkit'
         self.persons_dir = self.base_dir / 'persons'
-        self.ensure_directories()
+        self.logs_dir = self.base_dir / 'conversations'
+        self.index_file = self.base_dir / 'index.json'
+        self.catalog_file = self.base_dir / 'catalog.json'
+        self.catalog_log_file = self.base_dir / 'catalog.log'
+        self.settings_file = self.base_dir / 'store.json'
+        self.settings = StoreSettings.load(self.settings_file)
+        self._catalog_log_entries = 0
+        self.read_errors: Dict[int, str] = {}
+        self._lock = threading.RLock()
+        self._write_queue = None
+        if write_delay is not None:
+            self._write_queue = WriteBehindQueue(write_delay, self.flush)
+            atexit.register(self.close)
+        
+        # State of an open batch(): person writes, log appends, catalog rows and index saves held until it ends
+        self._batch: Optional[BatchStats] = None
+        self._batch_queue: Optional[WriteBehindQueue] = None
+        self._held_logs: Dict[int, List[Dict]] = {}
+        self._held_rows: Dict[int, Dict] = {}
+        self._held_saves: set = set()
+        
+        self._sort_indexes = {
+            'date': SortedIndex(lambda row: row['last_contact'] or ''),
+            'name': SortedIndex(lambda row: row['first_name'].lower()),
+            'birthday': SortedIndex(lambda row: row['birthday']),
+        }
+        self._search_index = SearchIndex(self.base_dir / 'search.json', self.base_dir / 'search.log')
+        self._timeline_index = ConversationTimeline(self.base_dir / 'timeline.json', self.base_dir / 'timeline.log')
+        with STATS.operation('open'):
+            self.ensure_directories()
+            self._load_state()
+    
+    def _load_state(self) -> None:
+        """Load the index, catalog, sort orders, search index and timeline from disk"""
+        self._index_was_stale = False
+        self._index = self._load_index()
         self._next_id = self._get_next_id()
+        self._catalog = self._load_catalog()
+        for sort_index in self._sort_indexes.values():
+            sort_index.rebuild(self._catalog)
+        # The search index and timeline are the largest files; they are read on first use
+        self._search_loaded = False
+        self._timeline_loaded = False
+    
+    @property
+    def _queue(self) -> Optional[WriteBehindQueue]:
+        """Where person writes wait: the open batch, else the write-behind queue if there is one"""
+        return self._batch_queue if self._batch_queue is not None else self._write_queue
+    
+    @property
+    def stats(self) -> StorageStats:
+        """I/O counters and timings; enable with stats.enable() or LKIT_STORAGE_STATS"""
+        return STATS
     
     def ensure_directories(self):
         """Create necessary directories if they don't exist"""
         self.persons_dir.mkdir(parents=True, exist_ok=True)
+        self.logs_dir.mkdir(parents=True, exist_ok=True)
     
     def _get_file_name(self, person: Person) -> str:
         """Generate file name in format: LastNameFirstNameID.json"""
@@ -35,67 +123,463 @@ class StorageManager:
         return int(digits) if digits else 0
     
     def _get_next_id(self) -> int:
-        """Find the next available ID by checking existing files"""
-        existing_ids = [
-            self._get_id_from_file_name(f.name)
-            for f in self.persons_dir.glob('*.json')
-        ]
-        return max(existing_ids, default=0) + 1
+        """Find the next available ID from the file index"""
+        return max(self._index, default=0) + 1
+    
+    def _get_person_dir(self, person_id: int) -> Path:
+        """Directory holding a person's file: persons/ or, when sharded, its ID bucket"""
+        if self.settings.layout == 'sharded':
+            return self.persons_dir / f"{person_id // self.settings.shard_size:06d}"
+        return self.persons_dir
+    
+    def _get_person_file(self, person: Person) -> Path:
+        """Full path of the file a person is saved to"""
+        return self._get_person_dir(person.id) / self._get_file_name(person)
+    
+    def _get_dir_stamp(self) -> int:
+        """Latest modification time of the persons directory and its buckets, used to detect a stale index"""
+        stamp = self.persons_dir.stat().st_mtime_ns
+        if self.settings.layout == 'sharded':
+            STATS.add('dir_scans')
+            with os.scandir(self.persons_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        stamp = max(stamp, entry.stat().st_mtime_ns)
+        return stamp
+    
+    def _iter_person_files(self) -> Iterator[Path]:
+        """Every person file, in either layout (a half-finished migration leaves both)"""
+        yield from self.persons_dir.glob('*.json')
+        yield from self.persons_dir.glob('*/*.json')
+    
+    def _build_index(self) -> Dict[int, Path]:
+        """Map every person ID to its file by scanning the persons directory"""
+        index = {}
+        with STATS.timed('scan_seconds'):
+            for file_path in self._iter_person_files():
+                index[self._get_id_from_file_name(file_path.name)] = file_path
+        STATS.add('dir_scans', 2)
+        return index
+    
+    def _load_index(self) -> Dict[int, Path]:
+        """Load the persisted ID index, rescanning file names if the directory changed since"""
+        saved = None
+        try:
+            data = read_json(self.index_file)
+            saved = {
+                int(person_id): self.persons_dir / relative_path
+                for person_id, relative_path in data['files'].items()
+            }
+            if data.get('dir_stamp') == self._get_dir_stamp():
+                self._index_stamp = self._saved_stamp = data['dir_stamp']
+                return saved
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        
+        # Rewriting files in place also touches the directory, so only a
+        # different set of files means the derived catalogs are stale
+        index = self._build_index()
+        self._index_was_stale = index != saved
+        self._save_index(index)
+        return index
+    
+    def _save_index(self, index: Dict[int, Path] = None) -> None:
+        """Persist the ID index along with the directory stamp it matches"""
+        if self._batch is not None:
+            self._held_saves.add('index')
+            return
+        index = self._index if index is None else index
+        self._index_stamp = self._get_dir_stamp()
+        data = {
+            "dir_stamp": self._index_stamp,
+            "files": {
+                str(person_id): path.relative_to(self.persons_dir).as_posix()
+                for person_id, path in index.items()
+            }
+        }
+        write_json_atomic(self.index_file, data)
+        self._saved_stamp = self._index_stamp
+    
+    def _save_index_stamp(self) -> None:
+        """Persist the index if our own in-place writes moved the directory stamp past the saved one
+        
+        Saves that keep a file's name leave the index as it is but still touch
+        the directory; without this the next start would rescan every file.
+        """
+        if self._batch is not None or self._index_stamp == self._saved_stamp:
+            return
+        try:
+            if self._get_dir_stamp() == self._index_stamp:
+                self._save_index()
+        except OSError:
+            pass  # The store went away; the next start just rescans
+    
+    def _rebuild_index(self) -> None:
+        """Rescan the persons directory after the index was found to be out of date"""
+        self._index = self._build_index()
+        # Persons whose first write is still queued have no file yet
+        if self._queue is not None:
+            for person_id, (file_path, _, _) in self._queue.items():
+                self._index[person_id] = file_path
+        self._save_index()
+        self._sync_catalog()
+    
+    def _get_person_path(self, person_id: int) -> Optional[Path]:
+        """Look up the file for a person, rescanning once if the index is stale"""
+        if self._queue is not None and person_id in self._queue:
+            return self._queue.get(person_id)[0]
+        
+        file_path = self._index.get(person_id)
+        if file_path is not None:
+            if file_path.exists():
+                return file_path
+        elif self._get_dir_stamp() == self._index_stamp:
+            return None
+        
+        self._rebuild_index()
+        return self._index.get(person_id)
     
-    def _person_to_dict(self, person: Person, conversations: List[Conversation]) -> Dict:
-        """Convert person and conversations to a dictionary for JSON storage"""
+    def _summary_row(self, person: Person, conversations: List[Conversation]) -> Dict:
+        """Build the catalog row describing a person and their conversations"""
+        last_contact = max((c.date for c in conversations), default=None)
         return {
-            "id": person.id,
             "first_name": person.first_name,
             "last_name": person.last_name,
-            "email": person.email,
-            "phone": person.phone,
-            "birth_date": person.birth_date.isoformat() if person.birth_date else None,
-            "notes": person.notes,
-            "conversations": [
-                {
-                    "id": conv.id,
-                    "date": conv.date.isoformat(),
-                    "notes": conv.notes
-                }
-                for conv in conversations
-            ]
+            "last_contact": last_contact.isoformat() if last_contact else None,
+            "conversation_count": len(conversations),
+            "last_conversation_id": max((c.id for c in conversations if c.id), default=0),
+            "birthday": birthday_key(person.birth_date)
         }
     
-    def _dict_to_person(self, data: Dict) -> tuple[Person, List[Conversation]]:
-        """Convert dictionary data back to Person and Conversation objects"""
-        # Convert birth_date string back to date object if it exists
-        birth_date = None
-        if data.get('birth_date'):
-            birth_date = date.fromisoformat(data['birth_date'])
-        
-        person = Person(
-            id=data['id'],
-            first_name=data['first_name'],
-            last_name=data['last_name'],
-            email=data.get('email'),
-            phone=data.get('phone'),
-            birth_date=birth_date,
-            notes=data.get('notes')
+    def _row_to_summary(self, person_id: int, row: Dict) -> PersonSummary:
+        """Convert a catalog row into a PersonSummary"""
+        last_contact = None
+        if row.get('last_contact'):
+            last_contact = date.fromisoformat(row['last_contact'])
+        
+        return PersonSummary(
+            id=person_id,
+            first_name=row['first_name'],
+            last_name=row['last_name'],
+            last_contact=last_contact,
+            conversation_count=row.get('conversation_count', 0)
         )
+    
+    def _build_catalog(self) -> Dict[int, Dict]:
+        """Build the summary catalog by reading every person file"""
+        return {
+            person.id: self._summary_row(person, conversations)
+            for person, conversations in self._iter_records()
+        }
+    
+    def _load_catalog(self) -> Dict[int, Dict]:
+        """Load the persisted summary catalog, rebuilding it if it does not match the index"""
+        if not self._index_was_stale:
+            try:
+                data = read_json(self.catalog_file)
+                catalog = {int(person_id): row for person_id, row in data['persons'].items()}
+                
+                # Replay row updates journaled since the catalog was last written
+                replayed = False
+                for entry in read_entries(self.catalog_log_file):
+                    catalog[entry['id']] = entry['row']
+                    replayed = True
+                
+                # Catalogs written before birthdays were indexed are rebuilt once
+                current = all('birthday' in row for row in catalog.values())
+                if catalog.keys() == self._index.keys() and current:
+                    if replayed:
+                        self._save_catalog(catalog)
+                    return catalog
+            except (OSError, ValueError, KeyError, AttributeError):
+                pass
+        
+        catalog = self._build_catalog()
+        self._save_catalog(catalog)
+        return catalog
+    
+    def _save_catalog(self, catalog: Dict[int, Dict] = None) -> None:
+        """Persist the summary catalog and discard the row journal it supersedes"""
+        if self._batch is not None:
+            self._held_saves.add('catalog')
+            return
+        catalog = self._catalog if catalog is None else catalog
+        data = {"persons": {str(person_id): row for person_id, row in catalog.items()}}
+        write_json_atomic(self.catalog_file, data)
+        self.catalog_log_file.unlink(missing_ok=True)
+        self._catalog_log_entries = 0
+    
+    def _sync_catalog(self) -> None:
+        """Bring the catalog in line with a freshly rebuilt index"""
+        stale_ids = self._catalog.keys() - self._index.keys()
+        new_ids = self._index.keys() - self._catalog.keys()
+        if not stale_ids and not new_ids:
+            return
+        
+        for person_id in stale_ids:
+            del self._catalog[person_id]
+            self._search.remove_person(person_id)
+            self._timeline.remove_person(person_id)
+            for sort_index in self._sort_indexes.values():
+                sort_index.remove(person_id)
+        for person_id in new_ids:
+            try:
+                data = self._read_person_data(person_id, self._index[person_id])
+                person, conversations = record_from_dict(data, keep_ids=True)
+                self._catalog[person_id] = self._summary_row(person, conversations)
+                self._search.index_person(person, conversations)
+                self._timeline.index_persons([(person, conversations)])
+                for sort_index in self._sort_indexes.values():
+                    sort_index.update(person_id, self._catalog[person_id])
+            except Exception as e:
+                print(f"Error reading {self._index[person_id].name} for catalog: {str(e)}")
+        self._save_catalog()
+    
+    def _set_catalog_row(self, person_id: int, row: Dict) -> None:
+        """Store a catalog row, journaling the change instead of rewriting the catalog"""
+        self._set_catalog_rows([(person_id, row)])
+    
+    def _set_catalog_rows(self, rows: List[tuple[int, Dict]]) -> None:
+        """Store several catalog rows, journaling the changed ones with one write"""
+        changed = [(person_id, row) for person_id, row in rows if self._catalog.get(person_id) != row]
+        if not changed:
+            return
+        
+        for person_id, row in changed:
+            self._catalog[person_id] = row
+            for sort_index in self._sort_indexes.values():
+                sort_index.update(person_id, row)
+        if self._batch is not None:
+            self._held_rows.update(changed)
+        else:
+            self._journal_catalog_rows(changed)
+    
+    def _journal_catalog_rows(self, rows: List[tuple[int, Dict]]) -> None:
+        """Append catalog row changes to the catalog log, rewriting the catalog once the log is long"""
+        append_entries(self.catalog_log_file, [{"id": person_id, "row": row} for person_id, row in rows])
+        self._catalog_log_entries += len(rows)
+        if self._catalog_log_entries >= self.CATALOG_LOG_LIMIT:
+            self._save_catalog()
+    
+    def _update_catalog(self, person: Person, conversations: List[Conversation]) -> None:
+        """Refresh a single catalog row from a person's full data"""
+        self._set_catalog_row(person.id, self._summary_row(person, conversations))
+    
+    def _iter_records(self):
+        """Yield every person with their conversations, skipping unreadable files"""
+        for person_id, file_path in self._index.items():
+            try:
+                yield record_from_dict(self._read_person_data(person_id, file_path), keep_ids=True)
+            except Exception as e:
+                print(f"Error reading {file_path.name}: {str(e)}")
+    
+    @property
+    def _search(self) -> SearchIndex:
+        """The search index, loaded on first use"""
+        if not self._search_loaded:
+            self._search_loaded = True
+            self._load_search_index()
+        return self._search_index
+    
+    @property
+    def _timeline(self) -> ConversationTimeline:
+        """The conversation timeline, loaded on first use"""
+        if not self._timeline_loaded:
+            self._timeline_loaded = True
+            self._load_timeline()
+        return self._timeline_index
+    
+    def _load_search_index(self) -> None:
+        """Load the persisted search index, re-indexing every person if it does not match the index"""
+        if not self._index_was_stale and self._search_index.load():
+            if self._search_index.person_ids() == self._index.keys():
+                return
+        self._search_index.rebuild(self._iter_records())
+    
+    def _load_timeline(self) -> None:
+        """Load the persisted conversation timeline, rebuilding it if it does not match the catalog"""
+        if not self._index_was_stale and self._timeline_index.load():
+            counts = {
+                person_id: row['conversation_count']
+                for person_id, row in self._catalog.items() if row['conversation_count']
+            }
+            if self._timeline_index.conversation_counts() == counts:
+                return
+        self._timeline_index.rebuild(self._iter_records())
+    
+    def _log_path(self, person_id: int) -> Path:
+        """Path of the append-only conversation log for a person"""
+        return self.logs_dir / f"{person_id}.jsonl"
+    
+    def _read_person_data(self, person_id: int, file_path: Path) -> Dict:
+        """Read a person file and merge in their logged conversation changes"""
+        if self._queue is not None and person_id in self._queue:
+            # The queued record already includes every logged change
+            return self._queue.get(person_id)[1]
         
-        conversations = []
-        for conv_data in data.get('conversations', []):
-            conversation = Conversation(
-                id=conv_data['id'],
-                person_id=person.id,
-                date=date.fromisoformat(conv_data['date']),
-                notes=conv_data['notes']
+        data = read_json(file_path)
+        
+        log_path = self._log_path(person_id)
+        if log_path.exists():
+            data['conversations'] = apply_conversation_entries(
+                data.get('conversations', []), read_entries(log_path)
+            )
+        if person_id in self._held_logs:
+            data['conversations'] = apply_conversation_entries(
+                data.get('conversations', []), self._held_logs[person_id]
             )
-            conversations.append(conversation)
+        return data
+    
+    def _conversation_entry(self, op: str, conversation: Conversation) -> Dict:
+        """Build a conversation log entry"""
+        return {
+            "op": op,
+            "id": conversation.id,
+            "date": conversation.date.isoformat(),
+            "notes": conversation.notes
+        }
+    
+    def _append_conversation_entry(self, person_id: int, entry: Dict) -> None:
+        """Append to a person's conversation log, compacting it once it grows too large"""
+        if self._queue is not None and person_id in self._queue:
+            # Fold the change into the queued record instead of logging it
+            file_path, data, stale_path = self._queue.get(person_id)
+            data['conversations'] = apply_conversation_entries(data['conversations'], [entry])
+            self._queue.put(person_id, (file_path, data, stale_path))
+            return
+        if self._batch is not None:
+            self._held_logs.setdefault(person_id, []).append(entry)
+            return
         
-        return person, conversations
+        log_path = self._log_path(person_id)
+        append_entry(log_path, entry)
+        if log_path.stat().st_size >= self.LOG_COMPACT_BYTES:
+            self.compact_conversations(person_id)
     
-    def save_person(self, person: Person, conversations: List[Conversation]) -> None:
-        """Save person and their conversations to a JSON file"""
+    def _write_person_file(self, person_id: int, file_path: Path, data: Dict, stale_path: Optional[Path]) -> None:
+        """Atomically write a person file, then drop the log it supersedes and any file under an old name"""
+        file_path.parent.mkdir(exist_ok=True)
+        self._write_person_json(file_path, data)
+        
+        # The file now holds every conversation, so any pending log is folded in
+        self._log_path(person_id).unlink(missing_ok=True)
+        if stale_path is not None and stale_path != file_path:
+            stale_path.unlink(missing_ok=True)
+        
+        # Our own writes touch the directory; only external changes should force a rescan
+        self._index_stamp = self._get_dir_stamp()
+    
+    def _write_person_json(self, file_path: Path, data: Dict) -> None:
+        """Write person data in the store's format: indented JSON, or compact gzip-compressed JSON"""
+        if self.settings.compression == 'gzip':
+            write_json_atomic(file_path, data, compress=True, separators=(',', ':'))
+        else:
+            write_json_atomic(file_path, data, indent=2)
+    
+    @synchronized
+    def flush(self) -> int:
+        """Write every queued person file now, returning how many were written"""
+        if self._write_queue is None:
+            return 0
+        
+        pending = self._write_queue.take_all()
+        for person_id, (file_path, data, stale_path) in pending.items():
+            try:
+                self._write_person_file(person_id, file_path, data, stale_path)
+            except Exception as e:
+                print(f"Error writing person {person_id}: {str(e)}")
+        return len(pending)
+    
+    def close(self) -> None:
+        """Flush queued writes and bring the saved index stamp up to date before the store is discarded"""
+        with self._lock:
+            self.flush()
+            self._save_index_stamp()
+    
+    @contextmanager
+    def batch(self):
+        """Hold saves and conversation changes in memory and write each touched file once when the block ends
+        
+        Person files, conversation log appends and the index, catalog, search
+        and timeline updates are all deferred; reads inside the block see the
+        held changes. If the block raises, nothing is written and the state is
+        reloaded from disk (IDs handed out inside the block are not reserved).
+        Yields a BatchStats; a nested batch joins the outermost one.
+        """
+        with self._lock:
+            if self._batch is not None:
+                yield self._batch
+                return
+            
+            # Start from files that match the in-memory state, so a rollback can reload it
+            self.flush()
+            stats = self._batch = BatchStats()
+            self._batch_queue = WriteBehindQueue(None)
+            self._search.hold()
+            self._timeline.hold()
+            try:
+                yield stats
+            except BaseException:
+                self._end_batch(commit=False)
+                raise
+            self._end_batch(commit=True)
+    
+    def _end_batch(self, commit: bool) -> None:
+        """Write everything the open batch held back, or drop it and reload the state from disk"""
+        stats = self._batch
+        pending = self._batch_queue.take_all()
+        held_logs, self._held_logs = self._held_logs, {}
+        held_rows, self._held_rows = self._held_rows, {}
+        held_saves, self._held_saves = self._held_saves, set()
+        self._batch = None
+        self._batch_queue = None
+        
+        with STATS.operation('batch'):
+            if not commit:
+                self._search.release(write=False)
+                self._timeline.release(write=False)
+                stats.rolled_back = True
+                self._load_state()
+                return
+            
+            for person_id, record in pending.items():
+                if self._write_queue is not None:
+                    self._write_queue.put(person_id, record)
+                    continue
+                try:
+                    self._write_person_file(person_id, *record)
+                except Exception as e:
+                    print(f"Error writing person {person_id}: {str(e)}")
+            for person_id, entries in held_logs.items():
+                append_entries(self._log_path(person_id), entries)
+            stats.writes = len(pending) + len(held_logs)
+            
+            if 'index' in held_saves:
+                self._save_index()
+            if 'catalog' in held_saves:
+                self._save_catalog()
+            elif held_rows:
+                self._journal_catalog_rows(list(held_rows.items()))
+            self._search.release()
+            self._timeline.release()
+            
+            for person_id in held_logs:
+                if self._log_path(person_id).stat().st_size >= self.LOG_COMPACT_BYTES:
+                    self.compact_conversations(person_id)
+    
+    def _count_change(self, count: int = 1) -> None:
+        """Count changes made inside an open batch"""
+        if self._batch is not None:
+            self._batch.changes += count
+    
+    def _write_record(self, person: Person, conversations: List[Conversation]) -> bool:
+        """Assign IDs and write (or queue) a person file; True if the index changed"""
         if person.id is None:
             person.id = self._next_id
             self._next_id += 1
+        elif person.id >= self._next_id:
+            # Records restored with their own IDs must not be reused for new persons
+            self._next_id = person.id + 1
         
         # Ensure conversations have IDs and person_id
         for i, conv in enumerate(conversations):
@@ -103,59 +587,385 @@ class StorageManager:
                 conv.id = i + 1
             conv.person_id = person.id
         
-        data = self._person_to_dict(person, conversations)
-        file_path = self.persons_dir / self._get_file_name(person)
+        data = record_to_dict(person, conversations)
+        file_path = self._get_person_file(person)
+        # The record holds every conversation, so changes held for the log are superseded
+        self._held_logs.pop(person.id, None)
+        
+        # The file currently on disk, which must go if the person was renamed
+        stale_path = self._index.get(person.id)
+        if self._queue is not None and person.id in self._queue:
+            stale_path = self._queue.get(person.id)[2]
+        
+        if self._queue is None:
+            self._write_person_file(person.id, file_path, data, stale_path)
+        else:
+            self._queue.put(person.id, (file_path, data, stale_path))
+        
+        if self._index.get(person.id) == file_path:
+            return False
+        self._index[person.id] = file_path
+        return True
+    
+    @synchronized
+    def save_person(self, person: Person, conversations: List[Conversation]) -> None:
+        """Save person and their conversations to a JSON file"""
+        self._count_change()
+        if self._write_record(person, conversations):
+            self._save_index()
+        
+        self._update_catalog(person, conversations)
+        self._search.index_person(person, conversations)
+        self._timeline.index_persons([(person, conversations)])
+    
+    @synchronized
+    def save_persons(self, records: Iterable[tuple[Person, List[Conversation]]]) -> int:
+        """Save a batch of persons with one index, catalog and search update for the whole batch"""
+        records = list(records)
+        self._count_change(len(records))
+        index_changed = False
+        for person, conversations in records:
+            index_changed |= self._write_record(person, conversations)
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if index_changed:
+            self._save_index()
+        self._set_catalog_rows([
+            (person.id, self._summary_row(person, conversations))
+            for person, conversations in records
+        ])
+        self._search.index_persons(records)
+        self._timeline.index_persons(records)
+        return len(records)
     
+    @synchronized
     def load_person(self, person_id: int) -> Optional[tuple[Person, List[Conversation]]]:
-        """Load person and their conversations from JSON file"""
+        """Load person and their conversations from JSON file and conversation log"""
         try:
-            for file_path in self.persons_dir.glob('*.json'):
-                file_id = self._get_id_from_file_name(file_path.name)
-                if file_id == person_id:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        return self._dict_to_person(data)
-            return None
+            file_path = self._get_person_path(person_id)
+            if file_path is None:
+                return None
+            return record_from_dict(self._read_person_data(person_id, file_path), keep_ids=True)
         except Exception as e:
             print(f"Error loading person {person_id}: {str(e)}")
             return None
     
-    def get_all_persons(self) -> List[Person]:
-        """Load all persons (without conversations) for listing"""
+    @synchronized
+    def get_all_persons(self, workers: Optional[int] = None, decode_processes: int = 0) -> List[Person]:
+        """Load all persons (without conversations) for listing, in ID order
+        
+        Files are read by up to workers threads (READ_WORKERS by default), so
+        slow disks serve several reads at once. With decode_processes set,
+        files of DECODE_PROCESS_BYTES or more are parsed in that many worker
+        processes. A file that cannot be read is reported and skipped, and its
+        error kept in read_errors.
+        """
+        workers = workers or self.READ_WORKERS
+        operation = STATS.current_operation()
+        process_pool = None
+        if decode_processes:
+            process_pool = ProcessPoolExecutor(decode_processes, mp_context=multiprocessing.get_context('spawn'))
+        
+        def read(person_id: int) -> tuple[Optional[Dict], Optional[str]]:
+            """Person fields of one file, or the error that prevented reading them"""
+            if self._queue is not None and person_id in self._queue:
+                return self._queue.get(person_id)[1], None
+            try:
+                with STATS.operation(operation or 'get_all_persons', counted=False):
+                    text = read_text(self._index[person_id])
+                    if process_pool is not None and len(text) >= self.DECODE_PROCESS_BYTES:
+                        return process_pool.submit(_decode_person_fields, text).result(), None
+                    with STATS.timed('parse_seconds'):
+                        return json.loads(text), None
+            except (OSError, ValueError) as e:
+                return None, str(e)
+        
+        def read_chunk(chunk: List[int]) -> List[tuple[Optional[Dict], Optional[str]]]:
+            return [read(person_id) for person_id in chunk]
+        
+        person_ids = sorted(self._index)
+        try:
+            if workers > 1 and len(person_ids) > 1:
+                # Contiguous chunks keep per-task overhead low; map keeps them in order
+                chunk_size = max(1, min(self.READ_CHUNK, len(person_ids) // workers))
+                chunks = [person_ids[i:i + chunk_size] for i in range(0, len(person_ids), chunk_size)]
+                with ThreadPoolExecutor(workers) as executor:
+                    results = [result for chunk in executor.map(read_chunk, chunks) for result in chunk]
+            else:
+                results = read_chunk(person_ids)
+        finally:
+            if process_pool is not None:
+                process_pool.shutdown()
+        
+        self.read_errors = {}
         persons = []
-        for file_path in self.persons_dir.glob('*.json'):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                person, _ = self._dict_to_person(data)
-                persons.append(person)
+        for person_id, (data, error) in zip(person_ids, results):
+            if error is None:
+                try:
+                    persons.append(record_from_dict(data, keep_ids=True)[0])
+                    continue
+                except (KeyError, TypeError, ValueError) as e:
+                    error = str(e)
+            print(f"Error reading person {person_id}: {error}")
+            self.read_errors[person_id] = error
         return persons
     
+    def iter_records(self) -> Iterator[tuple[Person, List[Conversation]]]:
+        """Yield every person with their conversations, reading one person at a time"""
+        with self._lock:
+            person_ids = list(self._index)
+        for person_id in person_ids:
+            result = self.load_person(person_id)
+            if result is not None:
+                yield result
+    
+    def export_archive(self, path: Path) -> int:
+        """Write the whole store to a single JSON Lines archive (.gz for compressed)"""
+        return export_archive(self, path)
+    
+    def restore_archive(self, path: Path, batch_size: int = 500) -> ImportStats:
+        """Load persons from an archive written by export_archive"""
+        return restore_archive(self, path, batch_size)
+    
+    @synchronized
+    def get_person_summaries(self) -> List[PersonSummary]:
+        """Return summary rows for all persons from the catalog, without reading person files"""
+        return [
+            self._row_to_summary(person_id, row)
+            for person_id, row in self._catalog.items()
+        ]
+    
+    @synchronized
+    def get_sorted_person_ids(self, sort_by: str = 'name', reverse: bool = False) -> List[int]:
+        """Return person IDs ordered by last contact date ('date') or first name ('name'), ties by ID
+        
+        Both orders are kept up to date on every save, so this is a walk over
+        the maintained index in either direction.
+        """
+        return self._sort_indexes['date' if sort_by == 'date' else 'name'].ids(reverse)
+    
+    @synchronized
+    def upcoming_birthdays(self, days: int = 14, today: date = None) -> List[int]:
+        """IDs of persons whose birthday falls within the next days days (today included), soonest first"""
+        today = today or date.today()
+        person_ids = []
+        for low, high in birthday_ranges(today, days):
+            person_ids += self._sort_indexes['birthday'].range(low, high)
+        return list(dict.fromkeys(person_ids))
+    
+    @synchronized
+    def stale_contacts(self, since: date, include_never: bool = True) -> List[int]:
+        """IDs of persons last contacted before since, longest ago first; never contacted ones lead"""
+        # Never contacted persons have the key ''; '0' sorts after it and before any ISO date
+        low = '' if include_never else '0'
+        return self._sort_indexes['date'].range(low, (since - timedelta(days=1)).isoformat())
+    
+    @synchronized
+    def get_timeline(self, start: date = None, end: date = None, offset: int = 0,
+                     limit: Optional[int] = None, reverse: bool = False) -> List[TimelineEntry]:
+        """A page of the conversations of all persons dated within start..end, oldest first or newest first with reverse"""
+        return self._timeline.range(start, end, offset, limit, reverse)
+    
+    @synchronized
+    def count_timeline(self, start: date = None, end: date = None) -> int:
+        """Number of conversations of all persons dated within start..end"""
+        return self._timeline.count(start, end)
+    
+    @synchronized
+    def get_person_summary(self, person_id: int) -> Optional[PersonSummary]:
+        """Return the catalog summary for a single person"""
+        row = self._catalog.get(person_id)
+        return self._row_to_summary(person_id, row) if row is not None else None
+    
+    @synchronized
+    def search(self, query: str) -> List[SearchHit]:
+        """Find persons and conversations whose text contains every word of the query"""
+        return self._search.search(query)
+    
+    @synchronized
+    def reindex(self) -> int:
+        """Rebuild the index, catalog, sort orders, search index and timeline from the person files
+        
+        Repairs the derived files after the store was edited by hand or a
+        crash left them inconsistent. Returns the number of persons indexed.
+        """
+        self.flush()
+        self._index = self._build_index()
+        self._save_index()
+        self._next_id = self._get_next_id()
+        self._catalog = self._build_catalog()
+        self._save_catalog()
+        for sort_index in self._sort_indexes.values():
+            sort_index.rebuild(self._catalog)
+        self._search_index.rebuild(self._iter_records())
+        self._search_loaded = True
+        self._timeline_index.rebuild(self._iter_records())
+        self._timeline_loaded = True
+        return len(self._index)
+    
+    @synchronized
+    def migrate_layout(self, layout: str, shard_size: int = None) -> int:
+        """Move every person file into the given layout ('flat' or 'sharded'), returning how many moved
+        
+        Files are moved one at a time with os.replace and the index is
+        rewritten at the end; rerunning after an interruption finishes the job.
+        """
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown layout: {layout}")
+        
+        self.flush()
+        self.settings.layout = layout
+        if shard_size is not None:
+            self.settings.shard_size = shard_size
+        
+        moved = 0
+        for person_id, file_path in self._build_index().items():
+            target = self._get_person_dir(person_id) / file_path.name
+            if target != file_path:
+                target.parent.mkdir(exist_ok=True)
+                os.replace(file_path, target)
+                moved += 1
+        
+        # Remove buckets left empty by the move
+        for entry in self.persons_dir.iterdir():
+            if entry.is_dir() and not any(entry.iterdir()):
+                entry.rmdir()
+        
+        self.settings.save(self.settings_file)
+        self._index = self._build_index()
+        self._save_index()
+        return moved
+    
+    @synchronized
+    def migrate_compression(self, compression: str) -> int:
+        """Rewrite every person file in the given format ('none' or 'gzip'), returning how many were rewritten
+        
+        Files are rewritten one at a time and in place, so names, the index
+        and conversation logs stay valid; rerunning after an interruption
+        skips the files already converted.
+        """
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression: {compression}")
+        
+        self.flush()
+        self.settings.compression = compression
+        self.settings.save(self.settings_file)
+        
+        rewritten = 0
+        for file_path in self._index.values():
+            if is_compressed(file_path) != (compression == 'gzip'):
+                self._write_person_json(file_path, read_json(file_path))
+                rewritten += 1
+        self._save_index()
+        return rewritten
+    
     @property
     def is_initialized(self) -> bool:
         """Check if the storage structure is properly initialized"""
         return self.persons_dir.exists() 
     
+    @synchronized
     def add_conversation(self, person_id: int, conversation: Conversation) -> bool:
-        """Add a new conversation to an existing person"""
+        """Add a new conversation to an existing person by appending it to their log"""
         try:
-            result = self.load_person(person_id)
-            if result is None:
+            if self._get_person_path(person_id) is None:
                 return False
             
-            person, conversations = result
+            row = self._catalog.get(person_id)
+            if row is None or 'last_conversation_id' not in row:
+                # Catalog predates conversation ID tracking; read the person once
+                person, conversations = self.load_person(person_id)
+                self._update_catalog(person, conversations)
+                row = self._catalog[person_id]
             
             # Set the conversation's IDs
             conversation.person_id = person_id
-            conversation.id = max([c.id for c in conversations], default=0) + 1
+            conversation.id = row['last_conversation_id'] + 1
             
-            # Add the new conversation and save
-            conversations.append(conversation)
-            self.save_person(person, conversations)
-            return True
+            # Update the catalog row without touching the person file
+            row = dict(row)
+            row['conversation_count'] += 1
+            row['last_conversation_id'] = conversation.id
+            if not row['last_contact'] or conversation.date.isoformat() > row['last_contact']:
+                row['last_contact'] = conversation.date.isoformat()
             
+            self._append_conversation_entry(person_id, self._conversation_entry('add', conversation))
+            self._count_change()
+            self._set_catalog_row(person_id, row)
+            self._search.index_conversation(person_id, conversation)
+            self._timeline.index_conversation(person_id, conversation)
+            return True
+        
         except Exception as e:
             print(f"Error adding conversation: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+    
+    def _has_conversation(self, person_id: int, file_path: Path, conversation_id: int) -> bool:
+        """Check the person's file, log and any queued or held changes for a conversation"""
+        data = self._read_person_data(person_id, file_path)
+        return any(conv['id'] == conversation_id for conv in data.get('conversations', []))
+    
+    @synchronized
+    def update_conversation(self, person_id: int, conversation: Conversation) -> bool:
+        """Log an edit to an existing conversation"""
+        try:
+            file_path = self._get_person_path(person_id)
+            if file_path is None or not self._has_conversation(person_id, file_path, conversation.id):
+                return False
+            
+            conversation.person_id = person_id
+            self._append_conversation_entry(person_id, self._conversation_entry('update', conversation))
+            self._count_change()
+            self._search.index_conversation(person_id, conversation)
+            self._timeline.index_conversation(person_id, conversation)
+            
+            # An edit on the last contact day leaves the summary row as it is
+            row = self._catalog.get(person_id)
+            if row is None or conversation.date.isoformat() != row['last_contact']:
+                person, conversations = self.load_person(person_id)
+                self._update_catalog(person, conversations)
+            return True
+        
+        except Exception as e:
+            print(f"Error updating conversation: {str(e)}")
+            return False
+    
+    @synchronized
+    def delete_conversation(self, person_id: int, conversation_id: int) -> bool:
+        """Log the removal of a conversation"""
+        try:
+            file_path = self._get_person_path(person_id)
+            if file_path is None or not self._has_conversation(person_id, file_path, conversation_id):
+                return False
+            
+            self._append_conversation_entry(person_id, {"op": "delete", "id": conversation_id})
+            self._count_change()
+            self._search.remove_conversation(person_id, conversation_id)
+            self._timeline.remove_conversation(person_id, conversation_id)
+            person, conversations = self.load_person(person_id)
+            self._update_catalog(person, conversations)
+            return True
+        
+        except Exception as e:
+            print(f"Error deleting conversation: {str(e)}")
+            return False
+    
+    @synchronized
+    def compact_conversations(self, person_id: int) -> bool:
+        """Fold a person's conversation log back into their person file"""
+        result = self.load_person(person_id)
+        if result is None:
+            return False
+        
+        person, conversations = result
+        self.save_person(person, conversations)
+        return True
+    
+    @synchronized
+    def compact_all(self) -> int:
+        """Compact every pending conversation log, returning how many were folded"""
+        compacted = 0
+        STATS.add('dir_scans')
+        for log_path in self.logs_dir.glob('*.jsonl'):
+            if self.compact_conversations(int(log_path.stem)):
+                compacted += 1
+        return compacted
@@ -0,0 +1,461 @@
+import json
+import mmap
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+from models import Person, Conversation, PersonSummary
+from .search import SearchIndex, SearchHit
+from .backend import synchronized
+from .fileio import write_json_atomic
+from .instrumentation import STATS
+from .records import record_from_dict, record_to_dict
+from .birthdays import birthday_key, birthday_ranges
+from .sorted_index import SortedIndex
+from .timeline import ConversationTimeline, TimelineEntry
+from .batch import BatchStats
+
+# Offset index entry: person ID, offset of the record in the segment, record length
+INDEX_ENTRY = struct.Struct('<QQI')
+
+class PackedStorage:
+    """Storage backend packing every record into one append-only segment file read through mmap
+    
+    Each save appends the new version of a record (one JSON line) to the
+    segment and a fixed-size entry to the offset index; the last entry for an
+    ID wins. load_person slices its record straight out of the mapped segment.
+    Superseded versions are reclaimed by compact(), which runs on a background
+    thread once dead space outgrows the live records.
+    """
+    COMPACT_MIN_BYTES = 1024 * 1024
+    
+    def __init__(self, base_dir: Path = None):
+        self.base_dir = base_dir or Path.home() / '.lkit'
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.state_file = self.base_dir / 'packed.json'
+        self._lock = threading.RLock()
+        self._compaction: Optional[threading.Thread] = None
+        self._batch: Optional[BatchStats] = None
+        self._pending: Dict[int, tuple[Person, List[Conversation]]] = {}
+        
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                self._generation = json.load(f)['generation']
+        except (OSError, ValueError, KeyError):
+            self._generation = 0
+        self._remove_stale_generations()
+        self._open_generation()
+        
+        self._summaries: Optional[Dict[int, PersonSummary]] = None
+        self._sort_indexes = self._new_sort_indexes()
+        self._timeline = ConversationTimeline()
+        self._search = SearchIndex(self.base_dir / 'packed_search.json', self.base_dir / 'packed_search.log')
+        if not self._search.load() or self._search.person_ids() != set(self._index):
+            self._search.rebuild(self.iter_records())
+    
+    def _segment_path(self, generation: int) -> Path:
+        return self.base_dir / f'persons-{generation}.pack'
+    
+    def _index_path(self, generation: int) -> Path:
+        return self.base_dir / f'persons-{generation}.idx'
+    
+    def _remove_stale_generations(self) -> None:
+        """Delete files left by an interrupted or superseded compaction"""
+        current = {self._segment_path(self._generation).name, self._index_path(self._generation).name}
+        for path in list(self.base_dir.glob('persons-*.pack')) + list(self.base_dir.glob('persons-*.idx')):
+            if path.name not in current:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+    
+    def _open_generation(self) -> None:
+        """Open the current segment and index files and load the offset index"""
+        self._segment = open(self._segment_path(self._generation), 'a+b')
+        self._index_handle = open(self._index_path(self._generation), 'a+b')
+        self._segment_size = self._segment.seek(0, os.SEEK_END)
+        self._map: Optional[mmap.mmap] = None
+        
+        self._index: Dict[int, tuple[int, int]] = {}
+        self._index_handle.seek(0)
+        data = self._index_handle.read()
+        # A torn trailing entry, or one pointing past the segment, was never fully written
+        usable = len(data) - len(data) % INDEX_ENTRY.size
+        for person_id, offset, length in INDEX_ENTRY.iter_unpack(data[:usable]):
+            if offset + length <= self._segment_size:
+                self._index[person_id] = (offset, length)
+        self._live_bytes = sum(length for _, length in self._index.values())
+        self._next_id = max(self._index, default=0) + 1
+    
+    def _get_map(self) -> Optional[mmap.mmap]:
+        """Map the segment, remapping once it has grown past the current mapping"""
+        if self._segment_size == 0:
+            return None
+        if self._map is None or len(self._map) < self._segment_size:
+            # Old mappings are left to the garbage collector: a compaction may still be reading one
+            self._map = mmap.mmap(self._segment.fileno(), self._segment_size, access=mmap.ACCESS_READ)
+        return self._map
+    
+    def _read_record(self, person_id: int) -> Optional[tuple[Person, List[Conversation]]]:
+        if person_id in self._pending:
+            person, conversations = self._pending[person_id]
+            return person, list(conversations)
+        entry = self._index.get(person_id)
+        if entry is None:
+            return None
+        offset, length = entry
+        STATS.add('bytes_read', length)
+        with STATS.timed('parse_seconds'):
+            person, conversations = record_from_dict(json.loads(self._get_map()[offset:offset + length]), keep_ids=True)
+        for conv in conversations:
+            conv.person_id = person.id
+        return person, conversations
+    
+    def _assign_ids(self, person: Person, conversations: List[Conversation]) -> None:
+        """Give a person and their conversations IDs where they have none"""
+        if person.id is None:
+            person.id = self._next_id
+        self._next_id = max(self._next_id, person.id + 1)
+        
+        next_conversation_id = max((c.id for c in conversations if c.id), default=0) + 1
+        for conv in conversations:
+            if conv.id is None:
+                conv.id = next_conversation_id
+                next_conversation_id += 1
+            conv.person_id = person.id
+    
+    def _prepare_record(self, person: Person, conversations: List[Conversation]) -> bytes:
+        """Assign missing IDs and encode a record as one segment line"""
+        self._assign_ids(person, conversations)
+        return json.dumps(record_to_dict(person, conversations), ensure_ascii=False).encode('utf-8') + b'\n'
+    
+    def _append_records(self, records: List[tuple[Person, List[Conversation]]]) -> None:
+        """Append new record versions with one segment write and one index write"""
+        if not records:
+            return
+        if self._batch is not None:
+            # Held until the batch ends; only the last version of each record is appended
+            for person, conversations in records:
+                self._assign_ids(person, conversations)
+                self._pending[person.id] = (person, conversations)
+            self._batch.changes += len(records)
+            return
+        chunks = []
+        entries = []
+        offset = self._segment_size
+        for person, conversations in records:
+            with STATS.timed('serialize_seconds'):
+                chunk = self._prepare_record(person, conversations)
+            chunks.append(chunk)
+            entries.append((person.id, offset, len(chunk)))
+            offset += len(chunk)
+        
+        # The segment is durable before the index points into it
+        with STATS.timed('write_seconds'):
+            self._segment.write(b''.join(chunks))
+            self._segment.flush()
+            os.fsync(self._segment.fileno())
+            self._index_handle.write(b''.join(INDEX_ENTRY.pack(*entry) for entry in entries))
+            self._index_handle.flush()
+        STATS.add('bytes_written', offset - self._segment_size + INDEX_ENTRY.size * len(entries))
+        self._segment_size = offset
+        
+        for person_id, entry_offset, length in entries:
+            previous = self._index.get(person_id)
+            if previous is not None:
+                self._live_bytes -= previous[1]
+            self._index[person_id] = (entry_offset, length)
+            self._live_bytes += length
+        
+        if self._summaries is not None:
+            for person, conversations in records:
+                self._index_summary(person, conversations)
+            self._timeline.index_persons(records)
+        self._search.index_persons(records)
+        self._schedule_compaction()
+    
+    def _make_summary(self, person: Person, conversations: List[Conversation]) -> PersonSummary:
+        return PersonSummary(
+            id=person.id,
+            first_name=person.first_name,
+            last_name=person.last_name,
+            last_contact=max((c.date for c in conversations), default=None),
+            conversation_count=len(conversations)
+        )
+    
+    @staticmethod
+    def _new_sort_indexes() -> Dict[str, SortedIndex]:
+        """Empty indexes by last contact, first name and birthday, keyed on the rows of _index_summary"""
+        return {
+            'date': SortedIndex(lambda row: row['last_contact']),
+            'name': SortedIndex(lambda row: row['first_name']),
+            'birthday': SortedIndex(lambda row: row['birthday']),
+        }
+    
+    def _index_summary(self, person: Person, conversations: List[Conversation]) -> None:
+        """Store a person's summary and reposition them in the sort indexes"""
+        summary = self._summaries[person.id] = self._make_summary(person, conversations)
+        row = {
+            'last_contact': summary.last_contact.isoformat() if summary.last_contact else '',
+            'first_name': summary.first_name.lower(),
+            'birthday': birthday_key(person.birth_date),
+        }
+        for sort_index in self._sort_indexes.values():
+            sort_index.update(person.id, row)
+    
+    def _get_summaries(self) -> Dict[int, PersonSummary]:
+        """Summaries of every person, built with one pass over the segment on first use"""
+        if self._summaries is None:
+            self._summaries = {}
+            for person_id in sorted(self._index):
+                person, conversations = self._read_record(person_id)
+                self._index_summary(person, conversations)
+                self._timeline.index_persons([(person, conversations)])
+        return self._summaries
+    
+    @property
+    def dead_bytes(self) -> int:
+        """Space in the segment taken by superseded record versions"""
+        return self._segment_size - self._live_bytes
+    
+    def _schedule_compaction(self) -> None:
+        """Start a background compaction once dead space outweighs the live records"""
+        if self.dead_bytes < max(self.COMPACT_MIN_BYTES, self._live_bytes):
+            return
+        if self._compaction is not None and self._compaction.is_alive():
+            return
+        self._compaction = threading.Thread(target=self.compact, daemon=True)
+        self._compaction.start()
+    
+    def compact(self) -> int:
+        """Rewrite the segment with only the live records, returning the number of bytes reclaimed
+        
+        The bulk copy runs without the lock, since written bytes never change;
+        records saved meanwhile are copied over under the lock before the new
+        generation replaces the old one.
+        """
+        with self._lock:
+            generation = self._generation
+            snapshot = dict(self._index)
+            source = self._get_map()
+            old_size = self._segment_size
+        
+        new_generation = generation + 1
+        new_index = {}
+        with open(self._segment_path(new_generation), 'wb') as segment:
+            for person_id in sorted(snapshot):
+                offset, length = snapshot[person_id]
+                new_index[person_id] = (segment.tell(), length)
+                segment.write(source[offset:offset + length])
+            
+            with self._lock:
+                if self._generation != generation:
+                    return 0
+                source = self._get_map()
+                for person_id, (offset, length) in self._index.items():
+                    if snapshot.get(person_id) != (offset, length):
+                        new_index[person_id] = (segment.tell(), length)
+                        segment.write(source[offset:offset + length])
+                segment.flush()
+                os.fsync(segment.fileno())
+                
+                with open(self._index_path(new_generation), 'wb') as index_file:
+                    index_file.write(b''.join(
+                        INDEX_ENTRY.pack(person_id, offset, length)
+                        for person_id, (offset, length) in sorted(new_index.items())
+                    ))
+                    index_file.flush()
+                    os.fsync(index_file.fileno())
+                
+                write_json_atomic(self.state_file, {"generation": new_generation})
+                self._segment.close()
+                self._index_handle.close()
+                self._generation = new_generation
+                self._remove_stale_generations()
+                self._open_generation()
+                return old_size - self._segment_size
+    
+    @synchronized
+    def flush(self) -> int:
+        """Nothing is buffered; every save is appended to the segment directly"""
+        return 0
+    
+    def close(self) -> None:
+        """Wait for a running compaction and close the segment"""
+        if self._compaction is not None:
+            self._compaction.join()
+        with self._lock:
+            self._map = None
+            self._segment.close()
+            self._index_handle.close()
+    
+    @contextmanager
+    def batch(self):
+        """Hold saves and conversation changes in memory and append them with one segment write when the block ends
+        
+        load_person sees the held records; summaries, search and the timeline
+        catch up when the batch is applied. If the block raises, the held
+        records are dropped. Yields a BatchStats; a nested batch joins the
+        outermost one.
+        """
+        with self._lock:
+            if self._batch is not None:
+                yield self._batch
+                return
+            
+            stats = self._batch = BatchStats()
+            next_id = self._next_id
+            try:
+                yield stats
+            except BaseException:
+                self._batch = None
+                self._pending = {}
+                self._next_id = next_id
+                stats.rolled_back = True
+                raise
+            self._batch = None
+            pending, self._pending = self._pending, {}
+            with STATS.operation('batch'):
+                self._append_records(list(pending.values()))
+            stats.writes = 1 if pending else 0
+    
+    @synchronized
+    def save_person(self, person: Person, conversations: List[Conversation]) -> None:
+        """Save person and their conversations"""
+        self._append_records([(person, conversations)])
+    
+    @synchronized
+    def save_persons(self, records: Iterable[tuple[Person, List[Conversation]]]) -> int:
+        """Save many persons with a single append, returning how many were written"""
+        records = list(records)
+        self._append_records(records)
+        return len(records)
+    
+    @synchronized
+    def load_person(self, person_id: int) -> Optional[tuple[Person, List[Conversation]]]:
+        """Load person and their conversations"""
+        return self._read_record(person_id)
+    
+    def iter_records(self) -> Iterator[tuple[Person, List[Conversation]]]:
+        """Yield every person with their conversations, one at a time"""
+        with self._lock:
+            person_ids = sorted(self._index)
+        for person_id in person_ids:
+            result = self.load_person(person_id)
+            if result is not None:
+                yield result
+    
+    @synchronized
+    def get_all_persons(self) -> List[Person]:
+        """Load all persons (without conversations) for listing"""
+        return [self._read_record(person_id)[0] for person_id in sorted(self._index)]
+    
+    def _modify_conversations(self, person_id: int, change) -> bool:
+        """Append a new version of a person after applying change to their conversations"""
+        record = self._read_record(person_id)
+        if record is None:
+            return False
+        person, conversations = record
+        if change(conversations) is False:
+            return False
+        self._append_records([(person, conversations)])
+        return True
+    
+    @synchronized
+    def add_conversation(self, person_id: int, conversation: Conversation) -> bool:
+        """Add a new conversation to an existing person"""
+        def change(conversations):
+            conversation.person_id = person_id
+            conversation.id = max((c.id for c in conversations), default=0) + 1
+            conversations.append(conversation)
+        return self._modify_conversations(person_id, change)
+    
+    @synchronized
+    def update_conversation(self, person_id: int, conversation: Conversation) -> bool:
+        """Store an edit to an existing conversation"""
+        def change(conversations):
+            for position, existing in enumerate(conversations):
+                if existing.id == conversation.id:
+                    conversation.person_id = person_id
+                    conversations[position] = conversation
+                    return True
+            return False
+        return self._modify_conversations(person_id, change)
+    
+    @synchronized
+    def delete_conversation(self, person_id: int, conversation_id: int) -> bool:
+        """Remove a conversation"""
+        def change(conversations):
+            remaining = [c for c in conversations if c.id != conversation_id]
+            if len(remaining) == len(conversations):
+                return False
+            conversations[:] = remaining
+        return self._modify_conversations(person_id, change)
+    
+    @synchronized
+    def reindex(self) -> int:
+        """Rebuild the summaries, timeline and search index from the segment, returning the person count"""
+        self._summaries = None
+        self._sort_indexes = self._new_sort_indexes()
+        self._timeline = ConversationTimeline()
+        self._get_summaries()
+        self._search.rebuild(self.iter_records())
+        return len(self._index)
+    
+    @synchronized
+    def get_person_summaries(self) -> List[PersonSummary]:
+        """Return summary rows for all persons"""
+        summaries = self._get_summaries()
+        return [summaries[person_id] for person_id in sorted(summaries)]
+    
+    @synchronized
+    def get_person_summary(self, person_id: int) -> Optional[PersonSummary]:
+        """Return the summary for a single person"""
+        return self._get_summaries().get(person_id)
+    
+    @synchronized
+    def get_sorted_person_ids(self, sort_by: str = 'name', reverse: bool = False) -> List[int]:
+        """Return person IDs ordered by last contact date ('date') or first name ('name'), ties by ID"""
+        self._get_summaries()
+        return self._sort_indexes['date' if sort_by == 'date' else 'name'].ids(reverse)
+    
+    @synchronized
+    def upcoming_birthdays(self, days: int = 14, today: date = None) -> List[int]:
+        """IDs of persons whose birthday falls within the next days days (today included), soonest first"""
+        self._get_summaries()
+        person_ids = []
+        for low, high in birthday_ranges(today or date.today(), days):
+            person_ids += self._sort_indexes['birthday'].range(low, high)
+        return list(dict.fromkeys(person_ids))
+    
+    @synchronized
+    def stale_contacts(self, since: date, include_never: bool = True) -> List[int]:
+        """IDs of persons last contacted before since, longest ago first; never contacted ones lead"""
+        self._get_summaries()
+        # Never contacted persons have the key ''; '0' sorts after it and before any ISO date
+        low = '' if include_never else '0'
+        return self._sort_indexes['date'].range(low, (since - timedelta(days=1)).isoformat())
+    
+    @synchronized
+    def get_timeline(self, start: date = None, end: date = None, offset: int = 0,
+                     limit: Optional[int] = None, reverse: bool = False) -> List[TimelineEntry]:
+        """A page of the conversations of all persons dated within start..end, oldest first or newest first with reverse
+        
+        The timeline is kept in memory next to the summaries and built in the same pass.
+        """
+        self._get_summaries()
+        return self._timeline.range(start, end, offset, limit, reverse)
+    
+    @synchronized
+    def count_timeline(self, start: date = None, end: date = None) -> int:
+        """Number of conversations of all persons dated within start..end"""
+        self._get_summaries()
+        return self._timeline.count(start, end)
+    
+    @synchronized
+    def search(self, query: str) -> List[SearchHit]:
+        """Find persons and conversations whose text contains every word of the query"""
+        return self._search.search(query)
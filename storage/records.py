@@ -0,0 +1,56 @@
+from datetime import date
+from typing import Dict, List, Optional
+from models import Person, Conversation
+
+Record = tuple[Person, List[Conversation]]
+
+def parse_date(value: Optional[str]) -> Optional[date]:
+    """Parse an ISO date (or vCard's compact YYYYMMDD form), ignoring blanks"""
+    value = (value or "").strip()
+    if not value:
+        return None
+    if len(value) == 8 and value.isdigit():
+        value = f"{value[:4]}-{value[4:6]}-{value[6:]}"
+    return date.fromisoformat(value)
+
+def record_from_dict(data: Dict, keep_ids: bool = False) -> Record:
+    """Build a person and conversations from a dictionary in the person file format
+    
+    With keep_ids the stored person and conversation IDs are required and
+    kept; without it they are dropped so the store assigns new ones.
+    """
+    person = Person(
+        id=data['id'] if keep_ids else None,
+        first_name=data.get('first_name', ""),
+        last_name=data.get('last_name', ""),
+        email=data.get('email'),
+        phone=data.get('phone'),
+        birth_date=parse_date(data.get('birth_date')),
+        notes=data.get('notes')
+    )
+    conversations = [
+        Conversation(
+            id=conv['id'] if keep_ids else None,
+            person_id=person.id,
+            date=parse_date(conv.get('date')) or date.today(),
+            notes=conv.get('notes', "")
+        )
+        for conv in data.get('conversations', [])
+    ]
+    return person, conversations
+
+def record_to_dict(person: Person, conversations: List[Conversation]) -> Dict:
+    """Inverse of record_from_dict: the person file format of a record"""
+    return {
+        "id": person.id,
+        "first_name": person.first_name,
+        "last_name": person.last_name,
+        "email": person.email,
+        "phone": person.phone,
+        "birth_date": person.birth_date.isoformat() if person.birth_date else None,
+        "notes": person.notes,
+        "conversations": [
+            {"id": conv.id, "date": conv.date.isoformat(), "notes": conv.notes}
+            for conv in conversations
+        ]
+    }
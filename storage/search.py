@@ -0,0 +1,198 @@
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+from models import Person, Conversation
+from .journal import JournaledIndex, read_entries
+from .fileio import read_json, write_json_atomic
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase word tokens"""
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+def person_text(person: Person) -> str:
+    """Searchable text of a person record: names, email, phone and notes"""
+    return " ".join(filter(None, [person.first_name, person.last_name, person.email, person.phone, person.notes]))
+
+@dataclass(frozen=True)
+class SearchHit:
+    person_id: int
+    conversation_id: Optional[int] = None  # None when the person record itself matched
+
+class SearchIndex(JournaledIndex):
+    """Inverted index over person and conversation text, persisted as a snapshot plus a journal
+    
+    Documents are keyed by (person_id, conversation_id), with conversation_id
+    None for the person record.
+    """
+    
+    def __init__(self, index_file: Path, journal_file: Path):
+        super().__init__(index_file, journal_file)
+        self._docs: Dict[int, Dict[Optional[int], List[str]]] = {}
+        self._postings: Dict[str, Set[tuple[int, Optional[int]]]] = {}
+        self._vocabulary: Optional[List[str]] = None
+    
+    def person_ids(self) -> Set[int]:
+        """IDs of every person with indexed documents"""
+        return set(self._docs)
+    
+    def load(self) -> bool:
+        """Load the snapshot and replay the journal; False if there is no usable index"""
+        try:
+            data = read_json(self.index_file)
+            docs = {
+                int(person_id): {
+                    (int(conversation_id) if conversation_id else None): tokens
+                    for conversation_id, tokens in person_docs.items()
+                }
+                for person_id, person_docs in data['docs'].items()
+            }
+        except (OSError, ValueError, KeyError, AttributeError):
+            return False
+        
+        self.clear()
+        for person_id, person_docs in docs.items():
+            for conversation_id, tokens in person_docs.items():
+                self._add_document(person_id, conversation_id, tokens)
+        
+        replayed = False
+        for entry in read_entries(self.journal_file):
+            self._apply(entry)
+            replayed = True
+        if replayed:
+            self.save()
+        return True
+    
+    def save(self) -> None:
+        """Write a snapshot of the index and discard the journal"""
+        data = {
+            "docs": {
+                str(person_id): {
+                    (str(conversation_id) if conversation_id is not None else ""): tokens
+                    for conversation_id, tokens in person_docs.items()
+                }
+                for person_id, person_docs in self._docs.items()
+            }
+        }
+        write_json_atomic(self.index_file, data)
+        self.journal_file.unlink(missing_ok=True)
+        self._journal_entries = 0
+    
+    def clear(self) -> None:
+        """Remove every document from memory"""
+        self._docs.clear()
+        self._postings.clear()
+        self._vocabulary = None
+    
+    def _add_document(self, person_id: int, conversation_id: Optional[int], tokens: List[str]) -> None:
+        self._remove_document(person_id, conversation_id)
+        self._docs.setdefault(person_id, {})[conversation_id] = tokens
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                self._vocabulary = None
+            postings.add((person_id, conversation_id))
+    
+    def _remove_document(self, person_id: int, conversation_id: Optional[int]) -> None:
+        tokens = self._docs.get(person_id, {}).pop(conversation_id, None)
+        for token in tokens or []:
+            postings = self._postings[token]
+            postings.discard((person_id, conversation_id))
+            if not postings:
+                del self._postings[token]
+                self._vocabulary = None
+    
+    def _drop_person(self, person_id: int) -> None:
+        for conversation_id in list(self._docs.get(person_id, {})):
+            self._remove_document(person_id, conversation_id)
+        self._docs.pop(person_id, None)
+    
+    def _apply(self, entry: Dict) -> None:
+        """Apply one journal entry to the in-memory index"""
+        op = entry['op']
+        if op == 'set':
+            self._add_document(entry['person'], entry['conversation'], entry['tokens'])
+        elif op == 'remove':
+            self._remove_document(entry['person'], entry['conversation'])
+        elif op == 'drop':
+            self._drop_person(entry['person'])
+    
+    def rebuild(self, records: Iterable[tuple[Person, List[Conversation]]]) -> None:
+        """Re-index every person from scratch and write a fresh snapshot"""
+        self.clear()
+        for person, conversations in records:
+            self._add_document(person.id, None, sorted(set(tokenize(person_text(person)))))
+            for conv in conversations:
+                self._add_document(person.id, conv.id, sorted(set(tokenize(conv.notes))))
+        self.save()
+    
+    def _document_entry(self, person_id: int, conversation_id: Optional[int], text: Optional[str]) -> Dict:
+        tokens = sorted(set(tokenize(text)))
+        return {"op": "set", "person": person_id, "conversation": conversation_id, "tokens": tokens}
+    
+    def index_person(self, person: Person, conversations: Iterable[Conversation]) -> None:
+        """Bring every document of a person in line with their record, journaling only changes"""
+        self.index_persons([(person, conversations)])
+    
+    def index_persons(self, records: Iterable[tuple[Person, Iterable[Conversation]]]) -> None:
+        """Re-index a batch of persons with a single journal write"""
+        changes = []
+        for person, conversations in records:
+            existing = self._docs.get(person.id, {})
+            entries = [self._document_entry(person.id, None, person_text(person))]
+            entries += [self._document_entry(person.id, conv.id, conv.notes) for conv in conversations]
+            
+            current_ids = {entry['conversation'] for entry in entries}
+            for conversation_id in existing:
+                if conversation_id not in current_ids:
+                    changes.append({"op": "remove", "person": person.id, "conversation": conversation_id})
+            changes += [entry for entry in entries if existing.get(entry['conversation']) != entry['tokens']]
+        self._record_all(changes)
+    
+    def index_conversation(self, person_id: int, conversation: Conversation) -> None:
+        """Add or replace the document of a single conversation"""
+        self._record(self._document_entry(person_id, conversation.id, conversation.notes))
+    
+    def remove_conversation(self, person_id: int, conversation_id: int) -> None:
+        """Remove the document of a single conversation"""
+        self._record({"op": "remove", "person": person_id, "conversation": conversation_id})
+    
+    def remove_person(self, person_id: int) -> None:
+        """Remove every document of a person"""
+        self._record({"op": "drop", "person": person_id})
+    
+    def _prefix_matches(self, prefix: str) -> Set[tuple[int, Optional[int]]]:
+        """Documents containing any token starting with prefix"""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        matches = set()
+        position = bisect_left(self._vocabulary, prefix)
+        while position < len(self._vocabulary) and self._vocabulary[position].startswith(prefix):
+            matches |= self._postings[self._vocabulary[position]]
+            position += 1
+        return matches
+    
+    def search(self, query: str) -> List[SearchHit]:
+        """Find documents containing every query word, treating the last word as a prefix"""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        
+        # Intersect the rarest postings first
+        exact = sorted((self._postings.get(token, set()) for token in tokens[:-1]), key=len)
+        candidates = None
+        for postings in exact:
+            candidates = set(postings) if candidates is None else candidates & postings
+            if not candidates:
+                return []
+        
+        last = self._prefix_matches(tokens[-1])
+        candidates = last if candidates is None else candidates & last
+        return [
+            SearchHit(person_id, conversation_id)
+            for person_id, conversation_id in sorted(candidates, key=lambda d: (d[0], d[1] or 0))
+        ]
@@ -0,0 +1,26 @@
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from .fileio import read_json, write_json_atomic
+
+LAYOUTS = ('flat', 'sharded')
+COMPRESSIONS = ('none', 'gzip')
+
+@dataclass
+class StoreSettings:
+    layout: str = 'flat'     # 'flat': every person file in persons/; 'sharded': persons/<bucket>/
+    shard_size: int = 1000   # Person IDs per bucket directory in the sharded layout
+    compression: str = 'none'  # 'none': indented JSON person files; 'gzip': compact, gzip-compressed JSON
+    
+    @classmethod
+    def load(cls, path: Path) -> 'StoreSettings':
+        """Read settings from a store, falling back to defaults for a missing file or keys"""
+        try:
+            data = read_json(path)
+        except (OSError, ValueError):
+            return cls()
+        known = {key: value for key, value in data.items() if key in cls.__dataclass_fields__}
+        return cls(**known)
+    
+    def save(self, path: Path) -> None:
+        """Write settings to a store"""
+        write_json_atomic(path, asdict(self), indent=2)
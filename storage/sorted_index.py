@@ -0,0 +1,54 @@
+import math
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Callable, Dict, List
+
+class SortedIndex:
+    """Person IDs kept in key order, with a single entry repositioned when a key changes
+    
+    Entries are (key, person_id) pairs, so equal keys are ordered by ID and
+    a descending walk is the exact reverse of an ascending one.
+    """
+    
+    def __init__(self, key: Callable[[Dict], Any]):
+        self._key = key
+        self._entries: List[tuple[Any, int]] = []
+        self._keys: Dict[int, Any] = {}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def rebuild(self, rows: Dict[int, Dict]) -> None:
+        """Index every catalog row from scratch"""
+        self._keys = {person_id: self._key(row) for person_id, row in rows.items()}
+        self._entries = sorted((key, person_id) for person_id, key in self._keys.items())
+    
+    def update(self, person_id: int, row: Dict) -> None:
+        """Insert a person or move them to the position of their new key"""
+        key = self._key(row)
+        old_key = self._keys.get(person_id)
+        if person_id in self._keys:
+            if old_key == key:
+                return
+            self._discard(old_key, person_id)
+        self._keys[person_id] = key
+        insort(self._entries, (key, person_id))
+    
+    def remove(self, person_id: int) -> None:
+        """Drop a person from the index"""
+        if person_id in self._keys:
+            self._discard(self._keys.pop(person_id), person_id)
+    
+    def _discard(self, key: Any, person_id: int) -> None:
+        position = bisect_left(self._entries, (key, person_id))
+        del self._entries[position]
+    
+    def range(self, low: Any, high: Any) -> List[int]:
+        """Person IDs with low <= key <= high, in key order; costs a bisect plus the result size"""
+        start = bisect_left(self._entries, (low,))
+        end = bisect_right(self._entries, (high, math.inf))
+        return [person_id for _, person_id in self._entries[start:end]]
+    
+    def ids(self, reverse: bool = False) -> List[int]:
+        """Person IDs in ascending key order, or descending with reverse"""
+        entries = reversed(self._entries) if reverse else self._entries
+        return [person_id for _, person_id in entries]
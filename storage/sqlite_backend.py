@@ -0,0 +1,486 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+from models import Person, Conversation, PersonSummary
+from .search import SearchHit, tokenize, person_text
+from .timeline import TimelineEntry
+from .batch import BatchStats
+from .backend import synchronized
+from .birthdays import birthday_key, birthday_ranges
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS persons (
+    id INTEGER PRIMARY KEY,
+    first_name TEXT NOT NULL,
+    last_name TEXT NOT NULL,
+    email TEXT,
+    phone TEXT,
+    birth_date TEXT,
+    notes TEXT,
+    name_key TEXT NOT NULL,
+    last_contact TEXT,
+    conversation_count INTEGER NOT NULL DEFAULT 0,
+    birthday TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS conversations (
+    person_id INTEGER NOT NULL REFERENCES persons(id),
+    id INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    notes TEXT NOT NULL,
+    PRIMARY KEY (person_id, id)
+);
+CREATE INDEX IF NOT EXISTS idx_persons_name ON persons(name_key, id);
+CREATE INDEX IF NOT EXISTS idx_persons_last_contact ON persons(last_contact, id);
+CREATE INDEX IF NOT EXISTS idx_conversations_timeline ON conversations(date, person_id, id);
+CREATE VIRTUAL TABLE IF NOT EXISTS search_docs USING fts5(body);
+CREATE TABLE IF NOT EXISTS search_doc_keys (
+    rowid INTEGER PRIMARY KEY,
+    person_id INTEGER NOT NULL,
+    conversation_id INTEGER NOT NULL,
+    UNIQUE (person_id, conversation_id)
+);
+"""
+# Every search document has a row in search_doc_keys with the same rowid, naming the person and
+# conversation it belongs to (conversation_id 0 for the person record itself)
+
+class SQLiteStorage:
+    """Storage backend keeping persons and conversations in a single SQLite database"""
+    
+    def __init__(self, base_dir: Path = None):
+        self.base_dir = base_dir or Path.home() / '.lkit'
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.db_file = self.base_dir / 'lkit.db'
+        self._batch_depth = 0
+        self._batch: Optional[BatchStats] = None
+        self._lock = threading.RLock()
+        
+        self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        had_doc_keys = self._has_table('search_doc_keys')
+        self._conn.executescript(SCHEMA)
+        self._add_birthday_column()
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_persons_birthday ON persons(birthday, id)")
+        # Superseded by the covering idx_conversations_timeline
+        self._conn.execute("DROP INDEX IF EXISTS idx_conversations_date")
+        if not had_doc_keys:
+            # Documents of older databases encode their owner in the rowid; index them again
+            self._rebuild_search_docs()
+        self._conn.commit()
+    
+    def _has_table(self, name: str) -> bool:
+        return self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone() is not None
+    
+    def _add_birthday_column(self) -> None:
+        """Add the birthday key to databases created before it existed"""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(persons)")}
+        if 'birthday' not in columns:
+            self._conn.execute("ALTER TABLE persons ADD COLUMN birthday TEXT NOT NULL DEFAULT ''")
+            self._conn.execute(
+                "UPDATE persons SET birthday = substr(birth_date, 6, 5) WHERE birth_date IS NOT NULL"
+            )
+    
+    def flush(self) -> int:
+        """Nothing is buffered; every operation commits its own transaction"""
+        return 0
+    
+    @synchronized
+    def close(self) -> None:
+        """Close the database connection"""
+        self._conn.close()
+    
+    @contextmanager
+    def transaction(self):
+        """Group several operations into one transaction, committed on success"""
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            except Exception:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._conn.rollback()
+                raise
+            else:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._conn.commit()
+    
+    @contextmanager
+    def batch(self):
+        """Group saves and conversation changes into one transaction, committed once when the block ends
+        
+        Rows are written as the changes are made, so what the batch saves is
+        the per-operation commit. If the block raises, the transaction is
+        rolled back. Yields a BatchStats; a nested batch joins the outermost one.
+        """
+        with self._lock:
+            if self._batch is not None:
+                yield self._batch
+                return
+            
+            stats = self._batch = BatchStats()
+            try:
+                with self.transaction():
+                    yield stats
+            except BaseException:
+                stats.rolled_back = True
+                raise
+            finally:
+                self._batch = None
+            stats.writes = 1 if stats.changes else 0
+    
+    def _count_change(self, count: int = 1) -> None:
+        """Count changes made inside an open batch"""
+        if self._batch is not None:
+            self._batch.changes += count
+    
+    def _row_to_person(self, row) -> Person:
+        """Convert a persons row into a Person"""
+        person_id, first_name, last_name, email, phone, birth_date, notes = row
+        return Person(
+            id=person_id,
+            first_name=first_name,
+            last_name=last_name,
+            email=email,
+            phone=phone,
+            birth_date=date.fromisoformat(birth_date) if birth_date else None,
+            notes=notes
+        )
+    
+    def _row_to_summary(self, row) -> PersonSummary:
+        """Convert a summary query row into a PersonSummary"""
+        person_id, first_name, last_name, last_contact, conversation_count = row
+        return PersonSummary(
+            id=person_id,
+            first_name=first_name,
+            last_name=last_name,
+            last_contact=date.fromisoformat(last_contact) if last_contact else None,
+            conversation_count=conversation_count
+        )
+    
+    def _refresh_summary(self, person_id: int) -> None:
+        """Recompute the denormalized last contact date and conversation count"""
+        self._conn.execute(
+            """UPDATE persons SET
+                   last_contact = (SELECT MAX(date) FROM conversations WHERE person_id = ?),
+                   conversation_count = (SELECT COUNT(*) FROM conversations WHERE person_id = ?)
+               WHERE id = ?""",
+            (person_id, person_id, person_id)
+        )
+    
+    def _index_document(self, person_id: int, conversation_id: Optional[int], text: Optional[str]) -> None:
+        """Add or replace one full-text search document"""
+        key = (person_id, conversation_id or 0)
+        row = self._conn.execute(
+            "SELECT rowid FROM search_doc_keys WHERE person_id = ? AND conversation_id = ?", key
+        ).fetchone()
+        if row is None:
+            rowid = self._conn.execute(
+                "INSERT INTO search_doc_keys (person_id, conversation_id) VALUES (?, ?)", key
+            ).lastrowid
+        else:
+            rowid = row[0]
+        self._conn.execute("INSERT OR REPLACE INTO search_docs (rowid, body) VALUES (?, ?)", (rowid, text or ""))
+    
+    def _remove_documents(self, condition: str, params: tuple) -> None:
+        """Drop the search documents whose keys match a condition on search_doc_keys"""
+        self._conn.execute(
+            f"DELETE FROM search_docs WHERE rowid IN (SELECT rowid FROM search_doc_keys WHERE {condition})", params
+        )
+        self._conn.execute(f"DELETE FROM search_doc_keys WHERE {condition}", params)
+    
+    def _rebuild_search_docs(self) -> None:
+        """Index every person and conversation from scratch, without committing"""
+        self._conn.execute("DELETE FROM search_docs")
+        self._conn.execute("DELETE FROM search_doc_keys")
+        for person in self.get_all_persons():
+            self._index_document(person.id, None, person_text(person))
+        for person_id, conversation_id, notes in self._conn.execute(
+            "SELECT person_id, id, notes FROM conversations"
+        ).fetchall():
+            self._index_document(person_id, conversation_id, notes)
+    
+    def _write_person(self, person: Person, conversations: List[Conversation]) -> None:
+        """Write one person and replace their conversations, without committing"""
+        if person.id is None:
+            row = self._conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM persons").fetchone()
+            person.id = row[0]
+        
+        # Ensure conversations have IDs and person_id
+        next_conversation_id = max((c.id for c in conversations if c.id), default=0) + 1
+        for conv in conversations:
+            if conv.id is None:
+                conv.id = next_conversation_id
+                next_conversation_id += 1
+            conv.person_id = person.id
+        
+        self._conn.execute(
+            """INSERT OR REPLACE INTO persons
+                   (id, first_name, last_name, email, phone, birth_date, notes, name_key, birthday)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                person.id, person.first_name, person.last_name, person.email, person.phone,
+                person.birth_date.isoformat() if person.birth_date else None,
+                person.notes, person.first_name.lower(), birthday_key(person.birth_date)
+            )
+        )
+        self._conn.execute("DELETE FROM conversations WHERE person_id = ?", (person.id,))
+        self._conn.executemany(
+            "INSERT INTO conversations (person_id, id, date, notes) VALUES (?, ?, ?, ?)",
+            [(person.id, c.id, c.date.isoformat(), c.notes) for c in conversations]
+        )
+        self._refresh_summary(person.id)
+        
+        self._remove_documents("person_id = ?", (person.id,))
+        self._index_document(person.id, None, person_text(person))
+        for conv in conversations:
+            self._index_document(person.id, conv.id, conv.notes)
+    
+    @synchronized
+    def save_person(self, person: Person, conversations: List[Conversation]) -> None:
+        """Save person and their conversations"""
+        with self.transaction():
+            self._write_person(person, conversations)
+        self._count_change()
+    
+    @synchronized
+    def save_persons(self, records: Iterable[tuple[Person, List[Conversation]]]) -> int:
+        """Save many persons in a single transaction, returning how many were written"""
+        count = 0
+        with self.transaction():
+            for person, conversations in records:
+                self._write_person(person, conversations)
+                count += 1
+        self._count_change(count)
+        return count
+    
+    @synchronized
+    def load_person(self, person_id: int) -> Optional[tuple[Person, List[Conversation]]]:
+        """Load person and their conversations"""
+        row = self._conn.execute(
+            "SELECT id, first_name, last_name, email, phone, birth_date, notes FROM persons WHERE id = ?",
+            (person_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        conversations = [
+            Conversation(id=conv_id, person_id=person_id, date=date.fromisoformat(conv_date), notes=notes)
+            for conv_id, conv_date, notes in self._conn.execute(
+                "SELECT id, date, notes FROM conversations WHERE person_id = ? ORDER BY id",
+                (person_id,)
+            )
+        ]
+        return self._row_to_person(row), conversations
+    
+    def iter_records(self) -> Iterator[tuple[Person, List[Conversation]]]:
+        """Yield every person with their conversations, one at a time"""
+        with self._lock:
+            person_ids = [row[0] for row in self._conn.execute("SELECT id FROM persons ORDER BY id")]
+        for person_id in person_ids:
+            result = self.load_person(person_id)
+            if result is not None:
+                yield result
+    
+    @synchronized
+    def get_all_persons(self) -> List[Person]:
+        """Load all persons (without conversations) for listing"""
+        return [
+            self._row_to_person(row)
+            for row in self._conn.execute(
+                "SELECT id, first_name, last_name, email, phone, birth_date, notes FROM persons ORDER BY id"
+            )
+        ]
+    
+    @synchronized
+    def add_conversation(self, person_id: int, conversation: Conversation) -> bool:
+        """Add a new conversation to an existing person"""
+        try:
+            with self.transaction():
+                row = self._conn.execute(
+                    "SELECT (SELECT COALESCE(MAX(id), 0) FROM conversations WHERE person_id = ?) "
+                    "FROM persons WHERE id = ?",
+                    (person_id, person_id)
+                ).fetchone()
+                if row is None:
+                    return False
+                
+                conversation.person_id = person_id
+                conversation.id = row[0] + 1
+                self._conn.execute(
+                    "INSERT INTO conversations (person_id, id, date, notes) VALUES (?, ?, ?, ?)",
+                    (person_id, conversation.id, conversation.date.isoformat(), conversation.notes)
+                )
+                self._refresh_summary(person_id)
+                self._index_document(person_id, conversation.id, conversation.notes)
+            self._count_change()
+            return True
+        except sqlite3.Error as e:
+            print(f"Error adding conversation: {str(e)}")
+            return False
+    
+    @synchronized
+    def update_conversation(self, person_id: int, conversation: Conversation) -> bool:
+        """Store an edit to an existing conversation"""
+        try:
+            with self.transaction():
+                cursor = self._conn.execute(
+                    "UPDATE conversations SET date = ?, notes = ? WHERE person_id = ? AND id = ?",
+                    (conversation.date.isoformat(), conversation.notes, person_id, conversation.id)
+                )
+                if cursor.rowcount == 0:
+                    return False
+                conversation.person_id = person_id
+                self._refresh_summary(person_id)
+                self._index_document(person_id, conversation.id, conversation.notes)
+            self._count_change()
+            return True
+        except sqlite3.Error as e:
+            print(f"Error updating conversation: {str(e)}")
+            return False
+    
+    @synchronized
+    def delete_conversation(self, person_id: int, conversation_id: int) -> bool:
+        """Remove a conversation"""
+        try:
+            with self.transaction():
+                cursor = self._conn.execute(
+                    "DELETE FROM conversations WHERE person_id = ? AND id = ?",
+                    (person_id, conversation_id)
+                )
+                if cursor.rowcount == 0:
+                    return False
+                self._refresh_summary(person_id)
+                self._remove_documents("person_id = ? AND conversation_id = ?", (person_id, conversation_id))
+            self._count_change()
+            return True
+        except sqlite3.Error as e:
+            print(f"Error deleting conversation: {str(e)}")
+            return False
+    
+    @synchronized
+    def reindex(self) -> int:
+        """Recompute every summary column and search document and rebuild the indexes, returning the person count"""
+        with self.transaction():
+            self._conn.execute(
+                """UPDATE persons SET
+                       birthday = COALESCE(substr(birth_date, 6, 5), ''),
+                       last_contact = (SELECT MAX(date) FROM conversations WHERE person_id = persons.id),
+                       conversation_count = (SELECT COUNT(*) FROM conversations WHERE person_id = persons.id)"""
+            )
+            self._rebuild_search_docs()
+        self._conn.execute("REINDEX")
+        return self._conn.execute("SELECT COUNT(*) FROM persons").fetchone()[0]
+    
+    @synchronized
+    def get_person_summaries(self) -> List[PersonSummary]:
+        """Return summary rows for all persons"""
+        return [
+            self._row_to_summary(row)
+            for row in self._conn.execute(
+                "SELECT id, first_name, last_name, last_contact, conversation_count FROM persons ORDER BY id"
+            )
+        ]
+    
+    @synchronized
+    def get_person_summary(self, person_id: int) -> Optional[PersonSummary]:
+        """Return the summary for a single person"""
+        row = self._conn.execute(
+            "SELECT id, first_name, last_name, last_contact, conversation_count FROM persons WHERE id = ?",
+            (person_id,)
+        ).fetchone()
+        return self._row_to_summary(row) if row else None
+    
+    @synchronized
+    def get_sorted_person_ids(self, sort_by: str = 'name', reverse: bool = False) -> List[int]:
+        """Return person IDs ordered by last contact date ('date') or first name ('name'), using the indexes"""
+        column = 'last_contact' if sort_by == 'date' else 'name_key'
+        direction = 'DESC' if reverse else 'ASC'
+        return [
+            row[0]
+            for row in self._conn.execute(
+                f"SELECT id FROM persons ORDER BY {column} {direction}, id {direction}"
+            )
+        ]
+    
+    @synchronized
+    def upcoming_birthdays(self, days: int = 14, today: date = None) -> List[int]:
+        """IDs of persons whose birthday falls within the next days days (today included), soonest first"""
+        person_ids = []
+        for low, high in birthday_ranges(today or date.today(), days):
+            person_ids += [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT id FROM persons WHERE birthday BETWEEN ? AND ? ORDER BY birthday, id", (low, high)
+                )
+            ]
+        return list(dict.fromkeys(person_ids))
+    
+    @synchronized
+    def stale_contacts(self, since: date, include_never: bool = True) -> List[int]:
+        """IDs of persons last contacted before since, longest ago first; never contacted ones lead"""
+        condition = "last_contact < ?"
+        if include_never:
+            condition += " OR last_contact IS NULL"
+        return [
+            row[0]
+            for row in self._conn.execute(
+                f"SELECT id FROM persons WHERE {condition} ORDER BY last_contact, id", (since.isoformat(),)
+            )
+        ]
+    
+    def _timeline_condition(self, start: Optional[date], end: Optional[date]) -> tuple[str, list]:
+        conditions, params = [], []
+        if start:
+            conditions.append("date >= ?")
+            params.append(start.isoformat())
+        if end:
+            conditions.append("date <= ?")
+            params.append(end.isoformat())
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), params
+    
+    @synchronized
+    def get_timeline(self, start: date = None, end: date = None, offset: int = 0,
+                     limit: Optional[int] = None, reverse: bool = False) -> List[TimelineEntry]:
+        """A page of the conversations of all persons dated within start..end, oldest first or newest first with reverse"""
+        where, params = self._timeline_condition(start, end)
+        direction = "DESC" if reverse else "ASC"
+        return [
+            TimelineEntry(date.fromisoformat(conv_date), person_id, conv_id)
+            for conv_date, person_id, conv_id in self._conn.execute(
+                f"SELECT date, person_id, id FROM conversations{where} "
+                f"ORDER BY date {direction}, person_id {direction}, id {direction} LIMIT ? OFFSET ?",
+                params + [-1 if limit is None else limit, offset]
+            )
+        ]
+    
+    @synchronized
+    def count_timeline(self, start: date = None, end: date = None) -> int:
+        """Number of conversations of all persons dated within start..end"""
+        where, params = self._timeline_condition(start, end)
+        return self._conn.execute(f"SELECT COUNT(*) FROM conversations{where}", params).fetchone()[0]
+    
+    @synchronized
+    def search(self, query: str) -> List[SearchHit]:
+        """Find persons and conversations whose text contains every word of the query"""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        
+        # Quote each word; the last one is matched as a prefix
+        match = " ".join(f'"{token}"' for token in tokens[:-1])
+        match += f' "{tokens[-1]}"*'
+        hits = []
+        for person_id, conversation_id in self._conn.execute(
+            """SELECT k.person_id, k.conversation_id
+               FROM search_docs JOIN search_doc_keys AS k ON k.rowid = search_docs.rowid
+               WHERE search_docs MATCH ? ORDER BY k.person_id, k.conversation_id""", (match,)
+        ):
+            hits.append(SearchHit(person_id, conversation_id or None))
+        return hits
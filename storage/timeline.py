@@ -0,0 +1,178 @@
+import math
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from models import Person, Conversation
+from .journal import JournaledIndex, read_entries
+from .fileio import read_json, write_json_atomic
+
+@dataclass(frozen=True)
+class TimelineEntry:
+    date: date
+    person_id: int
+    conversation_id: int
+
+class ConversationTimeline(JournaledIndex):
+    """Every conversation of every person as (date, person_id, conversation_id), kept in date order
+    
+    A date range is located with two bisects, so a query costs O(log N) plus
+    the entries returned. Without files it lives in memory only.
+    """
+    
+    def __init__(self, index_file: Optional[Path] = None, journal_file: Optional[Path] = None):
+        super().__init__(index_file, journal_file)
+        self._entries: List[tuple[str, int, int]] = []
+        self._dates: Dict[int, Dict[int, str]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def conversation_counts(self) -> Dict[int, int]:
+        """Number of indexed conversations for every person that has any"""
+        return {person_id: len(dates) for person_id, dates in self._dates.items() if dates}
+    
+    def load(self) -> bool:
+        """Load the snapshot and replay the journal; False if there is no usable index"""
+        try:
+            data = read_json(self.index_file)
+            dates = {
+                int(person_id): {int(conversation_id): day for conversation_id, day in person_dates.items()}
+                for person_id, person_dates in data['persons'].items()
+            }
+        except (OSError, ValueError, KeyError, AttributeError, TypeError):
+            return False
+        
+        self._dates = dates
+        self._entries = sorted(
+            (day, person_id, conversation_id)
+            for person_id, person_dates in dates.items()
+            for conversation_id, day in person_dates.items()
+        )
+        
+        replayed = False
+        for entry in read_entries(self.journal_file):
+            self._apply(entry)
+            replayed = True
+        if replayed:
+            self.save()
+        return True
+    
+    def save(self) -> None:
+        """Write a snapshot of the index and discard the journal"""
+        if self.index_file is None:
+            return
+        data = {
+            "persons": {
+                str(person_id): {str(conversation_id): day for conversation_id, day in person_dates.items()}
+                for person_id, person_dates in self._dates.items()
+                if person_dates
+            }
+        }
+        write_json_atomic(self.index_file, data)
+        self.journal_file.unlink(missing_ok=True)
+        self._journal_entries = 0
+    
+    def _set(self, person_id: int, conversation_id: int, day: str) -> None:
+        person_dates = self._dates.setdefault(person_id, {})
+        old_day = person_dates.get(conversation_id)
+        if old_day == day:
+            return
+        if old_day is not None:
+            self._discard(old_day, person_id, conversation_id)
+        person_dates[conversation_id] = day
+        insort(self._entries, (day, person_id, conversation_id))
+    
+    def _remove(self, person_id: int, conversation_id: int) -> None:
+        day = self._dates.get(person_id, {}).pop(conversation_id, None)
+        if day is not None:
+            self._discard(day, person_id, conversation_id)
+    
+    def _discard(self, day: str, person_id: int, conversation_id: int) -> None:
+        del self._entries[bisect_left(self._entries, (day, person_id, conversation_id))]
+    
+    def _drop_person(self, person_id: int) -> None:
+        for conversation_id in list(self._dates.get(person_id, {})):
+            self._remove(person_id, conversation_id)
+        self._dates.pop(person_id, None)
+    
+    def _apply(self, entry: Dict) -> None:
+        """Apply one journal entry to the in-memory index"""
+        op = entry['op']
+        if op == 'set':
+            self._set(entry['person'], entry['conversation'], entry['date'])
+        elif op == 'remove':
+            self._remove(entry['person'], entry['conversation'])
+        elif op == 'drop':
+            self._drop_person(entry['person'])
+    
+    def rebuild(self, records: Iterable[tuple[Person, List[Conversation]]]) -> None:
+        """Index every conversation from scratch and write a fresh snapshot"""
+        self._dates = {
+            person.id: {conv.id: conv.date.isoformat() for conv in conversations}
+            for person, conversations in records
+        }
+        self._entries = sorted(
+            (day, person_id, conversation_id)
+            for person_id, person_dates in self._dates.items()
+            for conversation_id, day in person_dates.items()
+        )
+        self.save()
+    
+    def index_persons(self, records: Iterable[tuple[Person, Iterable[Conversation]]]) -> None:
+        """Bring the entries of a batch of persons in line with their conversations, journaling only changes"""
+        changes = []
+        for person, conversations in records:
+            existing = self._dates.get(person.id, {})
+            current = {conv.id: conv.date.isoformat() for conv in conversations}
+            changes += [
+                {"op": "remove", "person": person.id, "conversation": conversation_id}
+                for conversation_id in existing if conversation_id not in current
+            ]
+            changes += [
+                {"op": "set", "person": person.id, "conversation": conversation_id, "date": day}
+                for conversation_id, day in current.items() if existing.get(conversation_id) != day
+            ]
+        self._record_all(changes)
+    
+    def index_conversation(self, person_id: int, conversation: Conversation) -> None:
+        """Add a conversation or move it to its new date"""
+        day = conversation.date.isoformat()
+        if self._dates.get(person_id, {}).get(conversation.id) != day:
+            self._record({"op": "set", "person": person_id, "conversation": conversation.id, "date": day})
+    
+    def remove_conversation(self, person_id: int, conversation_id: int) -> None:
+        """Remove a single conversation"""
+        self._record({"op": "remove", "person": person_id, "conversation": conversation_id})
+    
+    def remove_person(self, person_id: int) -> None:
+        """Remove every conversation of a person"""
+        self._record({"op": "drop", "person": person_id})
+    
+    def _bounds(self, start: Optional[date], end: Optional[date]) -> tuple[int, int]:
+        """Positions of the first entry on or after start and just past the last one on or before end"""
+        low = bisect_left(self._entries, (start.isoformat(),)) if start else 0
+        high = bisect_right(self._entries, (end.isoformat(), math.inf)) if end else len(self._entries)
+        return low, max(low, high)
+    
+    def count(self, start: Optional[date] = None, end: Optional[date] = None) -> int:
+        """Number of conversations dated within start..end (inclusive, open where None)"""
+        low, high = self._bounds(start, end)
+        return high - low
+    
+    def range(self, start: Optional[date] = None, end: Optional[date] = None, offset: int = 0,
+              limit: Optional[int] = None, reverse: bool = False) -> List[TimelineEntry]:
+        """A page of the conversations dated within start..end, oldest first or newest first with reverse"""
+        low, high = self._bounds(start, end)
+        stop = high - low if limit is None else min(high - low, offset + limit)
+        if offset >= stop:
+            return []
+        if reverse:
+            selected = self._entries[high - stop:high - offset][::-1]
+        else:
+            selected = self._entries[low + offset:low + stop]
+        return [
+            TimelineEntry(date.fromisoformat(day), person_id, conversation_id)
+            for day, person_id, conversation_id in selected
+        ]
@@ -0,0 +1,59 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+class WriteBehindQueue:
+    """Collects pending writes by key and hands them to a flush callback after a short delay
+    
+    Writes for the same key within one delay window replace each other, so
+    only the latest version is written. The queue itself never writes; the
+    owner drains it with take_all() from flush_callback or on demand. With
+    delay None nothing fires and items wait for take_all().
+    """
+    
+    def __init__(self, delay: Optional[float], flush_callback: Callable[[], Any] = None):
+        self.delay = delay
+        self.flush_callback = flush_callback
+        self.coalesced = 0  # Writes replaced by a newer write before being flushed
+        self._pending: Dict[Hashable, Any] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._pending
+    
+    def __len__(self) -> int:
+        return len(self._pending)
+    
+    def get(self, key: Hashable) -> Any:
+        """Return the pending item for a key, or None"""
+        return self._pending.get(key)
+    
+    def items(self):
+        """Snapshot of the pending (key, item) pairs"""
+        with self._lock:
+            return list(self._pending.items())
+    
+    def put(self, key: Hashable, item: Any) -> None:
+        """Queue an item, replacing any pending item for the same key"""
+        with self._lock:
+            if key in self._pending:
+                self.coalesced += 1
+            self._pending[key] = item
+            if self._timer is None and self.delay is not None:
+                self._timer = threading.Timer(self.delay, self._fire)
+                self._timer.daemon = True
+                self._timer.start()
+    
+    def take_all(self) -> Dict[Hashable, Any]:
+        """Remove and return every pending item"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            return pending
+    
+    def _fire(self) -> None:
+        with self._lock:
+            self._timer = None
+        self.flush_callback()
@@ -0,0 +1,75 @@
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+from storage import StorageManager, SQLiteStorage
+from storage.archive import restore_archive
+from models import Person, Conversation
+from datetime import date
+
+class TestArchive(unittest.TestCase):
+    def setUp(self):
+        """Create a store with a few persons"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.storage = StorageManager(base_dir=self.temp_dir / 'source')
+        self.john = Person(first_name="John", last_name="Doe", birth_date=date(1990, 1, 1))
+        self.jane = Person(first_name="Jane", last_name="Roe", notes="Café owner")
+        self.storage.save_person(self.john, [Conversation(date=date(2024, 1, 1), notes="First")])
+        self.storage.save_person(self.jane, [])
+        self.storage.add_conversation(self.john.id, Conversation(date=date(2024, 2, 1), notes="Second"))
+    
+    def tearDown(self):
+        """Clean up the temporary directory after tests"""
+        shutil.rmtree(self.temp_dir)
+    
+    def assert_restored(self, storage):
+        person, conversations = storage.load_person(self.john.id)
+        self.assertEqual(person, self.john)
+        self.assertEqual([(c.id, c.notes) for c in conversations], [(1, "First"), (2, "Second")])
+        self.assertEqual(storage.load_person(self.jane.id)[0].notes, "Café owner")
+    
+    def test_round_trip(self):
+        """Test exporting to plain and compressed archives and restoring them"""
+        for name in ('backup.jsonl', 'backup.jsonl.gz'):
+            with self.subTest(archive=name):
+                path = self.temp_dir / name
+                self.assertEqual(self.storage.export_archive(path), 2)
+                
+                target = StorageManager(base_dir=self.temp_dir / name.replace('.', '_'))
+                stats = target.restore_archive(path)
+                self.assertEqual((stats.persons, stats.conversations), (2, 2))
+                self.assert_restored(target)
+                
+                # New persons must not reuse restored IDs
+                new_person = Person(first_name="New", last_name="Person")
+                target.save_person(new_person, [])
+                self.assertEqual(new_person.id, 3)
+    
+    def test_compressed_archive_smaller(self):
+        """Test that the .gz archive is actually compressed"""
+        for i in range(50):
+            self.storage.add_conversation(self.jane.id, Conversation(notes="Talked about the same project again"))
+        plain, packed = self.temp_dir / 'a.jsonl', self.temp_dir / 'a.jsonl.gz'
+        self.storage.export_archive(plain)
+        self.storage.export_archive(packed)
+        self.assertLess(packed.stat().st_size, plain.stat().st_size)
+    
+    def test_restore_into_sqlite(self):
+        """Test that an archive moves data between backends"""
+        path = self.temp_dir / 'backup.jsonl.gz'
+        self.storage.export_archive(path)
+        
+        target = SQLiteStorage(base_dir=self.temp_dir / 'sqlite')
+        restore_archive(target, path)
+        self.assert_restored(target)
+        target.close()
+    
+    def test_rejects_other_files(self):
+        """Test that a file without the archive header is refused"""
+        path = self.temp_dir / 'other.jsonl'
+        path.write_text('{"first_name": "John"}\n', encoding='utf-8')
+        with self.assertRaises(ValueError):
+            StorageManager(base_dir=self.temp_dir / 'target').restore_archive(path)
+
+if __name__ == '__main__':
+    unittest.main()
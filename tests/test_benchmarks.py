@@ -0,0 +1,65 @@
+import unittest
+import importlib.util
+import tempfile
+import shutil
+from pathlib import Path
+from benchmarks import (
+    generate_records, run_storage_benchmarks, BenchmarkResult, save_results, load_results, compare_results,
+    exceeded_budgets
+)
+
+class TestBenchmarks(unittest.TestCase):
+    def setUp(self):
+        """Create a temporary directory for generated stores"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+    
+    def tearDown(self):
+        """Clean up the temporary directory"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_generator_is_seeded(self):
+        """Test that a seed always produces the same contact book"""
+        first = list(generate_records(50, seed=7))
+        self.assertEqual(first, list(generate_records(50, seed=7)))
+        self.assertNotEqual(first, list(generate_records(50, seed=8)))
+        self.assertTrue(any(len(conversations) > 3 for _, conversations in first))
+    
+    def test_storage_benchmarks_round_trip(self):
+        """Test running the storage benchmarks and comparing saved results"""
+        results = run_storage_benchmarks(self.temp_dir, 20, samples=5, repeat=1)
+        names = {result.name for result in results}
+        self.assertTrue({'open', 'get_all_persons', 'load_person', 'save_person', 'add_conversation'} <= names)
+        
+        path = self.temp_dir / 'results.json'
+        save_results(path, results)
+        self.assertEqual(load_results(path), results)
+    
+    def test_compare_results(self):
+        """Test that only slowdowns past the tolerance are reported"""
+        baseline = [BenchmarkResult('open', 'json', 10, 1.0), BenchmarkResult('load_person', 'json', 10, 1.0)]
+        current = [BenchmarkResult('open', 'json', 10, 1.1), BenchmarkResult('load_person', 'json', 10, 1.5)]
+        regressions = compare_results(baseline, current, tolerance=0.2)
+        self.assertEqual([(new.name, ratio) for _, new, ratio in regressions], [('load_person', 1.5)])
+    
+    def test_exceeded_budgets(self):
+        """Test that measurements above a budget are reported"""
+        results = [BenchmarkResult('scroll_frame', 'json', 10, 0.01, 5, storage_calls=2.0, peak_bytes=100)]
+        self.assertEqual(exceeded_budgets(results, {'scroll_frame': {'seconds': 0.02, 'peak_bytes': 1000}}), [])
+        failures = exceeded_budgets(results, {'scroll_frame': {'storage_calls': 0}})
+        self.assertEqual(len(failures), 1)
+        self.assertIn('storage_calls', failures[0])
+    
+    @unittest.skipUnless(importlib.util.find_spec('PyQt6'), "PyQt6 is not installed")
+    def test_gui_benchmarks(self):
+        """Test driving the main window offscreen against a small store"""
+        from benchmarks.gui_bench import run_gui_benchmarks
+        results = run_gui_benchmarks(self.temp_dir, 30, frames=3, repeat=1)
+        by_name = {result.name: result for result in results}
+        self.assertEqual(set(by_name), {
+            'load_persons', 'sort_toggle', 'scroll_frame', 'display_heavy_person', 'startup_cold', 'startup_snapshot'
+        })
+        self.assertEqual(by_name['scroll_frame'].storage_calls, 0)
+        self.assertGreater(by_name['load_persons'].peak_bytes, 0)
+
+if __name__ == '__main__':
+    unittest.main()
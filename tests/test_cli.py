@@ -0,0 +1,103 @@
+import unittest
+import tempfile
+import shutil
+import io
+import subprocess
+import sys
+from contextlib import redirect_stdout, redirect_stderr
+from pathlib import Path
+from lkit import main
+from storage import StorageManager
+from models import Person, Conversation
+from datetime import date
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        """Create a store with two persons"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.store = self.temp_dir / 'store'
+        storage = StorageManager(base_dir=self.store)
+        self.john = Person(first_name="John", last_name="Doe", email="john@example.com")
+        self.jane = Person(first_name="Jane", last_name="Roe")
+        storage.save_person(self.john, [Conversation(date=date(2024, 1, 1), notes="Talked about sailing")])
+        storage.save_person(self.jane, [])
+    
+    def tearDown(self):
+        """Clean up the temporary directory after tests"""
+        shutil.rmtree(self.temp_dir)
+    
+    def run_cli(self, *args, store=None) -> tuple[int, str]:
+        output = io.StringIO()
+        with redirect_stdout(output):
+            status = main(['--store', str(store or self.store), '--backend', 'json', *args])
+        return status, output.getvalue()
+    
+    def test_list_show_and_search(self):
+        """Test the read-only commands"""
+        status, output = self.run_cli('list')
+        self.assertEqual(status, 0)
+        self.assertEqual(output.splitlines(), [
+            f"{self.jane.id}\tJane Roe\t\t0",
+            f"{self.john.id}\tJohn Doe\t2024-01-01\t1",
+        ])
+        output = self.run_cli('list', '--sort', 'date', '--reverse', '--limit', '1')[1]
+        self.assertEqual(output.split('\t')[0], str(self.john.id))
+        
+        output = self.run_cli('show', str(self.john.id))[1]
+        self.assertIn("Email: john@example.com", output)
+        self.assertIn("2024-01-01\tTalked about sailing", output)
+        self.assertEqual(self.run_cli('show', '99')[0], 1)
+        
+        self.assertEqual(self.run_cli('search', 'sail')[1], f"{self.john.id}\t1\tJohn Doe\n")
+        self.assertIn("conversations\t1", self.run_cli('stats')[1])
+    
+    def test_add_conversation(self):
+        """Test logging a conversation from the command line"""
+        status, output = self.run_cli('add-conversation', str(self.jane.id), 'Coffee', '--date', '2024-05-01')
+        self.assertEqual((status, output), (0, "1\n"))
+        _, conversations = StorageManager(base_dir=self.store).load_person(self.jane.id)
+        self.assertEqual([(c.date, c.notes) for c in conversations], [(date(2024, 5, 1), "Coffee")])
+        self.assertEqual(self.run_cli('add-conversation', '99', 'Nobody')[0], 1)
+    
+    def test_export_import_and_reindex(self):
+        """Test that an exported archive is restored by import and that reindex repairs the catalog"""
+        archive = self.temp_dir / 'backup.jsonl.gz'
+        self.assertEqual(self.run_cli('export', str(archive))[0], 0)
+        
+        copy = self.temp_dir / 'copy'
+        self.assertIn("Imported 2 persons and 1 conversations", self.run_cli('import', str(archive), store=copy)[1])
+        self.assertEqual(self.run_cli('list', store=copy)[1], self.run_cli('list')[1])
+        
+        (copy / 'catalog.json').write_text('{"persons": {}}', encoding='utf-8')
+        self.assertEqual(self.run_cli('reindex', store=copy)[1], "Reindexed 2 persons\n")
+        self.assertEqual(self.run_cli('list', store=copy)[1], self.run_cli('list')[1])
+    
+    def test_import_errors(self):
+        """Test that skipped rows and unreadable files are reported on stderr without a traceback"""
+        path = self.temp_dir / 'bad.csv'
+        path.write_text("first_name,last_name,birth_date\nAnn,Lee,1990-02-30\nBen,Lee,\n", encoding='utf-8')
+        errors = io.StringIO()
+        with redirect_stderr(errors):
+            status, output = self.run_cli('import', str(path))
+            self.assertEqual(status, 0)
+            self.assertIn("Imported 1 persons", output)
+            self.assertEqual(self.run_cli('import', str(self.temp_dir / 'contacts.txt'))[0], 1)
+            self.assertEqual(self.run_cli('import', str(self.temp_dir / 'missing.csv'))[0], 1)
+        lines = errors.getvalue().splitlines()
+        self.assertEqual(lines[0], "Skipped line 2: day is out of range for month")
+        self.assertEqual(lines[1], "Error: Unsupported import format: .txt")
+        self.assertTrue(lines[2].startswith("Error: [Errno 2]"))
+    
+    def test_compress(self):
+        """Test switching the store to compressed person files"""
+        self.assertEqual(self.run_cli('compress', 'gzip'), (0, "Rewrote 2 person files as gzip\n"))
+        self.assertIn("Talked about sailing", self.run_cli('show', str(self.john.id))[1])
+    
+    def test_does_not_import_qt(self):
+        """Test that the command-line entry point never loads PyQt6"""
+        root = Path(__file__).resolve().parent.parent
+        code = "import sys, lkit.cli; sys.exit('PyQt6' in sys.modules)"
+        self.assertEqual(subprocess.run([sys.executable, '-c', code], cwd=root).returncode, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+import tempfile
+import shutil
+import json
+from pathlib import Path
+from storage import StorageManager, SQLiteStorage
+from storage.importer import import_file, import_records, batched, read_records
+from models import Person
+from datetime import date
+
+class TestImporter(unittest.TestCase):
+    def setUp(self):
+        """Create a temporary store and input directory"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.storage = StorageManager(base_dir=self.temp_dir / 'store')
+    
+    def tearDown(self):
+        """Clean up the temporary directory after tests"""
+        shutil.rmtree(self.temp_dir)
+    
+    def write(self, name: str, content: str) -> Path:
+        path = self.temp_dir / name
+        path.write_text(content, encoding='utf-8')
+        return path
+    
+    def test_import_csv(self):
+        """Test importing persons and conversations from CSV"""
+        path = self.write('contacts.csv',
+            "first_name,last_name,email,birth_date,conversation_date,conversation_notes\n"
+            "John,Doe,john@example.com,1990-01-01,2024-01-01,Met at the conference\n"
+            "Jane,Roe,,,,\n"
+        )
+        stats = import_file(self.storage, path)
+        self.assertEqual((stats.persons, stats.conversations, stats.batches), (2, 1, 1))
+        
+        summaries = {s.full_name: s for s in self.storage.get_person_summaries()}
+        self.assertEqual(set(summaries), {"John Doe", "Jane Roe"})
+        person, conversations = self.storage.load_person(summaries["John Doe"].id)
+        self.assertEqual(person.birth_date, date(1990, 1, 1))
+        self.assertEqual(conversations[0].notes, "Met at the conference")
+        self.assertIsNone(self.storage.load_person(summaries["Jane Roe"].id)[0].email)
+    
+    def test_import_skips_bad_rows(self):
+        """Test that rows with invalid dates are skipped and reported while the rest are imported"""
+        path = self.write('contacts.csv',
+            "first_name,last_name,birth_date,conversation_date,conversation_notes\n"
+            "John,Doe,1990-01-01,,\n"
+            "Bad,Birthday,1990-02-30,,\n"
+            "Bad,Conversation,,2024-13-01,Lunch\n"
+            "Jane,Roe,,,\n"
+        )
+        stats = import_file(self.storage, path, batch_size=1)
+        self.assertEqual(stats.persons, 2)
+        self.assertEqual(sorted(stats.skipped), [3, 4])
+        self.assertIn("day is out of range", stats.skipped[3])
+        self.assertEqual(sorted(s.full_name for s in self.storage.get_person_summaries()), ["Jane Roe", "John Doe"])
+        
+        path = self.write('contacts.jsonl',
+            '{"first_name": "John", "last_name": "Doe"}\n'
+            '{"first_name": "Bad", "birth_date": "1990-02-30"}\n'
+            'not json\n'
+        )
+        self.assertEqual(sorted(import_file(self.storage, path).skipped), [2, 3])
+    
+    def test_import_vcard(self):
+        """Test importing persons from a vCard file with folded lines and parameters"""
+        path = self.write('contacts.vcf',
+            "BEGIN:VCARD\r\nVERSION:3.0\r\nN:Doe;John;;;\r\nFN:John Doe\r\n"
+            "TEL;TYPE=cell:+1 555 0100\r\nitem1.EMAIL:john@example.com\r\n"
+            "BDAY:19900101\r\nNOTE:Likes sailing\\, hiking\r\n  and chess\r\nEND:VCARD\r\n"
+            "BEGIN:VCARD\r\nVERSION:3.0\r\nFN:Jane Roe\r\nBDAY:--0415\r\nEND:VCARD\r\n"
+        )
+        records = list(read_records(path))
+        self.assertEqual(len(records), 2)
+        
+        john, _ = records[0]
+        self.assertEqual((john.first_name, john.last_name), ("John", "Doe"))
+        self.assertEqual(john.phone, "+1 555 0100")
+        self.assertEqual(john.email, "john@example.com")
+        self.assertEqual(john.birth_date, date(1990, 1, 1))
+        self.assertEqual(john.notes, "Likes sailing, hiking and chess")
+        
+        jane, _ = records[1]
+        self.assertEqual((jane.first_name, jane.last_name, jane.birth_date), ("Jane", "Roe", None))
+    
+    def test_import_jsonl_in_batches(self):
+        """Test that JSON Lines input is saved in batches with fresh IDs"""
+        lines = [
+            json.dumps({"id": 99, "first_name": f"Person{i}", "last_name": "Test",
+                        "conversations": [{"id": 1, "date": "2024-01-01", "notes": "Hi"}]})
+            for i in range(5)
+        ]
+        path = self.write('contacts.jsonl', "\n".join(lines) + "\n")
+        
+        stats = import_file(self.storage, path, batch_size=2)
+        self.assertEqual((stats.persons, stats.conversations, stats.batches), (5, 5, 3))
+        self.assertGreater(stats.persons_per_second, 0)
+        self.assertEqual(sorted(s.id for s in self.storage.get_person_summaries()), [1, 2, 3, 4, 5])
+        self.assertEqual(len(self.storage.search("hi")), 5)
+        
+        # A reopened store sees the batch-written index and catalog
+        storage = StorageManager(base_dir=self.temp_dir / 'store')
+        self.assertEqual(len(storage.get_person_summaries()), 5)
+    
+    def test_import_into_sqlite(self):
+        """Test that the importer works against any backend with save_persons"""
+        storage = SQLiteStorage(base_dir=self.temp_dir / 'sqlite')
+        stats = import_records(storage, ((Person(first_name=f"P{i}"), []) for i in range(3)))
+        self.assertEqual(stats.persons, 3)
+        self.assertEqual(len(storage.get_all_persons()), 3)
+        storage.close()
+    
+    def test_batched(self):
+        """Test grouping a stream into fixed-size batches"""
+        self.assertEqual(list(batched(iter(range(5)), 2)), [[0, 1], [2, 3], [4]])
+    
+    def test_unsupported_format(self):
+        """Test that unknown extensions are rejected"""
+        with self.assertRaises(ValueError):
+            read_records(self.temp_dir / 'contacts.xls')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+from storage import StorageManager, STATS
+from models import Person, Conversation
+from datetime import date
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        """Create a store and start from empty, enabled counters"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.storage = StorageManager(base_dir=self.temp_dir)
+        self.was_enabled = STATS.enabled
+        STATS.reset()
+        STATS.enable()
+    
+    def tearDown(self):
+        """Restore the instrumentation state and clean up"""
+        STATS.enable(self.was_enabled)
+        STATS.reset()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_io_charged_to_public_methods(self):
+        """Test that reads and writes are counted under the method that caused them"""
+        person = Person(first_name="John", last_name="Doe")
+        self.storage.save_person(person, [Conversation(date=date(2024, 1, 1), notes="Hi")])
+        self.storage.load_person(person.id)
+        self.storage.add_conversation(person.id, Conversation(date=date(2024, 2, 1), notes="Again"))
+        
+        stats = STATS.snapshot()
+        self.assertEqual(stats['save_person']['calls'], 1)
+        self.assertGreater(stats['save_person']['bytes_written'], 0)
+        self.assertEqual(stats['load_person']['files_opened'], 1)
+        self.assertGreater(stats['load_person']['bytes_read'], 0)
+        self.assertGreater(stats['add_conversation']['bytes_written'], 0)
+        self.assertIs(self.storage.stats, STATS)
+        self.assertIn('load_person', STATS.report())
+    
+    def test_open_scans_directory(self):
+        """Test that a rebuilt index shows up as directory scans of opening the store"""
+        (self.temp_dir / 'index.json').unlink()
+        StorageManager(base_dir=self.temp_dir)
+        self.assertGreater(STATS.snapshot()['open']['dir_scans'], 0)
+    
+    def test_disabled_counts_nothing(self):
+        """Test that nothing is recorded while instrumentation is off"""
+        STATS.enable(False)
+        self.storage.save_person(Person(first_name="John", last_name="Doe"), [])
+        self.assertEqual(STATS.snapshot(), {})
+
+if __name__ == '__main__':
+    unittest.main()
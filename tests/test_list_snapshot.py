@@ -0,0 +1,36 @@
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+from views.list_snapshot import load_list_snapshot, save_list_snapshot
+from models import PersonSummary
+from datetime import date
+
+class TestListSnapshot(unittest.TestCase):
+    def setUp(self):
+        """Create a temporary directory for the snapshot"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.path = self.temp_dir / 'lkit' / 'list_snapshot.json'
+    
+    def tearDown(self):
+        """Clean up the temporary directory"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_round_trip(self):
+        """Test that the sort and first page survive saving and loading"""
+        summaries = [
+            PersonSummary(id=2, first_name="Jane", last_name="Roe", last_contact=date(2024, 5, 1), conversation_count=3),
+            PersonSummary(id=1, first_name="John", last_name="Doe", last_contact=None, conversation_count=0),
+        ]
+        save_list_snapshot(self.path, 'name', False, summaries)
+        self.assertEqual(load_list_snapshot(self.path), ('name', False, summaries))
+    
+    def test_missing_or_invalid_snapshot(self):
+        """Test that an unusable snapshot is ignored"""
+        self.assertIsNone(load_list_snapshot(self.path))
+        self.path.parent.mkdir()
+        self.path.write_text('{"version": 99}', encoding='utf-8')
+        self.assertIsNone(load_list_snapshot(self.path))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+from storage import PackedStorage, StorageBackend, SearchHit, TimelineEntry, open_storage
+from storage.packed_backend import INDEX_ENTRY
+from models import Person, Conversation
+from datetime import date
+
+class TestPackedStorage(unittest.TestCase):
+    def setUp(self):
+        """Create a temporary packed store for test data"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.storage = PackedStorage(base_dir=self.temp_dir)
+    
+    def tearDown(self):
+        """Close the store and clean up the temporary directory"""
+        self.storage.close()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_implements_backend(self):
+        """Test that the packed store satisfies the storage protocol"""
+        self.assertIsInstance(self.storage, StorageBackend)
+        store = open_storage(self.temp_dir / 'other', 'packed')
+        self.assertIsInstance(store, PackedStorage)
+        store.close()
+    
+    def test_save_load_and_reopen(self):
+        """Test that records and conversation changes survive reopening the store"""
+        person = Person(first_name="John", last_name="Doe", birth_date=date(1990, 1, 1))
+        self.storage.save_person(person, [Conversation(date=date(2024, 1, 1), notes="First")])
+        self.storage.save_person(Person(first_name="Jane", last_name="Roe"), [])
+        self.assertTrue(self.storage.add_conversation(person.id, Conversation(date=date(2024, 2, 1), notes="Second")))
+        self.assertTrue(self.storage.delete_conversation(person.id, 1))
+        self.assertFalse(self.storage.update_conversation(person.id, Conversation(id=7)))
+        self.storage.close()
+        
+        self.storage = PackedStorage(base_dir=self.temp_dir)
+        loaded_person, conversations = self.storage.load_person(person.id)
+        self.assertEqual(loaded_person, person)
+        self.assertEqual([(c.id, c.notes, c.person_id) for c in conversations], [(2, "Second", person.id)])
+        self.assertIsNone(self.storage.load_person(999))
+        self.assertEqual(self.storage.get_sorted_person_ids('name'), [2, 1])
+        self.assertEqual(self.storage.get_person_summary(person.id).last_contact, date(2024, 2, 1))
+        self.assertEqual(self.storage.search("second"), [SearchHit(person.id, 2)])
+        
+        self.storage.save_person(Person(first_name="Max", last_name="Poe"), [])
+        self.assertEqual(self.storage.get_sorted_person_ids('name')[-1], 3)
+    
+    def test_sort_ties_by_id(self):
+        """Test that equal names and dates are ordered by ID and that descending mirrors ascending"""
+        for first_name, day in [("Ann", 2), ("Ben", 1), ("Ann", 1), ("ann", 2), ("Ben", 2)]:
+            self.storage.save_person(Person(first_name=first_name, last_name="Lee"),
+                                     [Conversation(date=date(2024, 1, day))])
+        
+        self.assertEqual(self.storage.get_sorted_person_ids('name'), [1, 3, 4, 2, 5])
+        self.assertEqual(self.storage.get_sorted_person_ids('date'), [2, 3, 1, 4, 5])
+        for sort_by in ('name', 'date'):
+            self.assertEqual(self.storage.get_sorted_person_ids(sort_by, reverse=True),
+                             self.storage.get_sorted_person_ids(sort_by)[::-1])
+    
+    def test_birthday_and_stale_queries(self):
+        """Test the upcoming birthday and overdue contact queries"""
+        ann = Person(first_name="Ann", last_name="Lee", birth_date=date(1990, 1, 3))
+        ben = Person(first_name="Ben", last_name="Lee", birth_date=date(1985, 12, 30))
+        cy = Person(first_name="Cy", last_name="Lee", birth_date=date(1970, 6, 1))
+        dee = Person(first_name="Dee", last_name="Lee")
+        self.storage.save_persons([
+            (ann, [Conversation(date=date(2024, 1, 10))]),
+            (ben, [Conversation(date=date(2023, 5, 1))]),
+            (cy, [Conversation(date=date(2023, 8, 1))]),
+            (dee, []),
+        ])
+        
+        today = date(2024, 12, 28)
+        self.assertEqual(self.storage.upcoming_birthdays(14, today), [ben.id, ann.id])
+        self.assertEqual(self.storage.upcoming_birthdays(2, today), [])
+        self.assertEqual(self.storage.stale_contacts(date(2023, 12, 1)), [dee.id, ben.id, cy.id])
+        self.assertEqual(self.storage.stale_contacts(date(2023, 6, 1), include_never=False), [ben.id])
+        
+        self.storage.add_conversation(ben.id, Conversation(date=date(2024, 2, 1)))
+        self.assertEqual(self.storage.stale_contacts(date(2023, 12, 1), include_never=False), [cy.id])
+        
+        # Deletes, edits and compaction keep the indexes in step, and a reopened store rebuilds them
+        self.storage.delete_conversation(ann.id, 1)
+        cy.birth_date = date(1970, 12, 29)
+        self.storage.save_person(cy, [])
+        self.storage.compact()
+        self.assertEqual(self.storage.upcoming_birthdays(14, today), [cy.id, ben.id, ann.id])
+        self.assertEqual(self.storage.stale_contacts(date(2023, 12, 1)), [ann.id, cy.id, dee.id])
+        self.storage.close()
+        self.storage = PackedStorage(base_dir=self.temp_dir)
+        self.assertEqual(self.storage.upcoming_birthdays(14, today), [cy.id, ben.id, ann.id])
+        self.assertEqual(self.storage.stale_contacts(date(2023, 12, 1)), [ann.id, cy.id, dee.id])
+    
+    def test_conversation_timeline(self):
+        """Test date-range queries over the conversations of all persons"""
+        ann = Person(first_name="Ann", last_name="Lee")
+        ben = Person(first_name="Ben", last_name="Lee")
+        self.storage.save_persons([
+            (ann, [Conversation(date=date(2024, 1, 10)), Conversation(date=date(2024, 3, 5))]),
+            (ben, [Conversation(date=date(2024, 2, 1))]),
+        ])
+        
+        self.assertEqual(
+            self.storage.get_timeline(date(2024, 1, 1), date(2024, 2, 29)),
+            [TimelineEntry(date(2024, 1, 10), ann.id, 1), TimelineEntry(date(2024, 2, 1), ben.id, 1)]
+        )
+        self.assertEqual(self.storage.count_timeline(), 3)
+        self.assertEqual(self.storage.count_timeline(end=date(2024, 2, 1)), 2)
+        self.assertEqual(
+            self.storage.get_timeline(limit=2, reverse=True),
+            [TimelineEntry(date(2024, 3, 5), ann.id, 2), TimelineEntry(date(2024, 2, 1), ben.id, 1)]
+        )
+        self.assertEqual(
+            self.storage.get_timeline(offset=2, limit=2, reverse=True),
+            [TimelineEntry(date(2024, 1, 10), ann.id, 1)]
+        )
+        
+        conversation = Conversation(date=date(2024, 3, 10))
+        self.storage.add_conversation(ben.id, conversation)
+        self.assertEqual(self.storage.get_timeline(limit=1, reverse=True), [TimelineEntry(date(2024, 3, 10), ben.id, 2)])
+        
+        self.storage.update_conversation(ann.id, Conversation(id=1, date=date(2024, 4, 1), notes="Moved"))
+        self.storage.delete_conversation(ben.id, 1)
+        self.assertEqual(
+            self.storage.get_timeline(date(2024, 2, 1)),
+            [TimelineEntry(date(2024, 3, 5), ann.id, 2), TimelineEntry(date(2024, 3, 10), ben.id, 2),
+             TimelineEntry(date(2024, 4, 1), ann.id, 1)]
+        )
+    
+    def test_torn_index_entry_ignored(self):
+        """Test that a partially written index entry is skipped on open"""
+        person = Person(first_name="John", last_name="Doe")
+        self.storage.save_person(person, [])
+        self.storage.close()
+        with open(self.temp_dir / 'persons-0.idx', 'ab') as f:
+            f.write(INDEX_ENTRY.pack(2, 0, 10)[:7])
+        
+        self.storage = PackedStorage(base_dir=self.temp_dir)
+        self.assertEqual([p.id for p in self.storage.get_all_persons()], [person.id])
+    
+    def test_compact_reclaims_superseded_versions(self):
+        """Test that compaction drops old record versions and keeps the latest ones"""
+        person = Person(first_name="John", last_name="Doe")
+        self.storage.save_person(person, [])
+        for day in range(1, 11):
+            self.storage.add_conversation(person.id, Conversation(date=date(2024, 1, day), notes=f"Day {day}"))
+        self.assertGreater(self.storage.dead_bytes, 0)
+        
+        self.assertGreater(self.storage.compact(), 0)
+        self.assertEqual(self.storage.dead_bytes, 0)
+        self.assertFalse((self.temp_dir / 'persons-0.pack').exists())
+        self.storage.close()
+        
+        self.storage = PackedStorage(base_dir=self.temp_dir)
+        _, conversations = self.storage.load_person(person.id)
+        self.assertEqual(len(conversations), 10)
+    
+    def test_batch_appends_once(self):
+        """Test that a batch appends the last version of each record once, or nothing if it fails"""
+        person = Person(first_name="John", last_name="Doe")
+        with self.storage.batch() as batch:
+            self.storage.save_person(person, [])
+            for day in (1, 2, 3):
+                self.storage.add_conversation(person.id, Conversation(date=date(2024, 1, day), notes="Talk"))
+            self.assertEqual(len(self.storage.load_person(person.id)[1]), 3)
+            self.assertEqual(self.storage.dead_bytes, 0)
+        
+        self.assertEqual((batch.changes, batch.writes, batch.coalesced), (4, 1, 3))
+        self.assertEqual(self.storage.dead_bytes, 0)
+        self.assertEqual(self.storage.get_person_summary(person.id).conversation_count, 3)
+        
+        with self.assertRaises(RuntimeError):
+            with self.storage.batch():
+                self.storage.save_person(Person(first_name="Jane", last_name="Roe"), [])
+                self.storage.delete_conversation(person.id, 1)
+                raise RuntimeError("abort")
+        self.assertEqual([p.first_name for p in self.storage.get_all_persons()], ["John"])
+        self.assertEqual(len(self.storage.load_person(person.id)[1]), 3)
+
+if __name__ == '__main__':
+    unittest.main()
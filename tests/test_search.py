@@ -0,0 +1,98 @@
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+from storage import StorageManager, SearchHit
+from storage.search import SearchIndex, tokenize
+from models import Person, Conversation
+from datetime import date
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        """Create a temporary directory for the index files"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.index = SearchIndex(self.temp_dir / 'search.json', self.temp_dir / 'search.log')
+    
+    def tearDown(self):
+        """Clean up the temporary directory after tests"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_tokenize(self):
+        """Test splitting text into lowercase words"""
+        self.assertEqual(tokenize("Talked about the Q3 roadmap, café"), ["talked", "about", "the", "q3", "roadmap", "café"])
+        self.assertEqual(tokenize(None), [])
+    
+    def test_search_all_words_and_prefix(self):
+        """Test that every word must match and the last word matches as a prefix"""
+        person = Person(id=1, first_name="John", last_name="Doe", email="john@example.com")
+        self.index.index_person(person, [
+            Conversation(id=1, notes="Discussed the budget"),
+            Conversation(id=2, notes="Budget approved, discussed hiring"),
+        ])
+        
+        self.assertEqual(self.index.search("budget"), [SearchHit(1, 1), SearchHit(1, 2)])
+        self.assertEqual(self.index.search("budget hir"), [SearchHit(1, 2)])
+        self.assertEqual(self.index.search("example"), [SearchHit(1)])
+        self.assertEqual(self.index.search("missing budget"), [])
+        self.assertEqual(self.index.search("  "), [])
+    
+    def test_reindex_removes_old_words(self):
+        """Test that re-indexing a person drops words and conversations no longer present"""
+        person = Person(id=1, first_name="John", last_name="Doe")
+        self.index.index_person(person, [Conversation(id=1, notes="budget")])
+        self.index.index_person(person, [Conversation(id=2, notes="hiring")])
+        
+        self.assertEqual(self.index.search("budget"), [])
+        self.assertEqual(self.index.search("hiring"), [SearchHit(1, 2)])
+    
+    def test_journal_replayed_on_load(self):
+        """Test that journaled changes survive a reload"""
+        self.index.save()
+        self.index.index_person(Person(id=1, first_name="John"), [Conversation(id=1, notes="budget")])
+        self.index.remove_conversation(1, 1)
+        
+        index = SearchIndex(self.index.index_file, self.index.journal_file)
+        self.assertTrue(index.load())
+        self.assertEqual(index.search("john"), [SearchHit(1)])
+        self.assertEqual(index.search("budget"), [])
+        self.assertFalse(index.journal_file.exists())
+
+class TestStorageSearch(unittest.TestCase):
+    def setUp(self):
+        """Create a temporary store"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.storage = StorageManager(base_dir=self.temp_dir)
+    
+    def tearDown(self):
+        """Clean up the temporary directory after tests"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_search_follows_mutations(self):
+        """Test that saves and conversation changes keep the index current"""
+        person = Person(first_name="John", last_name="Doe", notes="Met at PyCon")
+        self.storage.save_person(person, [Conversation(date=date(2024, 1, 1), notes="Talked about sailing")])
+        conversation = Conversation(date=date(2024, 2, 1), notes="Planned the trip")
+        self.storage.add_conversation(person.id, conversation)
+        
+        self.assertEqual(self.storage.search("pycon"), [SearchHit(person.id)])
+        self.assertEqual(self.storage.search("trip"), [SearchHit(person.id, conversation.id)])
+        
+        conversation.notes = "Cancelled"
+        self.storage.update_conversation(person.id, conversation)
+        self.assertEqual(self.storage.search("trip"), [])
+        
+        self.storage.delete_conversation(person.id, 1)
+        self.assertEqual(self.storage.search("sailing"), [])
+    
+    def test_search_index_rebuilt_when_missing(self):
+        """Test that a store without a search index is re-indexed at startup"""
+        person = Person(first_name="John", last_name="Doe")
+        self.storage.save_person(person, [Conversation(date=date(2024, 1, 1), notes="sailing")])
+        (self.temp_dir / 'search.json').unlink()
+        (self.temp_dir / 'search.log').unlink(missing_ok=True)
+        
+        storage = StorageManager(base_dir=self.temp_dir)
+        self.assertEqual(storage.search("sailing"), [SearchHit(person.id, 1)])
+
+if __name__ == '__main__':
+    unittest.main()
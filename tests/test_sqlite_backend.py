@@ -0,0 +1,209 @@
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+from storage import SQLiteStorage, StorageManager, StorageBackend, SearchHit, TimelineEntry, open_storage, copy_store
+from models import Person, Conversation
+from datetime import date
+
+class TestSQLiteStorage(unittest.TestCase):
+    def setUp(self):
+        """Create a temporary database for test data"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.storage = SQLiteStorage(base_dir=self.temp_dir)
+    
+    def tearDown(self):
+        """Close the database and clean up the temporary directory"""
+        self.storage.close()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_implements_backend(self):
+        """Test that both backends satisfy the storage protocol"""
+        self.assertIsInstance(self.storage, StorageBackend)
+        self.assertIsInstance(StorageManager(base_dir=self.temp_dir), StorageBackend)
+        self.assertIsInstance(open_storage(self.temp_dir, 'sqlite'), SQLiteStorage)
+        with self.assertRaises(ValueError):
+            open_storage(self.temp_dir, 'unknown')
+    
+    def test_save_and_load_person(self):
+        """Test saving and loading a person with conversations"""
+        person = Person(first_name="John", last_name="Doe", email="john@example.com",
+                        birth_date=date(1990, 1, 1))
+        self.storage.save_person(person, [Conversation(date=date(2024, 1, 1), notes="First meeting")])
+        
+        loaded_person, conversations = self.storage.load_person(person.id)
+        self.assertEqual(loaded_person, person)
+        self.assertEqual(len(conversations), 1)
+        self.assertEqual(conversations[0].notes, "First meeting")
+        self.assertEqual(conversations[0].person_id, person.id)
+        self.assertIsNone(self.storage.load_person(999))
+    
+    def test_conversation_changes_update_summary(self):
+        """Test adding, editing and deleting conversations"""
+        person = Person(first_name="John", last_name="Doe")
+        self.storage.save_person(person, [Conversation(date=date(2024, 1, 1), notes="First")])
+        
+        second = Conversation(date=date(2024, 3, 1), notes="Second")
+        self.assertTrue(self.storage.add_conversation(person.id, second))
+        self.assertEqual(second.id, 2)
+        self.assertFalse(self.storage.add_conversation(999, Conversation()))
+        
+        summary = self.storage.get_person_summary(person.id)
+        self.assertEqual(summary.conversation_count, 2)
+        self.assertEqual(summary.last_contact, date(2024, 3, 1))
+        
+        second.notes = "Edited"
+        self.assertTrue(self.storage.update_conversation(person.id, second))
+        self.assertTrue(self.storage.delete_conversation(person.id, 1))
+        _, conversations = self.storage.load_person(person.id)
+        self.assertEqual([c.notes for c in conversations], ["Edited"])
+        self.assertEqual(self.storage.get_person_summary(person.id).conversation_count, 1)
+    
+    def test_sorted_person_ids(self):
+        """Test ordering person IDs by name and by last contact date"""
+        bob = Person(first_name="Bob", last_name="Doe")
+        alice = Person(first_name="alice", last_name="Roe")
+        carol = Person(first_name="Carol", last_name="Poe")
+        self.storage.save_persons([
+            (bob, [Conversation(date=date(2024, 5, 1))]),
+            (alice, [Conversation(date=date(2024, 1, 1))]),
+            (carol, []),
+        ])
+        
+        self.assertEqual(self.storage.get_sorted_person_ids('name'), [alice.id, bob.id, carol.id])
+        self.assertEqual(
+            self.storage.get_sorted_person_ids('date', reverse=True),
+            [bob.id, alice.id, carol.id]
+        )
+    
+    def test_birthday_and_stale_queries(self):
+        """Test the upcoming birthday and overdue contact queries"""
+        ann = Person(first_name="Ann", last_name="Lee", birth_date=date(1990, 1, 3))
+        ben = Person(first_name="Ben", last_name="Lee", birth_date=date(1985, 12, 30))
+        cy = Person(first_name="Cy", last_name="Lee", birth_date=date(1970, 6, 1))
+        dee = Person(first_name="Dee", last_name="Lee")
+        self.storage.save_persons([
+            (ann, [Conversation(date=date(2024, 1, 10))]),
+            (ben, [Conversation(date=date(2023, 5, 1))]),
+            (cy, [Conversation(date=date(2023, 8, 1))]),
+            (dee, []),
+        ])
+        
+        today = date(2024, 12, 28)
+        self.assertEqual(self.storage.upcoming_birthdays(14, today), [ben.id, ann.id])
+        self.assertEqual(self.storage.upcoming_birthdays(2, today), [])
+        self.assertEqual(self.storage.stale_contacts(date(2023, 12, 1)), [dee.id, ben.id, cy.id])
+        self.assertEqual(self.storage.stale_contacts(date(2023, 6, 1), include_never=False), [ben.id])
+        
+        self.storage.add_conversation(ben.id, Conversation(date=date(2024, 2, 1)))
+        self.assertEqual(self.storage.stale_contacts(date(2023, 12, 1), include_never=False), [cy.id])
+    
+    def test_conversation_timeline(self):
+        """Test date-range queries over the conversations of all persons"""
+        ann = Person(first_name="Ann", last_name="Lee")
+        ben = Person(first_name="Ben", last_name="Lee")
+        self.storage.save_persons([
+            (ann, [Conversation(date=date(2024, 1, 10)), Conversation(date=date(2024, 3, 5))]),
+            (ben, [Conversation(date=date(2024, 2, 1))]),
+        ])
+        
+        self.assertEqual(
+            self.storage.get_timeline(date(2024, 1, 1), date(2024, 2, 29)),
+            [TimelineEntry(date(2024, 1, 10), ann.id, 1), TimelineEntry(date(2024, 2, 1), ben.id, 1)]
+        )
+        self.assertEqual(self.storage.count_timeline(), 3)
+        self.assertEqual(self.storage.count_timeline(end=date(2024, 2, 1)), 2)
+        self.assertEqual(
+            self.storage.get_timeline(limit=2, reverse=True),
+            [TimelineEntry(date(2024, 3, 5), ann.id, 2), TimelineEntry(date(2024, 2, 1), ben.id, 1)]
+        )
+        self.assertEqual(
+            self.storage.get_timeline(offset=2, limit=2, reverse=True),
+            [TimelineEntry(date(2024, 1, 10), ann.id, 1)]
+        )
+        
+        conversation = Conversation(date=date(2024, 3, 10))
+        self.storage.add_conversation(ben.id, conversation)
+        self.assertEqual(self.storage.get_timeline(limit=1, reverse=True), [TimelineEntry(date(2024, 3, 10), ben.id, 2)])
+        
+        self.storage.update_conversation(ann.id, Conversation(id=1, date=date(2024, 4, 1), notes="Moved"))
+        self.storage.delete_conversation(ben.id, 1)
+        self.assertEqual(
+            self.storage.get_timeline(date(2024, 2, 1)),
+            [TimelineEntry(date(2024, 3, 5), ann.id, 2), TimelineEntry(date(2024, 3, 10), ben.id, 2),
+             TimelineEntry(date(2024, 4, 1), ann.id, 1)]
+        )
+    
+    def test_search(self):
+        """Test full-text search over person and conversation text"""
+        person = Person(first_name="John", last_name="Doe", notes="Met at PyCon")
+        self.storage.save_person(person, [Conversation(date=date(2024, 1, 1), notes="Talked about sailing")])
+        conversation = Conversation(date=date(2024, 2, 1), notes="Planned the sailing trip")
+        self.storage.add_conversation(person.id, conversation)
+        
+        self.assertEqual(self.storage.search("pycon"), [SearchHit(person.id)])
+        self.assertEqual(self.storage.search("sail"), [SearchHit(person.id, 1), SearchHit(person.id, 2)])
+        self.assertEqual(self.storage.search("sailing tr"), [SearchHit(person.id, 2)])
+        
+        self.storage.delete_conversation(person.id, 2)
+        self.assertEqual(self.storage.search("trip"), [])
+    
+    def test_search_large_conversation_ids(self):
+        """Test that search documents of large conversation IDs do not collide with other persons"""
+        ann = Person(first_name="Ann", last_name="Lee")
+        ben = Person(first_name="Ben", last_name="Lee")
+        self.storage.save_person(ann, [Conversation(id=(1 << 20) + 1, date=date(2024, 1, 1), notes="Kayaking")])
+        self.storage.save_person(ben, [Conversation(id=1, date=date(2024, 1, 1), notes="Climbing")])
+        
+        self.assertEqual(self.storage.search("kayaking"), [SearchHit(ann.id, (1 << 20) + 1)])
+        self.assertEqual(self.storage.search("climbing"), [SearchHit(ben.id, 1)])
+    
+    def test_search_docs_rebuilt_for_old_databases(self):
+        """Test that a database without search document keys is reindexed when opened"""
+        person = Person(first_name="John", last_name="Doe")
+        self.storage.save_person(person, [Conversation(date=date(2024, 1, 1), notes="Sailing")])
+        self.storage._conn.execute("DROP TABLE search_doc_keys")
+        self.storage._conn.commit()
+        self.storage.close()
+        
+        self.storage = SQLiteStorage(base_dir=self.temp_dir)
+        self.assertEqual(self.storage.search("sailing"), [SearchHit(person.id, 1)])
+        self.assertEqual(self.storage.search("john"), [SearchHit(person.id)])
+    
+    def test_transaction_rolls_back(self):
+        """Test that a failed transaction leaves the database unchanged"""
+        with self.assertRaises(RuntimeError):
+            with self.storage.transaction():
+                self.storage.save_person(Person(first_name="John", last_name="Doe"), [])
+                raise RuntimeError("abort")
+        self.assertEqual(self.storage.get_all_persons(), [])
+    
+    def test_batch_commits_once(self):
+        """Test that a batch groups changes into one transaction and rolls back on failure"""
+        person = Person(first_name="John", last_name="Doe")
+        with self.storage.batch() as batch:
+            self.storage.save_person(person, [])
+            self.storage.add_conversation(person.id, Conversation(date=date(2024, 1, 1), notes="Hi"))
+            self.assertTrue(self.storage._conn.in_transaction)
+        self.assertEqual((batch.changes, batch.writes, batch.coalesced), (2, 1, 1))
+        self.assertFalse(self.storage._conn.in_transaction)
+        
+        with self.assertRaises(RuntimeError):
+            with self.storage.batch() as batch:
+                self.storage.add_conversation(person.id, Conversation(date=date(2024, 2, 1), notes="Bye"))
+                raise RuntimeError("abort")
+        self.assertTrue(batch.rolled_back)
+        self.assertEqual(self.storage.get_person_summary(person.id).conversation_count, 1)
+    
+    def test_copy_from_json_store(self):
+        """Test copying a JSON store into SQLite"""
+        json_storage = StorageManager(base_dir=self.temp_dir / 'json')
+        person = Person(first_name="John", last_name="Doe")
+        json_storage.save_person(person, [Conversation(date=date(2024, 1, 1), notes="Hi")])
+        
+        self.assertEqual(copy_store(json_storage, self.storage), 1)
+        _, conversations = self.storage.load_person(person.id)
+        self.assertEqual([c.notes for c in conversations], ["Hi"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,15 @@
 import unittest
+import json
 import tempfile
 import shutil
+import threading
+import time
+from unittest.mock import patch
 from pathlib import Path
-from storage import StorageManager
+from storage import StorageManager, TimelineEntry, BACKENDS, open_storage
+from storage.write_queue import WriteBehindQueue
+from storage.sorted_index import SortedIndex
+from storage.records import record_from_dict, record_to_dict
 from models import Person, Conversation
 from datetime import date
 
@@ -10,11 +17,8 @@ class TestStorage(unittest.TestCase):
     def setUp(self):
         """Create a temporary directory for test data"""
         self.temp_dir = Path(tempfile.mkdtemp())
-        # Override the storage base directory for testing
-        self.storage = StorageManager()
-        self.storage.base_dir = self.temp_dir
-        self.storage.persons_dir = self.temp_dir / 'persons'
-        self.storage.ensure_directories()
+        # Point the storage at the temporary directory so its index is built there
+        self.storage = StorageManager(base_dir=self.temp_dir)
     
     def tearDown(self):
         """Clean up the temporary directory after tests"""
@@ -91,6 +95,479 @@ class TestStorage(unittest.TestCase):
             len({c.id for c in loaded_conversations}), 2,
             "Conversation IDs not unique"
         )
+    
+    def test_person_file_uses_shared_record_format(self):
+        """Test that person files are written and read with the record functions the other backends use"""
+        person = Person(first_name="John", last_name="Doe", birth_date=date(1990, 1, 1))
+        conversations = [Conversation(date=date(2024, 1, 1), notes="First")]
+        self.storage.save_person(person, conversations)
+        
+        data = json.loads(self.storage._get_person_path(person.id).read_text(encoding='utf-8'))
+        self.assertEqual(data, record_to_dict(person, conversations))
+        self.assertEqual(record_from_dict(data, keep_ids=True), self.storage.load_person(person.id))
+    
+    def test_index_persisted_across_instances(self):
+        """Test that a new instance reuses the saved ID index"""
+        person = Person(first_name="John", last_name="Doe")
+        self.storage.save_person(person, [])
+        self.assertTrue(self.storage.index_file.exists())
+        
+        storage = StorageManager(base_dir=self.temp_dir)
+        self.assertEqual(storage._index, self.storage._index)
+        self.assertEqual(storage._next_id, person.id + 1)
+        self.assertIsNotNone(storage.load_person(person.id))
+    
+    def test_in_place_saves_do_not_force_rescan(self):
+        """Test that after editing a person and closing, a new instance trusts the saved index"""
+        person = Person(first_name="John", last_name="Doe")
+        self.storage.save_person(person, [])
+        time.sleep(0.05)  # Let the directory's mtime move on
+        person.email = "john@example.com"
+        self.storage.save_person(person, [Conversation(date=date(2024, 1, 1))])
+        self.storage.close()
+        
+        with patch.object(StorageManager, '_build_index', side_effect=AssertionError("rescanned")):
+            storage = StorageManager(base_dir=self.temp_dir)
+        self.assertEqual(storage.load_person(person.id)[0].email, "john@example.com")
+    
+    def test_stale_index_rebuilt(self):
+        """Test that files added behind the index's back are still found"""
+        person = Person(first_name="John", last_name="Doe")
+        self.storage.save_person(person, [])
+        
+        # Write a second person with a separate instance, leaving ours stale
+        other = StorageManager(base_dir=self.temp_dir)
+        jane = Person(first_name="Jane", last_name="Roe")
+        other.save_person(jane, [])
+        
+        result = self.storage.load_person(jane.id)
+        self.assertIsNotNone(result, "Stale index did not pick up new file")
+        self.assertEqual(result[0].first_name, "Jane")
+        self.assertIsNone(self.storage.load_person(999))
+    
+    def test_rename_replaces_file(self):
+        """Test that renaming a person does not leave the old file behind"""
+        person = Person(first_name="John", last_name="Doe")
+        self.storage.save_person(person, [])
+        
+        person.last_name = "Smith"
+        self.storage.save_person(person, [])
+        
+        files = list(self.storage.persons_dir.glob('*.json'))
+        self.assertEqual([f.name for f in files], [f"SmithJohn{person.id}.json"])
+        loaded_person, _ = self.storage.load_person(person.id)
+        self.assertEqual(loaded_person.last_name, "Smith")
+    
+    def test_person_summaries(self):
+        """Test that summaries reflect saved persons and added conversations"""
+        person = Person(first_name="John", last_name="Doe")
+        self.storage.save_person(person, [Conversation(date=date(2024, 1, 1), notes="First")])
+        self.storage.add_conversation(person.id, Conversation(date=date(2024, 3, 1), notes="Second"))
+        
+        summaries = self.storage.get_person_summaries()
+        self.assertEqual(len(summaries), 1)
+        summary = summaries[0]
+        self.assertEqual(summary.id, person.id)
+        self.assertEqual(summary.full_name, "John Doe")
+        self.assertEqual(summary.last_contact, date(2024, 3, 1))
+        self.assertEqual(summary.conversation_count, 2)
+        self.assertEqual(self.storage.get_person_summary(person.id), summary)
+        self.assertIsNone(self.storage.get_person_summary(999))
+    
+    def test_catalog_persisted_and_rebuilt(self):
+        """Test that the catalog is reloaded from disk and rebuilt when missing"""
+        person = Person(first_name="John", last_name="Doe")
+        self.storage.save_person(person, [Conversation(date=date(2024, 1, 1))])
+        
+        storage = StorageManager(base_dir=self.temp_dir)
+        self.assertEqual(storage.get_person_summaries(), self.storage.get_person_summaries())
+        
+        storage.catalog_file.unlink()
+        storage = StorageManager(base_dir=self.temp_dir)
+        summaries = storage.get_person_summaries()
+        self.assertEqual(len(summaries), 1)
+        self.assertEqual(summaries[0].last_contact, date(2024, 1, 1))
+    
+    def test_sorted_person_ids(self):
+        """Test ordering person IDs by name and by last contact date"""
+        bob = Person(first_name="Bob", last_name="Doe")
+        alice = Person(first_name="alice", last_name="Roe")
+        carol = Person(first_name="Carol", last_name="Poe")
+        self.storage.save_person(bob, [Conversation(date=date(2024, 5, 1))])
+        self.storage.save_person(alice, [Conversation(date=date(2024, 1, 1))])
+        self.storage.save_person(carol, [])
+        
+        self.assertEqual(self.storage.get_sorted_person_ids('name'), [alice.id, bob.id, carol.id])
+        self.assertEqual(
+            self.storage.get_sorted_person_ids('date', reverse=True),
+            [bob.id, alice.id, carol.id]
+        )
+    
+    def test_add_conversation_appends_to_log(self):
+        """Test that adding a conversation leaves the person file untouched"""
+        person = Person(first_name="John", last_name="Doe")
+        self.storage.save_person(person, [Conversation(date=date(2024, 1, 1), notes="First")])
+        file_path = self.storage.persons_dir / self.storage._get_file_name(person)
+        original = file_path.read_bytes()
+        
+        self.storage.add_conversation(person.id, Conversation(date=date(2024, 2, 1), notes="Second"))
+        self.assertEqual(file_path.read_bytes(), original)
+        self.assertTrue(self.storage._log_path(person.id).exists())
+        
+        _, conversations = StorageManager(base_dir=self.temp_dir).load_person(person.id)
+        self.assertEqual([c.notes for c in conversations], ["First", "Second"])
+    
+    def test_update_and_delete_conversation(self):
+        """Test that logged edits and deletes are merged on load"""
+        person = Person(first_name="John", last_name="Doe")
+        first = Conversation(date=date(2024, 1, 1), notes="First")
+        second = Conversation(date=date(2024, 2, 1), notes="Second")
+        self.storage.save_person(person, [first, second])
+        
+        first.notes = "Edited"
+        self.assertTrue(self.storage.update_conversation(person.id, first))
+        self.assertTrue(self.storage.delete_conversation(person.id, second.id))
+        
+        _, conversations = self.storage.load_person(person.id)
+        self.assertEqual([(c.id, c.notes) for c in conversations], [(first.id, "Edited")])
+        summary = self.storage.get_person_summary(person.id)
+        self.assertEqual(summary.conversation_count, 1)
+        self.assertEqual(summary.last_contact, date(2024, 1, 1))
+    
+    def test_unknown_conversation_is_rejected(self):
+        """Test that every backend refuses to update or delete a conversation that does not exist"""
+        cases = [(backend, None) for backend in sorted(BACKENDS)] + [('json', 60)]
+        for backend, write_delay in cases:
+            with self.subTest(backend=backend, write_delay=write_delay):
+                storage = open_storage(self.temp_dir / f"{backend}_{write_delay}", backend, write_delay)
+                person = Person(first_name="John", last_name="Doe")
+                storage.save_person(person, [Conversation(date=date(2024, 1, 1), notes="First")])
+                storage.add_conversation(person.id, Conversation(date=date(2024, 2, 1), notes="Second"))
+                
+                self.assertFalse(storage.update_conversation(person.id, Conversation(id=42, date=date(2024, 3, 1))))
+                self.assertFalse(storage.delete_conversation(person.id, 42))
+                self.assertFalse(storage.delete_conversation(99, 1))
+                self.assertTrue(storage.update_conversation(person.id, Conversation(id=2, date=date(2024, 2, 2))))
+                
+                storage.close()
+                storage = open_storage(self.temp_dir / f"{backend}_{write_delay}", backend)
+                self.assertEqual([c.id for c in storage.load_person(person.id)[1]], [1, 2])
+                summary = storage.get_person_summary(person.id)
+                self.assertEqual((summary.conversation_count, summary.last_contact), (2, date(2024, 2, 2)))
+                storage.close()
+    
+    def test_compact_conversations(self):
+        """Test that compaction folds the log into the person file"""
+        person = Person(first_name="John", last_name="Doe")
+        self.storage.save_person(person, [])
+        self.storage.add_conversation(person.id, Conversation(date=date(2024, 1, 1), notes="First"))
+        
+        self.assertEqual(self.storage.compact_all(), 1)
+        self.assertFalse(self.storage._log_path(person.id).exists())
+        _, conversations = self.storage.load_person(person.id)
+        self.assertEqual([c.notes for c in conversations], ["First"])
+    
+    def test_catalog_journal_replayed(self):
+        """Test that journaled catalog rows survive a restart"""
+        person = Person(first_name="John", last_name="Doe")
+        self.storage.save_person(person, [])
+        self.storage.add_conversation(person.id, Conversation(date=date(2024, 1, 1)))
+        self.assertTrue(self.storage.catalog_log_file.exists())
+        
+        storage = StorageManager(base_dir=self.temp_dir)
+        self.assertEqual(storage.get_person_summary(person.id).conversation_count, 1)
+        self.assertFalse(storage.catalog_log_file.exists())
+
+    def test_migrate_to_sharded_layout(self):
+        """Test moving files into ID buckets and back without losing data"""
+        for name in ("Alice", "Bob", "Carol"):
+            self.storage.save_person(Person(first_name=name, last_name="Smith"), [])
+        self.storage.add_conversation(2, Conversation(date=date(2024, 3, 1), notes="Lunch"))
+        
+        self.assertEqual(self.storage.migrate_layout('sharded', shard_size=2), 3)
+        self.assertTrue((self.temp_dir / 'persons' / '000000' / 'SmithAlice1.json').exists())
+        self.assertTrue((self.temp_dir / 'persons' / '000001' / 'SmithBob2.json').exists())
+        
+        # New saves go into their bucket, and a fresh instance reads the settings and index
+        self.storage.save_person(Person(first_name="Dave", last_name="Smith"), [])
+        reopened = StorageManager(base_dir=self.temp_dir)
+        self.assertEqual(reopened.settings.layout, 'sharded')
+        self.assertTrue((self.temp_dir / 'persons' / '000002' / 'SmithDave4.json').exists())
+        self.assertEqual(len(reopened.get_all_persons()), 4)
+        self.assertEqual(reopened.load_person(2)[1][0].notes, "Lunch")
+        
+        self.assertEqual(reopened.migrate_layout('flat'), 4)
+        self.assertEqual([p for p in (self.temp_dir / 'persons').iterdir() if p.is_dir()], [])
+        self.assertEqual(StorageManager(base_dir=self.temp_dir).load_person(4)[0].first_name, "Dave")
+    
+    def test_migrate_compression(self):
+        """Test compressing person files in place and reading them back transparently"""
+        notes = "Talked about the garden " * 50
+        for name in ("Alice", "Bob"):
+            self.storage.save_person(Person(first_name=name, last_name="Smith"),
+                                     [Conversation(date=date(2024, 1, 1), notes=notes)])
+        self.storage.add_conversation(1, Conversation(date=date(2024, 2, 1), notes="Logged"))
+        plain_size = self.storage._get_person_path(1).stat().st_size
+        
+        self.assertEqual(self.storage.migrate_compression('gzip'), 2)
+        self.assertEqual(self.storage.migrate_compression('gzip'), 0)
+        file_path = self.temp_dir / 'persons' / 'SmithAlice1.json'
+        self.assertEqual(file_path.read_bytes()[:2], b'\x1f\x8b')
+        self.assertLess(file_path.stat().st_size, plain_size / 5)
+        
+        # New saves follow the setting, and every read path decompresses
+        self.storage.save_person(Person(first_name="Carol", last_name="Smith"), [])
+        reopened = StorageManager(base_dir=self.temp_dir)
+        self.assertEqual(reopened.settings.compression, 'gzip')
+        self.assertEqual(reopened._get_person_path(3).read_bytes()[:2], b'\x1f\x8b')
+        self.assertEqual([c.notes for c in reopened.load_person(1)[1]], [notes, "Logged"])
+        self.assertEqual([p.first_name for p in reopened.get_all_persons()], ["Alice", "Bob", "Carol"])
+        
+        self.assertEqual(reopened.migrate_compression('none'), 3)
+        self.assertTrue(file_path.read_text(encoding='utf-8').startswith('{'))
+        self.assertEqual(StorageManager(base_dir=self.temp_dir).load_person(2)[1][0].notes, notes)
+        with self.assertRaises(ValueError):
+            reopened.migrate_compression('zip')
+    
+    def test_get_all_persons_parallel(self):
+        """Test that parallel reads keep ID order and skip a corrupt file"""
+        for name in ("Carol", "Alice", "Bob", "Dave"):
+            self.storage.save_person(Person(first_name=name, last_name="Smith"),
+                                     [Conversation(date=date(2024, 1, 1), notes="x" * 100)])
+        self.storage._get_person_path(3).write_text("{not json", encoding='utf-8')
+        
+        persons = self.storage.get_all_persons(workers=4)
+        self.assertEqual([p.first_name for p in persons], ["Carol", "Alice", "Dave"])
+        self.assertEqual(list(self.storage.read_errors), [3])
+        self.assertEqual(self.storage.get_all_persons(workers=1), persons)
+        
+        # Large files parsed in a worker process give the same persons
+        self.storage.DECODE_PROCESS_BYTES = 100
+        self.assertEqual(self.storage.get_all_persons(workers=2, decode_processes=1), persons)
+    
+    def test_birthday_and_stale_queries(self):
+        """Test the upcoming birthday and overdue contact queries"""
+        ann = Person(first_name="Ann", last_name="Lee", birth_date=date(1990, 1, 3))
+        ben = Person(first_name="Ben", last_name="Lee", birth_date=date(1985, 12, 30))
+        cy = Person(first_name="Cy", last_name="Lee", birth_date=date(1970, 6, 1))
+        dee = Person(first_name="Dee", last_name="Lee")
+        self.storage.save_persons([
+            (ann, [Conversation(date=date(2024, 1, 10))]),
+            (ben, [Conversation(date=date(2023, 5, 1))]),
+            (cy, [Conversation(date=date(2023, 8, 1))]),
+            (dee, []),
+        ])
+        
+        today = date(2024, 12, 28)
+        self.assertEqual(self.storage.upcoming_birthdays(14, today), [ben.id, ann.id])
+        self.assertEqual(self.storage.upcoming_birthdays(2, today), [])
+        self.assertEqual(self.storage.stale_contacts(date(2023, 12, 1)), [dee.id, ben.id, cy.id])
+        self.assertEqual(self.storage.stale_contacts(date(2023, 6, 1), include_never=False), [ben.id])
+        
+        self.storage.add_conversation(ben.id, Conversation(date=date(2024, 2, 1)))
+        self.assertEqual(self.storage.stale_contacts(date(2023, 12, 1), include_never=False), [cy.id])
+    
+    def test_conversation_timeline(self):
+        """Test date-range queries over the conversations of all persons"""
+        ann = Person(first_name="Ann", last_name="Lee")
+        ben = Person(first_name="Ben", last_name="Lee")
+        self.storage.save_persons([
+            (ann, [Conversation(date=date(2024, 1, 10)), Conversation(date=date(2024, 3, 5))]),
+            (ben, [Conversation(date=date(2024, 2, 1))]),
+        ])
+        
+        self.assertEqual(
+            self.storage.get_timeline(date(2024, 1, 1), date(2024, 2, 29)),
+            [TimelineEntry(date(2024, 1, 10), ann.id, 1), TimelineEntry(date(2024, 2, 1), ben.id, 1)]
+        )
+        self.assertEqual(self.storage.count_timeline(), 3)
+        self.assertEqual(self.storage.count_timeline(end=date(2024, 2, 1)), 2)
+        self.assertEqual(
+            self.storage.get_timeline(limit=2, reverse=True),
+            [TimelineEntry(date(2024, 3, 5), ann.id, 2), TimelineEntry(date(2024, 2, 1), ben.id, 1)]
+        )
+        self.assertEqual(
+            self.storage.get_timeline(offset=2, limit=2, reverse=True),
+            [TimelineEntry(date(2024, 1, 10), ann.id, 1)]
+        )
+        
+        conversation = Conversation(date=date(2024, 3, 10))
+        self.storage.add_conversation(ben.id, conversation)
+        self.assertEqual(self.storage.get_timeline(limit=1, reverse=True), [TimelineEntry(date(2024, 3, 10), ben.id, 2)])
+        
+        self.storage.update_conversation(ann.id, Conversation(id=1, date=date(2024, 4, 1), notes="Moved"))
+        self.storage.delete_conversation(ben.id, 1)
+        self.assertEqual(
+            self.storage.get_timeline(date(2024, 2, 1)),
+            [TimelineEntry(date(2024, 3, 5), ann.id, 2), TimelineEntry(date(2024, 3, 10), ben.id, 2),
+             TimelineEntry(date(2024, 4, 1), ann.id, 1)]
+        )
+    
+    def test_timeline_persisted_and_rebuilt(self):
+        """Test that the timeline is reloaded from disk and rebuilt when it no longer matches"""
+        person = Person(first_name="Ann", last_name="Lee")
+        self.storage.save_person(person, [Conversation(date=date(2024, 1, 10))])
+        self.storage.add_conversation(person.id, Conversation(date=date(2024, 2, 1)))
+        expected = self.storage.get_timeline()
+        
+        self.assertEqual(StorageManager(base_dir=self.temp_dir).get_timeline(), expected)
+        (self.temp_dir / 'timeline.json').unlink()
+        (self.temp_dir / 'timeline.log').unlink(missing_ok=True)
+        self.assertEqual(StorageManager(base_dir=self.temp_dir).get_timeline(), expected)
+    
+    def test_sort_indexes_follow_changes(self):
+        """Test that a new conversation or a rename repositions the person in the sorted orders"""
+        alice = Person(first_name="Alice", last_name="Roe")
+        bob = Person(first_name="bob", last_name="Doe")
+        self.storage.save_person(alice, [Conversation(date=date(2024, 1, 1))])
+        self.storage.save_person(bob, [Conversation(date=date(2024, 2, 1))])
+        self.assertEqual(self.storage.get_sorted_person_ids('date', reverse=True), [bob.id, alice.id])
+        
+        self.storage.add_conversation(alice.id, Conversation(date=date(2024, 3, 1)))
+        self.assertEqual(self.storage.get_sorted_person_ids('date', reverse=True), [alice.id, bob.id])
+        
+        alice.first_name = "Zoe"
+        self.storage.save_person(alice, self.storage.load_person(alice.id)[1])
+        self.assertEqual(self.storage.get_sorted_person_ids('name'), [bob.id, alice.id])
+        self.assertEqual(StorageManager(base_dir=self.temp_dir).get_sorted_person_ids('name'), [bob.id, alice.id])
+    
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        """Create a temporary directory for test data"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.storage = StorageManager(base_dir=self.temp_dir)
+    
+    def tearDown(self):
+        """Clean up the temporary directory after tests"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_changes_written_once_on_exit(self):
+        """Test that a batch holds every write until it ends and writes each touched file once"""
+        existing = Person(first_name="Ann", last_name="Lee")
+        self.storage.save_person(existing, [Conversation(date=date(2024, 1, 1), notes="First")])
+        
+        with self.storage.batch() as batch:
+            person = Person(first_name="John", last_name="Doe")
+            self.storage.save_person(person, [])
+            for day in (2, 3, 4):
+                self.storage.add_conversation(person.id, Conversation(date=date(2024, 1, day), notes="Talk"))
+                self.storage.add_conversation(existing.id, Conversation(date=date(2024, 2, day), notes="Call"))
+            
+            # Nothing reaches the disk yet, but reads see the held changes
+            self.assertEqual(len(list(self.temp_dir.glob('persons/*.json'))), 1)
+            self.assertFalse(self.storage._log_path(existing.id).exists())
+            self.assertEqual(len(self.storage.load_person(person.id)[1]), 3)
+            self.assertEqual(len(self.storage.load_person(existing.id)[1]), 4)
+        
+        self.assertEqual((batch.changes, batch.writes, batch.coalesced), (7, 2, 5))
+        self.assertEqual(len(self.storage._log_path(existing.id).read_text().splitlines()), 3)
+        
+        reopened = StorageManager(base_dir=self.temp_dir)
+        self.assertEqual(len(reopened.load_person(person.id)[1]), 3)
+        self.assertEqual(reopened.get_person_summary(existing.id).conversation_count, 4)
+        self.assertEqual(reopened.count_timeline(), 7)
+        self.assertEqual({hit.person_id for hit in reopened.search("call")}, {existing.id})
+    
+    def test_rolled_back_on_exception(self):
+        """Test that a failed batch leaves the store as it was"""
+        person = Person(first_name="Ann", last_name="Lee")
+        self.storage.save_person(person, [Conversation(date=date(2024, 1, 1), notes="First")])
+        
+        with self.assertRaises(RuntimeError):
+            with self.storage.batch() as batch:
+                self.storage.save_person(Person(first_name="John", last_name="Doe"), [])
+                self.storage.add_conversation(person.id, Conversation(date=date(2024, 3, 1), notes="Later"))
+                person.first_name = "Zoe"
+                self.storage.save_person(person, self.storage.load_person(person.id)[1])
+                raise RuntimeError("abort")
+        
+        self.assertTrue(batch.rolled_back)
+        for storage in (self.storage, StorageManager(base_dir=self.temp_dir)):
+            self.assertEqual([p.first_name for p in storage.get_all_persons()], ["Ann"])
+            self.assertEqual(storage.get_person_summary(person.id).conversation_count, 1)
+            self.assertEqual(storage.get_sorted_person_ids('name'), [person.id])
+            self.assertEqual(storage.search("later"), [])
+            self.assertEqual(storage.count_timeline(), 1)
+    
+class TestWriteBehind(unittest.TestCase):
+    def setUp(self):
+        """Create a store whose queue only writes when flushed explicitly"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.storage = StorageManager(base_dir=self.temp_dir, write_delay=60)
+    
+    def tearDown(self):
+        """Drop queued writes and clean up the temporary directory"""
+        self.storage._write_queue.take_all()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_saves_coalesced_until_flush(self):
+        """Test that repeated saves are held and written once"""
+        person = Person(first_name="John", last_name="Doe", notes="First")
+        self.storage.save_person(person, [])
+        person.notes = "Second"
+        self.storage.save_person(person, [])
+        
+        file_path = self.storage.persons_dir / self.storage._get_file_name(person)
+        self.assertFalse(file_path.exists())
+        self.assertEqual(self.storage._write_queue.coalesced, 1)
+        self.assertEqual(self.storage.load_person(person.id)[0].notes, "Second")
+        
+        self.assertEqual(self.storage.flush(), 1)
+        self.assertTrue(file_path.exists())
+        self.assertEqual(list(self.storage.persons_dir.glob('*.tmp')), [])
+        loaded_person, _ = StorageManager(base_dir=self.temp_dir).load_person(person.id)
+        self.assertEqual(loaded_person.notes, "Second")
+    
+    def test_conversation_folded_into_queued_record(self):
+        """Test that conversation changes join a queued record instead of the log"""
+        person = Person(first_name="John", last_name="Doe")
+        self.storage.save_person(person, [])
+        self.assertTrue(self.storage.add_conversation(person.id, Conversation(date=date(2024, 1, 1), notes="Hi")))
+        self.assertFalse(self.storage._log_path(person.id).exists())
+        
+        self.storage.flush()
+        _, conversations = StorageManager(base_dir=self.temp_dir).load_person(person.id)
+        self.assertEqual([c.notes for c in conversations], ["Hi"])
+    
+    def test_rename_while_queued(self):
+        """Test that the file written before a queued rename is removed on flush"""
+        person = Person(first_name="John", last_name="Doe")
+        self.storage.save_person(person, [])
+        self.storage.flush()
+        
+        person.last_name = "Smith"
+        self.storage.save_person(person, [])
+        person.last_name = "Jones"
+        self.storage.save_person(person, [])
+        self.storage.flush()
+        
+        files = [f.name for f in self.storage.persons_dir.glob('*.json')]
+        self.assertEqual(files, [f"JonesJohn{person.id}.json"])
+    
+    def test_queue_flushes_after_delay(self):
+        """Test that the queue calls back once the delay has passed"""
+        flushed = threading.Event()
+        queue = WriteBehindQueue(0.01, flushed.set)
+        queue.put(1, "first")
+        queue.put(1, "second")
+        
+        self.assertTrue(flushed.wait(5))
+        self.assertEqual(queue.take_all(), {1: "second"})
+        self.assertEqual(queue.coalesced, 1)
+
+class TestSortedIndex(unittest.TestCase):
+    def test_update_repositions_one_entry(self):
+        """Test inserting, moving and removing entries"""
+        index = SortedIndex(lambda row: row['key'])
+        index.rebuild({1: {'key': 'b'}, 2: {'key': 'a'}, 3: {'key': 'b'}})
+        self.assertEqual(index.ids(), [2, 1, 3])
+        self.assertEqual(index.ids(reverse=True), [3, 1, 2])
+        
+        index.update(2, {'key': 'c'})
+        index.update(4, {'key': 'a'})
+        index.remove(1)
+        self.assertEqual(index.ids(), [4, 3, 2])
+        self.assertEqual(len(index), 3)
 
 if __name__ == '__main__':
-    unittest.main() 
\ No newline at end of file
+    unittest.main() 
@@ -1,4 +1,14 @@
-from .main_window import MainWindow
-from .person_dialog import PersonDialog
+import importlib
 
-__all__ = ['MainWindow', 'PersonDialog']
\ No newline at end of file
+# Submodules are imported on first access so that importing one view does not load them all
+_EXPORTS = {
+    'MainWindow': '.main_window',
+    'PersonDialog': '.person_dialog',
+}
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__all__ = ['MainWindow', 'PersonDialog']
@@ -0,0 +1,89 @@
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, pyqtSignal
+from models import Conversation
+from typing import List, Optional
+
+class ConversationListModel(QAbstractListModel):
+    """List model over a person's conversations, newest first, exposed a page at a time"""
+    notesChanged = pyqtSignal(Conversation)  # Emitted when notes are edited in place
+    
+    DateRole = Qt.ItemDataRole.UserRole + 1
+    NotesRole = Qt.ItemDataRole.UserRole + 2
+    
+    PAGE_SIZE = 50
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._conversations: List[Conversation] = []
+        self._dates: List[str] = []
+        self._loaded = 0
+    
+    def set_conversations(self, conversations: List[Conversation]):
+        """Show the given conversations in reverse chronological order"""
+        self.beginResetModel()
+        self._conversations = sorted(conversations, key=lambda c: c.date, reverse=True)
+        self._dates = []
+        self._loaded = min(self.PAGE_SIZE, len(self._conversations))
+        self._format_dates()
+        self.endResetModel()
+    
+    def _format_dates(self):
+        """Format the date headers for every row that has been loaded"""
+        for conv in self._conversations[len(self._dates):self._loaded]:
+            self._dates.append(conv.date.strftime("%Y-%m-%d"))
+    
+    def conversation(self, index: QModelIndex) -> Optional[Conversation]:
+        """Return the conversation shown at the given index"""
+        if not index.isValid():
+            return None
+        return self._conversations[index.row()]
+    
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._loaded
+    
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._loaded < len(self._conversations)
+    
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.PAGE_SIZE, len(self._conversations) - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self._format_dates()
+        self.endInsertRows()
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < self._loaded:
+            return None
+        
+        row = index.row()
+        if role == self.DateRole:
+            return self._dates[row]
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole, self.NotesRole):
+            return self._conversations[row].notes
+        return None
+    
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return super().flags(index) | Qt.ItemFlag.ItemIsEditable
+    
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        
+        conversation = self._conversations[index.row()]
+        new_notes = value.strip()
+        if new_notes == conversation.notes:
+            return False
+        
+        conversation.notes = new_notes
+        self.dataChanged.emit(index, index)
+        self.notesChanged.emit(conversation)
+        return True
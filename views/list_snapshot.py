@@ -0,0 +1,50 @@
+from datetime import date
+from pathlib import Path
+from typing import List, Optional
+from models import PersonSummary
+from storage.fileio import read_json, write_json_atomic
+
+SNAPSHOT_VERSION = 1
+
+def load_list_snapshot(path: Path) -> Optional[tuple[str, bool, List[PersonSummary]]]:
+    """Read the sort and first page of the person list saved by the last session, if any"""
+    try:
+        data = read_json(path)
+        if data.get('version') != SNAPSHOT_VERSION:
+            return None
+        summaries = [
+            PersonSummary(
+                id=row['id'],
+                first_name=row['first_name'],
+                last_name=row['last_name'],
+                last_contact=date.fromisoformat(row['last_contact']) if row['last_contact'] else None,
+                conversation_count=row['conversation_count']
+            )
+            for row in data['rows']
+        ]
+        return data['sort_by'], data['reverse'], summaries
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+def save_list_snapshot(path: Path, sort_by: str, reverse: bool, summaries: List[PersonSummary]) -> None:
+    """Save the list sort and first page so the next start can show them before the store is open"""
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "sort_by": sort_by,
+        "reverse": reverse,
+        "rows": [
+            {
+                "id": summary.id,
+                "first_name": summary.first_name,
+                "last_name": summary.last_name,
+                "last_contact": summary.last_contact.isoformat() if summary.last_contact else None,
+                "conversation_count": summary.conversation_count
+            }
+            for summary in summaries
+        ]
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_json_atomic(path, data)
+    except OSError as e:
+        print(f"Error saving list snapshot: {str(e)}")
@@ -0,0 +1,52 @@
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+from storage import open_storage
+
+class StoreLoaderSignals(QObject):
+    """Signals emitted by a StoreLoader; every signal carries the load generation"""
+    opened = pyqtSignal(int, object)           # generation, storage
+    batchLoaded = pyqtSignal(int, list)        # generation, person IDs
+    progress = pyqtSignal(int, int, int)       # generation, loaded, total
+    finished = pyqtSignal(int)                 # generation
+    failed = pyqtSignal(int, str)              # generation, error message
+
+class StoreLoader(QRunnable):
+    """Opens the store if needed and streams the sorted person IDs in batches off the GUI thread
+    
+    Summaries are not read here; the list model fetches them a page at a
+    time as rows are shown.
+    A loader stops early once is_current(generation) returns False, which
+    happens when a newer reload has replaced it.
+    """
+    BATCH_SIZE = 500
+    
+    def __init__(self, generation: int, is_current, storage=None, sort_by: str = 'date', reverse: bool = True,
+                 write_delay: float = None):
+        super().__init__()
+        self.write_delay = write_delay
+        self.generation = generation
+        self.is_current = is_current
+        self.storage = storage
+        self.sort_by = sort_by
+        self.reverse = reverse
+        self.signals = StoreLoaderSignals()
+    
+    def run(self):
+        try:
+            if self.storage is None:
+                self.storage = open_storage(write_delay=self.write_delay)
+                self.signals.opened.emit(self.generation, self.storage)
+            
+            person_ids = self.storage.get_sorted_person_ids(self.sort_by, self.reverse)
+            total = len(person_ids)
+            self.signals.progress.emit(self.generation, 0, total)
+            
+            for start in range(0, total, self.BATCH_SIZE):
+                if not self.is_current(self.generation):
+                    return
+                batch_ids = person_ids[start:start + self.BATCH_SIZE]
+                self.signals.batchLoaded.emit(self.generation, batch_ids)
+                self.signals.progress.emit(self.generation, start + len(batch_ids), total)
+            
+            self.signals.finished.emit(self.generation)
+        except Exception as e:
+            self.signals.failed.emit(self.generation, str(e))
@@ -3,42 +3,35 @@ from PyQt6.QtWidgets import (
     QWidget, 
     QVBoxLayout, 
     QHBoxLayout, 
-    QListWidget,
-    QListWidgetItem,
+    QListView,
     QStackedWidget,
     QMessageBox,
     QStyledItemDelegate,
     QStyleOptionViewItem,
     QStyle,
     QToolButton,
-    QButtonGroup
+    QButtonGroup,
+    QLineEdit,
+    QProgressBar,
+    QComboBox
 )
-from PyQt6.QtCore import Qt, QRect, QSize
+from datetime import date, timedelta
+from pathlib import Path
+from PyQt6.QtCore import Qt, QRect, QSize, QTimer, QThreadPool
 from PyQt6.QtGui import QFont, QPalette, QColor, QIcon
-from datetime import date
 from models import Person
-from .person_dialog import PersonDialog
-from .conversation_dialog import ConversationDialog
-from storage import StorageManager
-from .person_view import PersonView
+from .person_list_model import PersonListModel
+from .loader import StoreLoader
+from .list_snapshot import load_list_snapshot, save_list_snapshot
 
 class PersonItemDelegate(QStyledItemDelegate):
     def paint(self, painter, option, index):
         if not index.isValid():
             return
         
-        # Get person and their conversations
-        person = index.data(Qt.ItemDataRole.UserRole)
-        result = self.parent().storage.load_person(person.id)
-        if not result:
-            return
-        
-        _, conversations = result
-        
-        # Find the most recent conversation
-        last_conversation = None
-        if conversations:
-            last_conversation = max(conversations, key=lambda c: c.date)
+        # Display data is precomputed by the model, so painting never touches storage
+        full_name = index.data(PersonListModel.FullNameRole)
+        last_contact = index.data(PersonListModel.LastContactRole)
         
         # Prepare the rectangle for drawing
         rect = option.rect
@@ -57,10 +50,10 @@ class PersonItemDelegate(QStyledItemDelegate):
         
         text_rect = QRect(rect.left() + 5, rect.top() + 5, 
                          rect.width() - 10, rect.height() // 2)
-        painter.drawText(text_rect, Qt.AlignmentFlag.AlignLeft, person.full_name)
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignLeft, full_name)
         
         # Draw the last conversation date if exists
-        if last_conversation:
+        if last_contact:
             date_font = QFont(option.font)
             date_font.setPointSize(8)
             painter.setFont(date_font)
@@ -70,20 +63,30 @@ class PersonItemDelegate(QStyledItemDelegate):
             
             date_rect = QRect(rect.left() + 5, text_rect.bottom(), 
                             rect.width() - 10, rect.height() // 2 - 5)
-            date_text = f"Last contact: {last_conversation.date.strftime('%Y-%m-%d')}"
-            painter.drawText(date_rect, Qt.AlignmentFlag.AlignLeft, date_text)
+            painter.drawText(date_rect, Qt.AlignmentFlag.AlignLeft, last_contact)
     
     def sizeHint(self, option, index):
         return QSize(option.rect.width(), 50)  # Fixed height for each item
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    SAVE_DELAY = 0.5  # Seconds edits are held so repeated saves of a person are written once
+    BIRTHDAY_DAYS = 14  # Window of the upcoming birthdays view
+    STALE_DAYS = 90  # Contacts not talked to for this long are listed as overdue
+    
+    def __init__(self, storage=None, snapshot_file: Path = None):
         super().__init__()
         self.setWindowTitle("LKIT")
         self.setMinimumSize(800, 600)
         
-        # Initialize storage first
-        self.storage = StorageManager()
+        # Unless a store is passed in, it is opened by the first background load (backend chosen by LKIT_STORAGE)
+        self.storage = storage
+        self._load_generation = 0
+        self._loading = False
+        self._opening = False
+        
+        # Sort and first page of the list from the last session, shown until the store is loaded
+        base_dir = getattr(storage, 'base_dir', None) or Path.home() / '.lkit'
+        self.snapshot_file = snapshot_file or base_dir / 'list_snapshot.json'
         
         # Add sort type tracking
         self.sort_by_date = True  # Default to date sorting
@@ -142,15 +145,54 @@ class MainWindow(QMainWindow):
         toolbar.addWidget(self.order_button)
         toolbar.addStretch()
         
+        # Search box; queries run shortly after typing stops
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search names, notes, conversations...")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.setMaximumWidth(250)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(self.apply_search)
+        self.search_box.textChanged.connect(self.search_timer.start)
+        
+        # Views narrowing the list to upcoming birthdays or overdue contacts
+        self.view_filter = QComboBox()
+        self.view_filter.setMaximumWidth(250)
+        self.view_filter.addItem("All contacts", None)
+        self.view_filter.addItem(f"Birthdays in the next {self.BIRTHDAY_DAYS} days", 'birthdays')
+        self.view_filter.addItem(f"Not contacted for {self.STALE_DAYS} days", 'stale')
+        self.view_filter.currentIndexChanged.connect(self.apply_search)
+        
         # Create the person list
-        self.person_list = QListWidget()
+        self.person_model = PersonListModel(self.storage, self)
+        self.person_list = QListView()
+        self.person_list.setModel(self.person_model)
         self.person_list.setMaximumWidth(250)
         self.person_list.setItemDelegate(PersonItemDelegate(self))
+        self.person_list.setUniformItemSizes(True)
         self.person_list.setSpacing(2)
         self.person_list.setAlternatingRowColors(True)
         
+        snapshot = load_list_snapshot(self.snapshot_file)
+        if snapshot is not None:
+            sort_by, self.reverse_sort, summaries = snapshot
+            self.sort_by_date = sort_by == 'date'
+            self._update_sort_buttons()
+            self.person_model.show_snapshot(sort_by, self.reverse_sort, summaries)
+        
+        # Progress of background loads, hidden when idle
+        self.load_progress = QProgressBar()
+        self.load_progress.setMaximumWidth(250)
+        self.load_progress.setMaximumHeight(12)
+        self.load_progress.setTextVisible(False)
+        self.load_progress.hide()
+        
         # Add widgets to left layout
         left_layout.addLayout(toolbar)
+        left_layout.addWidget(self.search_box)
+        left_layout.addWidget(self.view_filter)
+        left_layout.addWidget(self.load_progress)
         left_layout.addWidget(self.person_list)
         
         # Create the right panel (will contain stacked widgets for different views)
@@ -163,16 +205,23 @@ class MainWindow(QMainWindow):
         # Setup the menu bar
         self._create_menu_bar()
         
-        # Load existing persons
-        self.load_persons()
-        
         # Connect list selection
-        self.person_list.itemSelectionChanged.connect(self.on_person_selected)
+        self.person_list.selectionModel().selectionChanged.connect(self.on_person_selected)
+        
+        # The person view is built when the first person is selected
+        self.person_view = None
         
-        # Create and add person view to right panel
-        self.person_view = PersonView(self.storage)
-        self.person_view.conversationAdded.connect(self.on_conversation_added)
-        self.right_panel.addWidget(self.person_view)
+        # Open the store and load existing persons in the background
+        self.load_persons()
+    
+    def closeEvent(self, event):
+        """Remember the list for the next start and write any queued changes before the window closes"""
+        first_page = self.person_model.first_page()
+        if first_page:
+            save_list_snapshot(self.snapshot_file, self._sort_key(), self.reverse_sort, first_page)
+        if self.storage is not None:
+            self.storage.close()
+        super().closeEvent(event)
     
     def _create_menu_bar(self):
         """Create the main window's menu bar"""
@@ -182,8 +231,9 @@ class MainWindow(QMainWindow):
         file_menu = menu_bar.addMenu("&File")
         
         # Add Person action
-        new_person_action = file_menu.addAction("New Person")
-        new_person_action.triggered.connect(self.add_person)
+        self.new_person_action = file_menu.addAction("New Person")
+        self.new_person_action.triggered.connect(self.add_person)
+        self.new_person_action.setEnabled(self.storage is not None)  # Enabled once the store is open
         
         # Add Conversation action (disabled by default)
         self.new_conversation_action = file_menu.addAction("New Conversation")
@@ -194,6 +244,52 @@ class MainWindow(QMainWindow):
         file_menu.addSeparator()
         exit_action = file_menu.addAction("Exit")
         exit_action.triggered.connect(self.close)
+        
+        # View menu
+        view_menu = menu_bar.addMenu("&View")
+        self.stats_action = view_menu.addAction("Storage Statistics")
+        self.stats_action.setCheckable(True)
+        self.stats_action.toggled.connect(self.toggle_stats_panel)
+        self.stats_panel = None
+        self.timeline_action = view_menu.addAction("Conversation Timeline")
+        self.timeline_action.triggered.connect(self.show_timeline)
+        self.timeline_action.setEnabled(self.storage is not None)  # Enabled once the store is open
+        self.timeline_dialog = None
+    
+    def get_person_view(self):
+        """Return the person view, building it on first use"""
+        if self.person_view is None:
+            from .person_view import PersonView
+            self.person_view = PersonView(self.storage)
+            self.person_view.conversationAdded.connect(self.on_conversation_added)
+            self.right_panel.addWidget(self.person_view)
+        return self.person_view
+    
+    def toggle_stats_panel(self, visible):
+        """Show or hide the storage statistics debug panel, creating it on first use"""
+        if self.stats_panel is None:
+            from .stats_panel import StorageStatsPanel
+            self.stats_panel = StorageStatsPanel(self)
+            self.stats_panel.visibilityChanged.connect(self.stats_action.setChecked)
+            self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, self.stats_panel)
+        self.stats_panel.setVisible(visible)
+    
+    def show_timeline(self):
+        """Show the conversations of all contacts by date, creating the window on first use"""
+        if self.timeline_dialog is None:
+            from .timeline_view import TimelineDialog
+            self.timeline_dialog = TimelineDialog(self.storage, self)
+            self.timeline_dialog.personActivated.connect(self.show_person)
+        else:
+            self.timeline_dialog.refresh()
+        self.timeline_dialog.show()
+        self.timeline_dialog.raise_()
+    
+    def show_person(self, person_id: int):
+        """Open a person in the person view, whether or not they are listed"""
+        result = self.storage.load_person(person_id)
+        if result:
+            self.get_person_view().display_person(*result)
     
     def change_sort_type(self, sort_type):
         """Change the sort type between date and name"""
@@ -208,7 +304,16 @@ class MainWindow(QMainWindow):
             self.name_sort_button.setChecked(True)
             self.order_button.setText("A↓" if self.reverse_sort else "A↑")
         
-        self.load_persons()
+        self._resort()
+    
+    def _update_sort_buttons(self):
+        """Show the current sort in the toolbar buttons"""
+        self.date_sort_button.setChecked(self.sort_by_date)
+        self.name_sort_button.setChecked(not self.sort_by_date)
+        if self.sort_by_date:
+            self.order_button.setText("↓" if self.reverse_sort else "↑")
+        else:
+            self.order_button.setText("A↓" if self.reverse_sort else "A↑")
     
     def toggle_sort_order(self):
         """Toggle between ascending and descending order"""
@@ -227,36 +332,126 @@ class MainWindow(QMainWindow):
                 else "Currently: A to Z"
             )
         
-        self.load_persons()
+        self._resort()
     
-    def load_persons(self):
-        """Load all persons from storage"""
-        self.person_list.clear()
-        persons = self.storage.get_all_persons()
+    def _sort_key(self) -> str:
+        """Storage sort key matching the selected sort button"""
+        return 'date' if self.sort_by_date else 'name'
+    
+    def _resort(self):
+        """Apply the current sort to the list, restarting a load that is still streaming
         
-        if self.sort_by_date:
-            # Get persons with their last conversation dates
-            persons_with_sort_key = []
-            for person in persons:
-                result = self.storage.load_person(person.id)
-                if result:
-                    _, conversations = result
-                    last_date = max([c.date for c in conversations]) if conversations else date.min
-                    persons_with_sort_key.append((person, last_date))
+        Without an open store (its opening failed) this retries the load.
+        """
+        if self._loading or self.storage is None:
+            self.load_persons()
         else:
-            # Sort by name
-            persons_with_sort_key = [(person, person.first_name.lower()) for person in persons]
+            self.person_model.sort_persons(self._sort_key(), self.reverse_sort)
+    
+    def load_persons(self):
+        """Stream the sorted person list from storage on a worker thread
+        
+        Starting a new load cancels any load still in progress.
+        """
+        self._load_generation += 1
+        self._loading = True
+        self.person_model.begin_load(self._sort_key(), self.reverse_sort)
+        
+        if self._opening:
+            return  # on_storage_opened restarts the load once the store is open
+        self._opening = self.storage is None
+        
+        loader = StoreLoader(
+            self._load_generation,
+            self._is_current_load,
+            storage=self.storage,
+            sort_by=self._sort_key(),
+            reverse=self.reverse_sort,
+            write_delay=self.SAVE_DELAY
+        )
+        loader.signals.opened.connect(self.on_storage_opened)
+        loader.signals.batchLoaded.connect(self.on_persons_loaded)
+        loader.signals.progress.connect(self.on_load_progress)
+        loader.signals.finished.connect(self.on_load_finished)
+        loader.signals.failed.connect(self.on_load_failed)
+        QThreadPool.globalInstance().start(loader)
+    
+    def _is_current_load(self, generation: int) -> bool:
+        """Whether a loader's results are still wanted; called from worker threads"""
+        return generation == self._load_generation
+    
+    def on_storage_opened(self, generation, storage):
+        """Hand the newly opened store to the views"""
+        self._opening = False
+        self.storage = storage
+        self.person_model.storage = storage
+        if self.person_view is not None:
+            self.person_view.storage = storage
+        self.new_person_action.setEnabled(True)
+        self.timeline_action.setEnabled(True)
+        
+        if not self._is_current_load(generation):
+            # A reload was requested while opening; run it against the open store
+            self.load_persons()
+        if self.search_box.text().strip() or self.view_filter.currentData():
+            self.apply_search()
+    
+    def on_persons_loaded(self, generation, person_ids):
+        """Append a streamed batch of IDs to the list"""
+        if self._is_current_load(generation):
+            self.person_model.append_batch(person_ids)
+    
+    def on_load_progress(self, generation, loaded, total):
+        """Show progress of the current load"""
+        if not self._is_current_load(generation):
+            return
+        self.load_progress.setRange(0, max(total, 1))
+        self.load_progress.setValue(loaded)
+        self.load_progress.setVisible(loaded < total)
+    
+    def on_load_finished(self, generation):
+        """Hide the progress indicator once the current load is complete"""
+        if self._is_current_load(generation):
+            self._loading = False
+            self.person_model.end_load()
+            self.load_progress.hide()
+    
+    def on_load_failed(self, generation, message):
+        """Report a load that failed
+        
+        A failed open also fails any newer load waiting for the store, so it is
+        reported whatever its generation and the next load opens the store again.
+        """
+        self._opening = False
+        if self._is_current_load(generation) or self.storage is None:
+            self._loading = False
+            self.load_progress.hide()
+            QMessageBox.warning(self, "Error", f"Failed to load contacts: {message}")
+    
+    def apply_search(self):
+        """Filter the person list to those matching the search box and the selected view"""
+        query = self.search_box.text().strip()
+        if self.storage is None:
+            return
         
-        # Sort by the appropriate key
-        persons_with_sort_key.sort(key=lambda x: x[1], reverse=self.reverse_sort)
+        person_ids = None
+        if query:
+            person_ids = {hit.person_id for hit in self.storage.search(query)}
         
-        # Add to list
-        for person, _ in persons_with_sort_key:
-            item = QListWidgetItem(person.full_name)
-            item.setData(Qt.ItemDataRole.UserRole, person)
-            self.person_list.addItem(item)
+        view = self.view_filter.currentData()
+        if view == 'birthdays':
+            view_ids = set(self.storage.upcoming_birthdays(self.BIRTHDAY_DAYS))
+        elif view == 'stale':
+            view_ids = set(self.storage.stale_contacts(date.today() - timedelta(days=self.STALE_DAYS)))
+        else:
+            view_ids = None
+        if view_ids is not None:
+            person_ids = view_ids if person_ids is None else person_ids & view_ids
+        
+        self.person_model.set_filter(person_ids)
     
     def add_person(self):
+        from .person_dialog import PersonDialog
         dialog = PersonDialog(parent=self)
         if dialog.exec():
             person, conversation = dialog.get_data()
@@ -270,36 +465,50 @@ class MainWindow(QMainWindow):
     
     def add_conversation(self):
         """Add a conversation to the selected person"""
-        selected_items = self.person_list.selectedItems()
-        if not selected_items:
+        person = self.selected_person()
+        if person is None:
             return
-            
-        person = selected_items[0].data(Qt.ItemDataRole.UserRole)
         
+        from .conversation_dialog import ConversationDialog
         dialog = ConversationDialog(self)
         if dialog.exec():
             conversation = dialog.get_conversation()
             if self.storage.add_conversation(person.id, conversation):
+                self.refresh_person(person.id)
                 QMessageBox.information(self, "Success", "Conversation added successfully!")
             else:
                 QMessageBox.warning(self, "Error", "Failed to add conversation")
     
+    def selected_person(self):
+        """Return the summary of the selected person, if any"""
+        indexes = self.person_list.selectionModel().selectedIndexes()
+        if not indexes:
+            return None
+        return self.person_model.summary(indexes[0])
+    
     def on_person_selected(self):
         """Handle person selection"""
         self.new_conversation_action.setEnabled(False)
-        selected_items = self.person_list.selectedItems()
+        person = self.selected_person()
         
-        if selected_items:
-            person = selected_items[0].data(Qt.ItemDataRole.UserRole)
+        # Rows shown from the startup snapshot cannot be opened before the store is
+        if person and self.storage is not None:
             result = self.storage.load_person(person.id)
             
             if result:
                 loaded_person, conversations = result
-                self.person_view.display_person(loaded_person, conversations)
+                self.get_person_view().display_person(loaded_person, conversations)
                 self.new_conversation_action.setEnabled(True)
     
+    def refresh_person(self, person_id: int):
+        """Update a person's row in the list after their data changed"""
+        summary = self.storage.get_person_summary(person_id)
+        if summary:
+            self.person_model.update_summary(summary)
+    
     def on_conversation_added(self):
         """Refresh the current person view when a conversation is added"""
-        selected_items = self.person_list.selectedItems()
-        if selected_items:
+        person = self.selected_person()
+        if person:
+            self.refresh_person(person.id)
             self.on_person_selected()
\ No newline at end of file
@@ -0,0 +1,191 @@
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+from models import PersonSummary
+from typing import Dict, List, Optional, Set
+
+class PersonListModel(QAbstractListModel):
+    """Lazily populated list model exposing precomputed display data for each person
+    
+    The model keeps only the sorted list of person IDs; summaries and their
+    display strings are fetched from storage a page at a time as the view
+    scrolls, and cached so re-sorting does not fetch them again.
+    """
+    PersonIdRole = Qt.ItemDataRole.UserRole + 1
+    FullNameRole = Qt.ItemDataRole.UserRole + 2
+    LastContactRole = Qt.ItemDataRole.UserRole + 3
+    
+    PAGE_SIZE = 200
+    
+    def __init__(self, storage, parent=None):
+        super().__init__(parent)
+        self.storage = storage
+        self.sort_by = 'date'
+        self.reverse = True
+        self._full_order: List[int] = []
+        self._filter: Optional[Set[int]] = None
+        self._order: List[int] = []
+        self._loaded = 0
+        self._cache: Dict[int, tuple[PersonSummary, str, Optional[str]]] = {}
+        self._provisional = False  # Rows come from a startup snapshot, not yet from storage
+    
+    def show_snapshot(self, sort_by: str, reverse: bool, summaries: List[PersonSummary]):
+        """Show cached rows from the last session until the first streamed batch replaces them"""
+        self.sort_by = sort_by
+        self.reverse = reverse
+        self._cache = {summary.id: (summary,) + self._display_data(summary) for summary in summaries}
+        self._set_order([summary.id for summary in summaries])
+        self._provisional = True
+    
+    def first_page(self) -> List[PersonSummary]:
+        """Summaries of the first page in the current order, ignoring any filter"""
+        rows = (self._person_data(person_id) for person_id in self._full_order[:self.PAGE_SIZE])
+        return [row[0] for row in rows if row is not None]
+    
+    def begin_load(self, sort_by: str, reverse: bool):
+        """Clear the model before rows are streamed in with append_batch
+        
+        Snapshot rows in the same order stay on screen until the first batch arrives.
+        """
+        if self._provisional and (sort_by, reverse) == (self.sort_by, self.reverse):
+            return
+        self._provisional = False
+        self.sort_by = sort_by
+        self.reverse = reverse
+        self._cache.clear()
+        self._set_order([])
+    
+    def append_batch(self, person_ids: List[int]):
+        """Append a batch of already sorted person IDs, showing rows until the first page is full"""
+        if self._provisional:
+            self._provisional = False
+            self._cache.clear()
+            self._set_order([])
+        
+        self._full_order.extend(person_ids)
+        if self._filter is None:
+            self._order = self._full_order
+        else:
+            self._order.extend(person_id for person_id in person_ids if person_id in self._filter)
+        
+        visible = min(self.PAGE_SIZE, len(self._order))
+        if visible > self._loaded:
+            self.beginInsertRows(QModelIndex(), self._loaded, visible - 1)
+            self._loaded = visible
+            self.endInsertRows()
+    
+    def end_load(self):
+        """Drop snapshot rows a finished load did not replace, as happens for an empty store"""
+        if self._provisional:
+            self._provisional = False
+            self._cache.clear()
+            self._set_order([])
+    
+    def sort_persons(self, sort_by: str, reverse: bool):
+        """Re-order the existing rows, reversing in place when only the direction changes"""
+        if sort_by == self.sort_by:
+            if reverse != self.reverse:
+                self.reverse = reverse
+                self._set_order(self._full_order[::-1])
+            return
+        
+        self.sort_by = sort_by
+        self.reverse = reverse
+        if self.storage is None:
+            return  # The next load streams the rows in this order
+        self._set_order(self.storage.get_sorted_person_ids(sort_by, reverse))
+    
+    def set_filter(self, person_ids: Optional[Set[int]]):
+        """Show only the given persons, keeping the current sort; None shows everyone"""
+        self._filter = person_ids
+        self._set_order(self._full_order)
+    
+    def _set_order(self, order: List[int]):
+        """Replace the row order, showing only the first page until more is fetched"""
+        self.beginResetModel()
+        self._full_order = list(order)
+        if self._filter is None:
+            self._order = self._full_order
+        else:
+            self._order = [person_id for person_id in order if person_id in self._filter]
+        self._loaded = min(self.PAGE_SIZE, len(self._order))
+        self.endResetModel()
+    
+    def _row_data(self, row: int) -> Optional[tuple[PersonSummary, str, Optional[str]]]:
+        """Return the cached summary and display strings for a row, fetching them if needed"""
+        return self._person_data(self._order[row])
+    
+    def _person_data(self, person_id: int) -> Optional[tuple[PersonSummary, str, Optional[str]]]:
+        """Return the cached summary and display strings for a person, fetching them if needed"""
+        cached = self._cache.get(person_id)
+        if cached is None:
+            if self.storage is None:
+                return None
+            summary = self.storage.get_person_summary(person_id)
+            if summary is None:
+                return None
+            cached = (summary,) + self._display_data(summary)
+            self._cache[person_id] = cached
+        return cached
+    
+    def _display_data(self, summary: PersonSummary) -> tuple[str, Optional[str]]:
+        """Format the name and last-contact text shown by the delegate"""
+        last_contact = None
+        if summary.last_contact:
+            last_contact = f"Last contact: {summary.last_contact.strftime('%Y-%m-%d')}"
+        return summary.full_name, last_contact
+    
+    def update_summary(self, summary: PersonSummary):
+        """Refresh the row showing the given person in place"""
+        self._cache[summary.id] = (summary,) + self._display_data(summary)
+        try:
+            row = self._order.index(summary.id, 0, self._loaded)
+        except ValueError:
+            return
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+    
+    def summary(self, index: QModelIndex) -> Optional[PersonSummary]:
+        """Return the summary shown at the given index"""
+        if not index.isValid():
+            return None
+        row_data = self._row_data(index.row())
+        return row_data[0] if row_data else None
+    
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._loaded
+    
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._loaded < len(self._order)
+    
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.PAGE_SIZE, len(self._order) - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < self._loaded:
+            return None
+        
+        if role == self.PersonIdRole:
+            return self._order[index.row()]
+        
+        row_data = self._row_data(index.row())
+        if row_data is None:
+            return None
+        
+        summary, full_name, last_contact = row_data
+        if role in (Qt.ItemDataRole.DisplayRole, self.FullNameRole):
+            return full_name
+        if role == self.LastContactRole:
+            return last_contact
+        if role == Qt.ItemDataRole.UserRole:
+            return summary
+        return None
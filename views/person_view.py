@@ -6,54 +6,93 @@ from PyQt6.QtWidgets import (
     QLabel,
     QTextEdit,
     QGroupBox,
-    QScrollArea,
-    QPushButton
+    QListView,
+    QPushButton,
+    QStyledItemDelegate,
+    QStyle,
+    QAbstractItemView
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QRect, QSize, pyqtSignal
+from PyQt6.QtGui import QFont, QFontMetrics
 from models import Person, Conversation
 from typing import List
 from datetime import date
-from .conversation_dialog import ConversationDialog
+from .conversation_list_model import ConversationListModel
 
-class ConversationWidget(QWidget):
-    notesChanged = pyqtSignal(Conversation)  # Signal to notify when notes are edited
+class ConversationItemDelegate(QStyledItemDelegate):
+    """Paints a conversation row and opens a text editor only for the row being edited"""
+    MARGIN = 5
+    MAX_NOTES_HEIGHT = 100
     
-    def __init__(self, conversation: Conversation, parent=None):
-        super().__init__(parent)
-        self.conversation = conversation
-        layout = QVBoxLayout(self)
-        
-        # Header with date and save button
-        header_layout = QHBoxLayout()
-        
-        date_label = QLabel(conversation.date.strftime("%Y-%m-%d"))
-        date_label.setStyleSheet("font-weight: bold;")
-        header_layout.addWidget(date_label)
-        
-        save_button = QPushButton("Save")
-        save_button.setEnabled(False)  # Initially disabled
-        save_button.clicked.connect(self.save_notes)
-        header_layout.addWidget(save_button)
-        header_layout.addStretch()
-        
-        # Notes text area
-        self.notes_text = QTextEdit()
-        self.notes_text.setPlainText(conversation.notes)
-        self.notes_text.setMaximumHeight(100)
-        self.notes_text.textChanged.connect(lambda: save_button.setEnabled(True))
+    def _header_font(self, option) -> QFont:
+        """Bold font used for the date header"""
+        font = QFont(option.font)
+        font.setBold(True)
+        return font
+    
+    def _notes_height(self, option, notes: str, width: int) -> int:
+        """Height of the wrapped notes text, capped like the old per-conversation editor"""
+        bounds = QFontMetrics(option.font).boundingRect(
+            QRect(0, 0, max(width, 1), self.MAX_NOTES_HEIGHT),
+            Qt.TextFlag.TextWordWrap,
+            notes
+        )
+        return min(bounds.height(), self.MAX_NOTES_HEIGHT)
+    
+    def paint(self, painter, option, index):
+        if not index.isValid():
+            return
         
-        layout.addLayout(header_layout)
-        layout.addWidget(self.notes_text)
+        rect = option.rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+        
+        painter.save()
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+            painter.setPen(option.palette.highlightedText().color())
+        else:
+            painter.setPen(option.palette.text().color())
+        
+        # Date header
+        header_font = self._header_font(option)
+        header_height = QFontMetrics(header_font).height()
+        painter.setFont(header_font)
+        painter.drawText(
+            QRect(rect.left(), rect.top(), rect.width(), header_height),
+            Qt.AlignmentFlag.AlignLeft,
+            index.data(ConversationListModel.DateRole)
+        )
         
-        self.save_button = save_button
+        # Notes, clipped to the space reserved by sizeHint
+        painter.setFont(option.font)
+        notes_rect = QRect(rect.left(), rect.top() + header_height + self.MARGIN,
+                           rect.width(), rect.bottom() - rect.top() - header_height - self.MARGIN)
+        painter.setClipRect(notes_rect)
+        painter.drawText(notes_rect, Qt.TextFlag.TextWordWrap, index.data(ConversationListModel.NotesRole))
+        painter.restore()
+    
+    def sizeHint(self, option, index):
+        width = self.parent().viewport().width() - 2 * self.MARGIN
+        header_height = QFontMetrics(self._header_font(option)).height()
+        notes_height = self._notes_height(option, index.data(ConversationListModel.NotesRole) or "", width)
+        return QSize(width, header_height + notes_height + 3 * self.MARGIN)
+    
+    def createEditor(self, parent, option, index):
+        editor = QTextEdit(parent)
+        editor.setAcceptRichText(False)
+        return editor
     
-    def save_notes(self):
-        """Save the edited notes"""
-        new_notes = self.notes_text.toPlainText().strip()
-        if new_notes != self.conversation.notes:
-            self.conversation.notes = new_notes
-            self.notesChanged.emit(self.conversation)
-            self.save_button.setEnabled(False)
+    def setEditorData(self, editor, index):
+        editor.setPlainText(index.data(Qt.ItemDataRole.EditRole))
+    
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.toPlainText(), Qt.ItemDataRole.EditRole)
+    
+    def updateEditorGeometry(self, editor, option, index):
+        # Leave the date header visible above the editor
+        header_height = QFontMetrics(self._header_font(option)).height()
+        rect = option.rect.adjusted(0, header_height + self.MARGIN, 0, 0)
+        rect.setHeight(max(rect.height(), self.MAX_NOTES_HEIGHT))
+        editor.setGeometry(rect)
 
 class PersonView(QWidget):
     conversationAdded = pyqtSignal()  # Signal to notify when conversation is added
@@ -120,16 +159,23 @@ class PersonView(QWidget):
         
         conversations_layout.addLayout(header_layout)
         
-        # Create a scroll area for conversations
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        
-        self.conversations_widget = QWidget()
-        self.conversations_layout = QVBoxLayout(self.conversations_widget)
-        scroll.setWidget(self.conversations_widget)
+        # Conversations are painted by a delegate; older ones are fetched as the list scrolls
+        self.conversation_model = ConversationListModel(self)
+        self.conversation_model.notesChanged.connect(self.save_conversation)
+        
+        self.conversation_list = QListView()
+        self.conversation_list.setModel(self.conversation_model)
+        self.conversation_list.setItemDelegate(ConversationItemDelegate(self.conversation_list))
+        self.conversation_list.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.conversation_list.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.conversation_list.setResizeMode(QListView.ResizeMode.Adjust)
+        self.conversation_list.setEditTriggers(
+            QAbstractItemView.EditTrigger.DoubleClicked |
+            QAbstractItemView.EditTrigger.EditKeyPressed
+        )
+        self.conversation_list.setToolTip("Double-click a conversation to edit its notes")
         
-        conversations_layout.addWidget(scroll)
+        conversations_layout.addWidget(self.conversation_list)
         conversations_group.setLayout(conversations_layout)
         layout.addWidget(conversations_group)
         
@@ -151,43 +197,13 @@ class PersonView(QWidget):
         # Enable add conversation button
         self.add_conversation_button.setEnabled(True)
         
-        # Clear existing conversations
-        while self.conversations_layout.count():
-            child = self.conversations_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-        
-        # Sort conversations by date in reverse chronological order
-        sorted_conversations = sorted(
-            conversations,
-            key=lambda x: x.date,
-            reverse=True
-        )
-        
-        # Add conversations
-        for conv in sorted_conversations:
-            conv_widget = ConversationWidget(conv)
-            conv_widget.notesChanged.connect(self.save_conversation)
-            self.conversations_layout.addWidget(conv_widget)
-        
-        # Add stretch to push conversations to the top
-        self.conversations_layout.addStretch()
+        # Show conversations, newest first
+        self.conversation_model.set_conversations(conversations)
     
     def save_conversation(self, conversation: Conversation):
         """Save updated conversation back to storage"""
         if self.current_person and self.current_person.id:
-            result = self.storage.load_person(self.current_person.id)
-            if result:
-                person, conversations = result
-                
-                # Update the matching conversation
-                for conv in conversations:
-                    if conv.id == conversation.id:
-                        conv.notes = conversation.notes
-                        break
-                
-                # Save back to storage
-                self.storage.save_person(person, conversations)
+            self.storage.update_conversation(self.current_person.id, conversation)
     
     def save_person_notes(self):
         """Save updated person notes back to storage"""
@@ -207,7 +223,8 @@ class PersonView(QWidget):
         """Add a new conversation for the current person"""
         if not self.current_person:
             return
-            
+        
+        from .conversation_dialog import ConversationDialog
         dialog = ConversationDialog(self)
         if dialog.exec():
             conversation = dialog.get_conversation()
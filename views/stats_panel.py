@@ -0,0 +1,75 @@
+from PyQt6.QtWidgets import (
+    QDockWidget,
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QTableWidget,
+    QTableWidgetItem,
+    QPushButton,
+    QHeaderView
+)
+from PyQt6.QtCore import Qt, QTimer
+from storage import STATS
+from storage.instrumentation import METRICS
+
+class StorageStatsPanel(QDockWidget):
+    """Debug panel showing live storage I/O counters per storage method
+    
+    Instrumentation is switched on while the panel is visible, unless it
+    was already enabled through LKIT_STORAGE_STATS.
+    """
+    REFRESH_INTERVAL = 1000  # Milliseconds
+    
+    def __init__(self, parent=None):
+        super().__init__("Storage Statistics", parent)
+        self._was_enabled = STATS.enabled
+        
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        
+        self.table = QTableWidget(0, len(METRICS))
+        self.table.setHorizontalHeaderLabels([metric.replace('_', ' ') for metric in METRICS])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.table)
+        
+        buttons = QHBoxLayout()
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self.reset)
+        buttons.addStretch()
+        buttons.addWidget(reset_button)
+        layout.addLayout(buttons)
+        self.setWidget(container)
+        
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.REFRESH_INTERVAL)
+        self.timer.timeout.connect(self.refresh)
+    
+    def showEvent(self, event):
+        STATS.enable()
+        self.refresh()
+        self.timer.start()
+        super().showEvent(event)
+    
+    def hideEvent(self, event):
+        self.timer.stop()
+        STATS.enable(self._was_enabled)
+        super().hideEvent(event)
+    
+    def reset(self):
+        """Clear the counters"""
+        STATS.reset()
+        self.refresh()
+    
+    def refresh(self):
+        """Show the current totals, slowest storage method first"""
+        snapshot = sorted(STATS.snapshot().items(), key=lambda item: -item[1].get('seconds', 0))
+        self.table.setRowCount(len(snapshot))
+        self.table.setVerticalHeaderLabels([operation for operation, _ in snapshot])
+        for row, (_, metrics) in enumerate(snapshot):
+            for column, metric in enumerate(METRICS):
+                value = metrics.get(metric, 0)
+                text = f"{value * 1000:.1f} ms" if metric.endswith('seconds') else f"{int(value):,}"
+                item = QTableWidgetItem(text)
+                item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, column, item)
@@ -0,0 +1,148 @@
+from PyQt6.QtWidgets import (
+    QDialog,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QDateEdit,
+    QListView
+)
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QDate, pyqtSignal
+from datetime import date
+from typing import Dict, List, Optional
+from storage import TimelineEntry
+
+class TimelineModel(QAbstractListModel):
+    """Conversations of every person within a date range, newest first, fetched from storage a page at a time
+    
+    Only the number of matching conversations is read up front; each page is
+    one range query on the storage timeline index.
+    """
+    PersonIdRole = Qt.ItemDataRole.UserRole + 1
+    
+    PAGE_SIZE = 100
+    
+    def __init__(self, storage, parent=None):
+        super().__init__(parent)
+        self.storage = storage
+        self._start: Optional[date] = None
+        self._end: Optional[date] = None
+        self._total = 0
+        self._entries: List[TimelineEntry] = []
+        self._names: Dict[int, str] = {}
+    
+    def set_range(self, start: Optional[date], end: Optional[date]):
+        """Show the conversations dated within start..end"""
+        self.beginResetModel()
+        self._start = start
+        self._end = end
+        self._total = self.storage.count_timeline(start, end)
+        self._entries = []
+        self._entries = self._next_page()
+        self.endResetModel()
+    
+    def total(self) -> int:
+        """Number of conversations in the range, fetched or not"""
+        return self._total
+    
+    def entry(self, index: QModelIndex) -> Optional[TimelineEntry]:
+        """Return the timeline entry shown at the given index"""
+        if not index.isValid():
+            return None
+        return self._entries[index.row()]
+    
+    def _next_page(self) -> List[TimelineEntry]:
+        """Entries of the page following those already fetched"""
+        return self.storage.get_timeline(self._start, self._end, len(self._entries), self.PAGE_SIZE, reverse=True)
+    
+    def _person_name(self, person_id: int) -> str:
+        name = self._names.get(person_id)
+        if name is None:
+            summary = self.storage.get_person_summary(person_id)
+            name = self._names[person_id] = summary.full_name if summary else f"#{person_id}"
+        return name
+    
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._entries)
+    
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return len(self._entries) < self._total
+    
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        page = self._next_page()
+        if not page:
+            # The store shrank since the range was counted
+            self._total = len(self._entries)
+            return
+        self.beginInsertRows(QModelIndex(), len(self._entries), len(self._entries) + len(page) - 1)
+        self._entries.extend(page)
+        self.endInsertRows()
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._entries):
+            return None
+        
+        entry = self._entries[index.row()]
+        if role == self.PersonIdRole:
+            return entry.person_id
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{entry.date.strftime('%Y-%m-%d')}    {self._person_name(entry.person_id)}"
+        return None
+
+class TimelineDialog(QDialog):
+    """Window listing the conversations logged with anyone within a date range"""
+    personActivated = pyqtSignal(int)  # Emitted with the person ID of a double-clicked entry
+    
+    DEFAULT_DAYS = 30
+    
+    def __init__(self, storage, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Conversation Timeline")
+        self.resize(420, 520)
+        self.model = TimelineModel(storage, self)
+        self.setup_ui()
+        self.refresh()
+    
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        
+        # Date range, defaulting to the last DEFAULT_DAYS days
+        range_layout = QHBoxLayout()
+        self.start_date = QDateEdit()
+        self.start_date.setCalendarPopup(True)
+        self.start_date.setDate(QDate.currentDate().addDays(-self.DEFAULT_DAYS))
+        self.end_date = QDateEdit()
+        self.end_date.setCalendarPopup(True)
+        self.end_date.setDate(QDate.currentDate())
+        self.start_date.dateChanged.connect(self.refresh)
+        self.end_date.dateChanged.connect(self.refresh)
+        range_layout.addWidget(QLabel("From"))
+        range_layout.addWidget(self.start_date)
+        range_layout.addWidget(QLabel("to"))
+        range_layout.addWidget(self.end_date)
+        range_layout.addStretch()
+        layout.addLayout(range_layout)
+        
+        self.count_label = QLabel()
+        layout.addWidget(self.count_label)
+        
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.doubleClicked.connect(self.on_entry_activated)
+        layout.addWidget(self.list_view)
+    
+    def refresh(self):
+        """Reload the list for the selected date range"""
+        self.model.set_range(self.start_date.date().toPyDate(), self.end_date.date().toPyDate())
+        self.count_label.setText(f"{self.model.total()} conversations")
+    
+    def on_entry_activated(self, index):
+        entry = self.model.entry(index)
+        if entry is not None:
+            self.personActivated.emit(entry.person_id)